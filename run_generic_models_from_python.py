@@ -3,6 +3,10 @@ import json
 
 from source.model.structure_model import StraightBeam
 from source.analysis.analysis_controller import AnalysisController
+from source.auxiliary.logger import configure_logging
+
+# NOTE: 'debug' for details of elements and matrices, 'silent' for production runs
+configure_logging('info', progress_interval=1.0)
 
 # inputs
 parameters = {}
@@ -6,6 +6,9 @@ from source.model.structure_model import StraightBeam
 from source.auxiliary.validate_and_assign_defaults import validate_and_assign_defaults
 from source.auxiliary.other_utilities import get_adjusted_path_string
 from source.auxiliary import global_definitions as GD
+from source.auxiliary.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class AnalysisController(object):
@@ -50,8 +53,8 @@ class AnalysisController(object):
         if not isdir(self.global_output_folder):
             makedirs(self.global_output_folder)
 
-        print(self.global_output_folder +
-              ' set as absolute folder path in AnalysisController')
+        logger.info(self.global_output_folder +
+                    ' set as absolute folder path in AnalysisController')
 
         if self.parameters['report_options']['combine_plots_into_pdf']:
             file_name = 'analyses_results_report.pdf'
@@ -1,3 +1,8 @@
+from source.auxiliary.logger import get_logger
+
+logger = get_logger(__name__)
+
+
 class AnalysisType(object):
     """
     Base class for the different analysis types
@@ -21,12 +26,12 @@ class AnalysisType(object):
         """
         Solve for something
         """
-        print("Solving for something in AnalysisType base class \n")
+        logger.info("Solving for something in AnalysisType base class")
         pass
 
     def postprocess(self):
         """
         Postprocess something
         """
-        print("Postprocessing in AnalysisType base class \n")
+        logger.info("Postprocessing in AnalysisType base class")
         pass
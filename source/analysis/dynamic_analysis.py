@@ -1,6 +1,7 @@
 from os.path import join as os_join
 
 import numpy as np
+from scipy import sparse
 
 import source.auxiliary.global_definitions as GD
 import source.postprocess.plotter_utilities as plotter_utilities
@@ -9,11 +10,18 @@ import source.postprocess.writer_utilitites as writer_utilities
 from source.analysis.analysis_type import AnalysisType
 from source.auxiliary.other_utilities import get_adjusted_path_string
 from source.auxiliary.validate_and_assign_defaults import validate_and_assign_defaults
+from source.auxiliary.logger import get_logger
+from source.auxiliary.result_store import ResultStore, ReducedLoadHistory, DEFAULT_CHUNK_SIZE
+from source.auxiliary.result_recorder import ResultRecorder
+import source.auxiliary.matrix_utilities as matrix_utilities
+
+logger = get_logger(__name__)
 
 
 def transform_into_modal_coordinates(modal_transform_matrix, matrix, modes_considered ):
     modal_transform_matrix_red = modal_transform_matrix[:,:modes_considered]
-    matrix_transformed = np.matmul(np.matmul(np.transpose(modal_transform_matrix_red), matrix), modal_transform_matrix_red)
+    # matrix.dot keeps this valid for dense and sparse matrices
+    matrix_transformed = np.matmul(np.transpose(modal_transform_matrix_red), matrix.dot(modal_transform_matrix_red))
     matrix_transformed = matrix_transformed.round(decimals=8) # rounded off 10 **-8 to zero 
     if np.count_nonzero(matrix_transformed - np.diag(np.diagonal(matrix_transformed))) == 0: 
         matrix_as_array = np.diagonal(matrix_transformed)
@@ -35,7 +43,11 @@ class DynamicAnalysis(AnalysisType):
         "input": {},
         "output": {}}
 
-    def __init__(self, structure_model, parameters):
+    def __init__(self, structure_model, parameters, force=None):
+        '''
+        force: optional load history in memory - e.g. a generated realization -
+        used instead of the one from "input" -> "file_path"
+        '''
 
         # validating and assign model parameters
         validate_and_assign_defaults(
@@ -52,27 +64,46 @@ class DynamicAnalysis(AnalysisType):
                      - self.parameters['settings']['time']['start']) / self.dt) + 1
         self.array_time = np.linspace(start, stop, steps)
 
+        # result histories in memory or out-of-core in a folder
+        if 'result_storage' in self.parameters['settings']:
+            storage = self.parameters['settings']['result_storage']
+            self.result_store = ResultStore(get_adjusted_path_string(storage['folder']),
+                                            storage.get('chunk_size', DEFAULT_CHUNK_SIZE))
+        else:
+            self.result_store = ResultStore()
+
         # TODO include some specifiers in the parameters, do not hard code
-        if get_adjusted_path_string(self.parameters['input']['file_path']) == get_adjusted_path_string('some/path'):
+        if force is not None:
+            logger.info('Load history provided directly to DynamicAnalysis')
+        elif get_adjusted_path_string(self.parameters['input']['file_path']) == get_adjusted_path_string('some/path'):
             err_msg = get_adjusted_path_string(
                 self.parameters['input']['file_path'])
             err_msg += " is not a valid file!"
             raise Exception(err_msg)
         else:
-            print(get_adjusted_path_string(
+            logger.info(get_adjusted_path_string(
                 self.parameters['input']['file_path']) + ' set as load file path in DynamicAnalysis')
+            # out-of-core the load history is read lazily as well
             force = np.load(get_adjusted_path_string(
-                self.parameters['input']['file_path']))
+                self.parameters['input']['file_path']),
+                mmap_mode='r' if self.result_store.is_out_of_core() else None)
 
         super().__init__(structure_model, self.parameters["type"])
         # print("Force: ", len(force))
         # overwriting attribute from base constructors
+        # several load cases with the shape (n_cases, n_dofs, n_steps) are advanced
+        # together, internally the cases are the columns of the state: (n_dofs, n_cases, n_steps)
+        if force.ndim == 3:
+            self.n_load_cases = force.shape[0]
+            force = np.moveaxis(force, 0, 1)
+        else:
+            self.n_load_cases = None
         self.force = force
 
         # check dimensionality
         # of time
         len_time_gen_array = len(self.array_time)
-        len_time_force = len(self.force[0])
+        len_time_force = self.force.shape[-1]
         if len_time_gen_array != len_time_force:
             err_msg = "The length " + \
                 str(len_time_gen_array) + \
@@ -102,7 +133,7 @@ class DynamicAnalysis(AnalysisType):
             err_msg += "The naming of the force time history should reflect the number of nodes\n"
             err_msg += "using the convention \"dynamic_force_<n_nodes>_nodes.npy\"\n"
             digits_in_filename = [
-                s for s in self.parameters['input']['file_path'].split('_') if s.isdigit()]
+                s for s in self.parameters['input'].get('file_path', '').split('_') if s.isdigit()]
             if len(digits_in_filename) == 1:
                 err_msg += "where currently <n_nodes> = " + \
                     digits_in_filename[0] + " (separated by underscores)!"
@@ -112,15 +143,17 @@ class DynamicAnalysis(AnalysisType):
                     " (separated by underscores)!"
             raise Exception(err_msg)
 
-        rows = len(self.structure_model.apply_bc_by_reduction(
-            self.structure_model.k))
+        rows = self.structure_model.apply_bc_by_reduction(
+            self.structure_model.k).shape[0]
 
         # initial condition of zero displacement and velocity used for the time being.
         # TODO : to incorporate user defined initial conditions
 
-        u0 = np.zeros(rows)  # initial displacement
-        v0 = np.zeros(rows)  # initial velocity
-        a0 = np.zeros(rows)  # initial acceleration
+        # one column per load case
+        state_shape = rows if self.n_load_cases is None else (rows, self.n_load_cases)
+        u0 = np.zeros(state_shape)  # initial displacement
+        v0 = np.zeros(state_shape)  # initial velocity
+        a0 = np.zeros(state_shape)  # initial acceleration
         initial_conditions = np.array([u0, v0, a0])
      
         if 'run_in_modal_coordinates' in self.parameters['settings']:
@@ -137,10 +170,16 @@ class DynamicAnalysis(AnalysisType):
                     raise Exception(err_msg)
                 else:
                     self.num_of_modes_considered = num_of_modes_specified
+
+                # the model might have computed only the lowest modes
+                if self.num_of_modes_considered > self.structure_model.eigen_modes_raw.shape[1]:
+                    self.structure_model.eigenvalue_solve(self.num_of_modes_considered)
                     
-                u0 = np.zeros(self.num_of_modes_considered)  # initial displacement
-                v0 = np.zeros(self.num_of_modes_considered)  # initial velocity
-                a0 = np.zeros(self.num_of_modes_considered)  # initial acceleration
+                state_shape = self.num_of_modes_considered if self.n_load_cases is None \
+                    else (self.num_of_modes_considered, self.n_load_cases)
+                u0 = np.zeros(state_shape)  # initial displacement
+                v0 = np.zeros(state_shape)  # initial velocity
+                a0 = np.zeros(state_shape)  # initial acceleration
                 initial_conditions = np.array([u0, v0, a0])
             else:
                 self.transform_into_modal = False
@@ -152,9 +191,9 @@ class DynamicAnalysis(AnalysisType):
 
         # TODO intiial condition in modal coordinates : when all the modes are not considered. 
         # TODO check if concept of comp - computational model is robust and generic enough
-        self.comp_m = np.copy(self.structure_model.comp_m)
-        self.comp_k = np.copy(self.structure_model.comp_k)
-        self.comp_b = np.copy(self.structure_model.comp_b)
+        self.comp_m = self.structure_model.comp_m.copy()
+        self.comp_k = self.structure_model.comp_k.copy()
+        self.comp_b = self.structure_model.comp_b.copy()
         # tranformation to the modal coordinates
         if self.transform_into_modal:
             self.comp_m = transform_into_modal_coordinates(
@@ -164,92 +203,268 @@ class DynamicAnalysis(AnalysisType):
             self.comp_k = transform_into_modal_coordinates(
                 self.structure_model.eigen_modes_raw, self.comp_k, self.num_of_modes_considered)
 
-        if force.shape[1] != len(self.array_time):
+        if self.force.shape[-1] != len(self.array_time):
             err_msg = "The time step for forces does not match the time step defined"
             raise Exception(err_msg)
 
         # external forces
-        force = self.structure_model.apply_bc_by_reduction(self.force, 'row')
-
-        if self.transform_into_modal:
-            force = np.dot(np.transpose(
-                self.structure_model.eigen_modes_raw[:,:self.num_of_modes_considered]), force)
-
-        print(self.parameters)
-        if self.parameters["settings"]["solver_type"] == "Linear":
+        if self.result_store.is_out_of_core():
+            # the memory-mapped load history is reduced (and projected) chunk by chunk in the solver
+            modes = self.structure_model.eigen_modes_raw[:, :self.num_of_modes_considered] \
+                if self.transform_into_modal else None
+            force = ReducedLoadHistory(self.force, self.structure_model.dofs_to_keep, modes)
+        else:
+            force = self.structure_model.apply_bc_by_reduction(self.force, 'row')
+
+            if self.transform_into_modal:
+                force = np.tensordot(np.transpose(
+                    self.structure_model.eigen_modes_raw[:,:self.num_of_modes_considered]), force, axes=1)
+
+        if self.n_load_cases is not None:
+            self._check_load_cases_settings(time_integration_scheme)
+            if self.transform_into_modal:
+                # NOTE: the schemes advance the columns of the load cases in matrix form,
+                # the modal system is small and kept as diagonal matrices
+                self.comp_m = np.diag(self.comp_m)
+                self.comp_b = np.diag(self.comp_b)
+                self.comp_k = np.diag(self.comp_k)
+
+        # optionally only the selected dofs and snapshots are recorded
+        self.recorder = None
+        if 'recording' in self.parameters['settings']:
+            if self.parameters['settings']['recording']['selected_dofs_only']:
+                self.recorder = self._get_result_recorder()
+
+        logger.debug("DynamicAnalysis parameters: %s", self.parameters)
+        if self.parameters["settings"]["solver_type"] == "Linear" and time_integration_scheme == "PiecewiseExact":
+            # exact recurrence for the decoupled modes, vectorized over the time steps
+            if not self.transform_into_modal:
+                err_msg = "The time integration scheme \"PiecewiseExact\" is only available\n"
+                err_msg += "for \"run_in_modal_coordinates\": true"
+                raise Exception(err_msg)
+            from source.solving_strategies.strategies.modal_solver import ModalSolver
+            self.solver = ModalSolver(self.array_time, time_integration_scheme, self.dt,
+                                      [self.comp_m, self.comp_b, self.comp_k],
+                                      initial_conditions, force,
+                                      self.structure_model,
+                                      result_store=self.result_store,
+                                      recorder=self.recorder)
+        elif self.parameters["settings"]["solver_type"] == "Linear" and 'adaptive' in self.parameters['settings']['time']:
+            # adaptive time steps, the results are resampled to the output grid
+            from source.solving_strategies.strategies.adaptive_solver import AdaptiveLinearSolver
+            self.solver = AdaptiveLinearSolver(self.array_time, time_integration_scheme, self.dt,
+                                               [self.comp_m, self.comp_b, self.comp_k],
+                                               initial_conditions, force,
+                                               self.structure_model,
+                                               self.parameters['settings']['time']['adaptive'],
+                                               self.result_store,
+                                               self.recorder)
+        elif self.parameters["settings"]["solver_type"] == "Linear":
             from source.solving_strategies.strategies.linear_solver import LinearSolver
+            scheme_settings = {}
+            if 'block_size' in self.parameters['settings']['time']:
+                scheme_settings['block_size'] = self.parameters['settings']['time']['block_size']
+            if time_integration_scheme == "CentralDifference" and 'safety_factor' in self.parameters['settings']['time']:
+                # of the critical time step for the explicit scheme
+                scheme_settings['safety_factor'] = self.parameters['settings']['time']['safety_factor']
+            if time_integration_scheme == "CentralDifference" and 'update_tolerance' in self.parameters['settings']['time']:
+                # relative change of the highest eigenvalue which triggers a new critical time step
+                scheme_settings['update_tolerance'] = self.parameters['settings']['time']['update_tolerance']
             self.solver = LinearSolver(self.array_time, time_integration_scheme, self.dt,
                                        [self.comp_m, self.comp_b, self.comp_k],
                                        initial_conditions, force,
-                                       self.structure_model)
+                                       self.structure_model,
+                                       scheme_settings,
+                                       self.result_store,
+                                       self.recorder)
+        elif self.parameters["settings"]["solver_type"] == "FrequencyDomain":
+            from source.solving_strategies.strategies.frequency_domain_solver import FrequencyDomainSolver
+            zero_padding_factor = 1.0
+            if 'zero_padding_factor' in self.parameters['settings']:
+                zero_padding_factor = self.parameters['settings']['zero_padding_factor']
+            self.solver = FrequencyDomainSolver(self.array_time, time_integration_scheme, self.dt,
+                                                [self.comp_m, self.comp_b, self.comp_k],
+                                                initial_conditions, force,
+                                                self.structure_model,
+                                                zero_padding_factor,
+                                                self.result_store,
+                                                self.recorder)
         elif self.parameters["settings"]["solver_type"] == "Picard":
             from source.solving_strategies.strategies.residual_based_picard_solver import ResidualBasedPicardSolver
             self.solver = ResidualBasedPicardSolver(self.array_time, time_integration_scheme, self.dt,
                                                     [self.comp_m, self.comp_b,
                                                         self.comp_k],
                                                     initial_conditions, force,
-                                                    self.structure_model)
+                                                    self.structure_model,
+                                                    self.result_store,
+                                                    self.recorder)
         elif self.parameters["settings"]["solver_type"] == "NewtonRaphson":
             from source.solving_strategies.strategies.residual_based_newton_raphson_solver import ResidualBasedNewtonRaphsonSolver
+            # tolerances, maximum iterations and the tangent reuse
+            nonlinear_settings = None
+            if 'nonlinear' in self.parameters['settings']:
+                nonlinear_settings = self.parameters['settings']['nonlinear']
             self.solver = ResidualBasedNewtonRaphsonSolver(self.array_time, time_integration_scheme, self.dt,
                                                            [self.comp_m, self.comp_b,
                                                                self.comp_k],
                                                            initial_conditions, force,
-                                                           self.structure_model)
+                                                           self.structure_model,
+                                                           nonlinear_settings,
+                                                           self.result_store,
+                                                           self.recorder)
         else:
             err_msg = "The requested solver type \"" + \
                 self.parameters["settings"]["solver_type"]
             err_msg += "\" is not available \n"
-            err_msg += "Choose one of: \"Linear\", \"Picard\", \"NewtonRaphson\"\n"
+            err_msg += "Choose one of: \"Linear\", \"FrequencyDomain\", \"Picard\", \"NewtonRaphson\"\n"
             raise Exception(err_msg)
 
-    def solve(self):
-
-        print("Solving the structure for dynamic loads \n")
-        self.solver.solve()
+    def _check_load_cases_settings(self, time_integration_scheme):
+        if self.parameters["settings"]["solver_type"] != "Linear" or time_integration_scheme == "PiecewiseExact":
+            err_msg = "Several load cases are only available for the \"Linear\" solver\n"
+            err_msg += "with a time stepping integration scheme"
+            raise Exception(err_msg)
+        if self.parameters['settings']['time'].get('block_size', 1) > 1:
+            err_msg = "Several load cases are advanced step by step, use \"block_size\": 1"
+            raise Exception(err_msg)
 
+    def _check_single_load_case(self, output_label):
+        if self.n_load_cases is not None:
+            err_msg = "The output \"" + output_label + "\" is not available for several load cases\n"
+            err_msg += "Use the results per dof or the load case statistics"
+            raise Exception(err_msg)
 
-        # transforming back to normal coordinates :
+    def _get_output_operator(self, full_rows):
+        '''
+        rows acting on all dofs -> rows acting on the state of the solver
+        '''
+        operator = self.structure_model.apply_bc_by_reduction(full_rows, 'column')
         if self.transform_into_modal:
-            self.solver.displacement = np.matmul(
-                self.structure_model.eigen_modes_raw[:,:self.num_of_modes_considered], self.solver.displacement)
-            self.solver.velocity = np.matmul(
-                self.structure_model.eigen_modes_raw[:,:self.num_of_modes_considered], self.solver.velocity)
-            self.solver.acceleration = np.matmul(
-                self.structure_model.eigen_modes_raw[:,:self.num_of_modes_considered], self.solver.acceleration)
-
-        self.solver.displacement = self.structure_model.recuperate_bc_by_extension(
-            self.solver.displacement)
-        self.solver.velocity = self.structure_model.recuperate_bc_by_extension(
-            self.solver.velocity)
-        self.solver.acceleration = self.structure_model.recuperate_bc_by_extension(
-            self.solver.acceleration)
-        # computing the reactions
-        f1 = np.dot(self.structure_model.m, self.solver.acceleration)
-        f2 = np.dot(self.structure_model.b, self.solver.velocity)
-        f3 = np.dot(self.structure_model.k, self.solver.displacement)
-        self.solver.dynamic_reaction = self.force - f1 - f2 - f3
-        #TODO : elastic support reaction computation 
+            operator = operator.dot(
+                self.structure_model.eigen_modes_raw[:, :self.num_of_modes_considered])
+        elif matrix_utilities.is_sparse(operator):
+            operator = operator.tocsr()
+        return operator
+
+    def _get_result_recorder(self):
+        n_dofs = len(self.structure_model.all_dofs_global)
+        n_steps = len(self.array_time)
+        identity = sparse.identity(n_dofs, format='csr')
+
+        # global dofs per requested result type
+        dofs = {label: [] for label in ['displacement', 'velocity', 'acceleration', 'reaction']}
+        if 'selected_dof' in self.parameters['output']:
+            selected_dof = self.parameters['output']['selected_dof']
+            for idx_dof, dof_id in enumerate(selected_dof['dof_list']):
+                for res in selected_dof['result_type'][idx_dof]:
+                    if res in dofs and dof_id not in dofs[res]:
+                        dofs[res].append(dof_id)
+
+        operators = {label: self._get_output_operator(identity[dofs[label]])
+                     for label in ['displacement', 'velocity', 'acceleration']}
+
+        # NOTE: the reaction uses the matrices at the start of the analysis,
+        # for the nonlinear solvers these are the initial ones
+        reaction_force = None
+        reaction_operators = None
+        if len(dofs['reaction']) > 0:
+            reaction_force = np.asarray(self.force[dofs['reaction']])
+            reaction_operators = []
+            for matrix in [self.structure_model.m, self.structure_model.b, self.structure_model.k]:
+                if matrix_utilities.is_sparse(matrix):
+                    matrix = matrix.tocsr()
+                reaction_operators.append(self._get_output_operator(matrix[dofs['reaction']]))
+
+        # full displacement snapshots for the selected steps and times
+        snapshot_steps = []
+        if 'selected_instance' in self.parameters['output']:
+            selected_instance = self.parameters['output']['selected_instance']
+            snapshot_steps += list(selected_instance['plot_step']) + list(selected_instance['write_step'])
+            snapshot_steps += [np.where(self.array_time >= time)[0][0]
+                               for time in list(selected_instance['plot_time']) +
+                               list(selected_instance['write_time'])]
+        if 'snapshot_interval' in self.parameters['settings']['recording']:
+            snapshot_steps += list(range(0, n_steps,
+                                         self.parameters['settings']['recording']['snapshot_interval']))
+
+        return ResultRecorder(n_steps, dofs, operators,
+                              reaction_force, reaction_operators,
+                              self._get_output_operator(identity), snapshot_steps,
+                              self.result_store, self.n_load_cases)
+
+    def _get_result_history(self, history, label, dof):
+        if self.recorder is None:
+            return history[dof, :]
+        return self.recorder.get_history(label, dof)
+
+    def _get_displacement_at_step(self, step):
+        if self.recorder is None:
+            return self.solver.displacement[:, step]
+        return self.recorder.get_snapshot(step)
+
+    def _check_full_histories(self, output_label):
+        if self.recorder is not None:
+            err_msg = "The output \"" + output_label + "\" requires the full result histories\n"
+            err_msg += "Set \"recording\" -> \"selected_dofs_only\": false"
+            raise Exception(err_msg)
 
-    def plot_result_at_dof(self, pdf_report, display_plots, dof, selected_result):
-        """
-        Pass to plot function:
-            Plots the time series of required quantitiy 
-        """
-        print('Plotting result for selected dof in dynamic analysis \n')
+    def solve(self):
 
-        coord_label = GD.DOF_LABELS[self.structure_model.domain_size][int(dof % GD.DOFS_PER_NODE[self.structure_model.domain_size])]
+        logger.info("Solving the structure for dynamic loads")
+        self.solver.solve()
 
-        plot_title = selected_result.capitalize() + ' at DoF ' + str(dof) + " -> " + coord_label
+        if self.recorder is not None:
+            # recorded in the original coordinates including the reactions
+            self.recorder.flush()
+            self.solver.dynamic_reaction = self.recorder.histories.get('reaction')
+            return
+
+
+        # transforming back to normal coordinates and extending by the BC dofs
+        # chunk by chunk of time steps for out-of-core results
+        n_dofs = len(self.structure_model.all_dofs_global)
+        n_steps = len(self.array_time)
+        results = {}
+        for label in ['displacement', 'velocity', 'acceleration', 'reaction']:
+            results[label] = self.result_store.allocate('full_' + label, n_dofs, n_steps, self.n_load_cases)
+
+        for chunk in self.result_store.get_chunks(n_steps):
+            # load cases and time steps as columns: (n_rows, n_cases * n_chunk_steps)
+            full_shape = results['reaction'][..., chunk].shape
+            for label, history in [('displacement', self.solver.displacement),
+                                   ('velocity', self.solver.velocity),
+                                   ('acceleration', self.solver.acceleration)]:
+                result = history[..., chunk].reshape(history.shape[0], -1)
+                if self.transform_into_modal:
+                    result = np.matmul(
+                        self.structure_model.eigen_modes_raw[:, :self.num_of_modes_considered], result)
+                results[label][..., chunk] = self.structure_model.recuperate_bc_by_extension(
+                    result).reshape(full_shape)
+
+            # computing the reactions
+            f1 = self.structure_model.m.dot(results['acceleration'][..., chunk].reshape(n_dofs, -1))
+            f2 = self.structure_model.b.dot(results['velocity'][..., chunk].reshape(n_dofs, -1))
+            f3 = self.structure_model.k.dot(results['displacement'][..., chunk].reshape(n_dofs, -1))
+            results['reaction'][..., chunk] = self.force[..., chunk] - f1.reshape(full_shape) - \
+                f2.reshape(full_shape) - f3.reshape(full_shape)
+
+        self.result_store.flush(*results.values())
+        self.solver.displacement = results['displacement']
+        self.solver.velocity = results['velocity']
+        self.solver.acceleration = results['acceleration']
+        self.solver.dynamic_reaction = results['reaction']
+        #TODO : elastic support reaction computation 
+
+    def _get_result_at_dof(self, dof, selected_result):
         if selected_result == 'displacement':
-            result_data = self.solver.displacement[dof, :]
+            return self._get_result_history(self.solver.displacement, 'displacement', dof)
         elif selected_result == 'velocity':
-            result_data = self.solver.velocity[dof, :]
+            return self._get_result_history(self.solver.velocity, 'velocity', dof)
         elif selected_result == 'acceleration':
-            result_data = self.solver.acceleration[dof, :]
+            return self._get_result_history(self.solver.acceleration, 'acceleration', dof)
         elif selected_result == 'reaction':
             if dof in self.structure_model.bc_dofs or dof in self.structure_model.elastic_bc_dofs:
-                result_data = self.solver.dynamic_reaction[dof, :]
+                return self._get_result_history(self.solver.dynamic_reaction, 'reaction', dof)
             else:
                 err_msg = "The selected DoF \"" + str(dof)
                 err_msg += "\" is not avaialbe in the list of available boundary condition dofs \n"
@@ -259,10 +474,37 @@ class DynamicAnalysis(AnalysisType):
                 raise Exception(err_msg)
         else:
             err_msg = "The selected result \"" + selected_result
-            err_msg += "\" is not avaialbe \n"
+            err_msg += "\" is not available \n"
             err_msg += "Choose one of: \"displacement\", \"velocity\", \"acceleration\", \"reaction\""
             raise Exception(err_msg)
 
+    def get_load_case_statistics(self, dof, selected_result):
+        '''
+        statistics over time of the result at the dof,
+        arrays with one entry per load case for several load cases
+        '''
+        result_data = self._get_result_at_dof(dof, selected_result)
+        return {'max': np.max(result_data, axis=-1),
+                'min': np.min(result_data, axis=-1),
+                'mean': np.mean(result_data, axis=-1),
+                'std': np.std(result_data, axis=-1)}
+
+    def plot_result_at_dof(self, pdf_report, display_plots, dof, selected_result):
+        """
+        Pass to plot function:
+            Plots the time series of required quantitiy 
+        """
+        logger.info('Plotting result for selected dof in dynamic analysis')
+
+        coord_label = GD.DOF_LABELS[self.structure_model.domain_size][int(dof % GD.DOFS_PER_NODE[self.structure_model.domain_size])]
+
+        plot_title = selected_result.capitalize() + ' at DoF ' + str(dof) + " -> " + coord_label
+        result_data = self._get_result_at_dof(dof, selected_result)
+        if self.n_load_cases is not None:
+            # envelope of the load cases
+            plot_title = "Envelope of " + str(self.n_load_cases) + " load cases: " + plot_title
+            result_data = result_data[np.argmax(abs(result_data), axis=0), np.arange(result_data.shape[1])]
+
         plotter_utilities.plot_dynamic_result(pdf_report,
                                               display_plots,
                                               plot_title,
@@ -274,29 +516,13 @@ class DynamicAnalysis(AnalysisType):
         Pass to plot function:
             Plots the time series of required quantitiy 
         """
-        print('Writing result for selected dof in DynamicAnalysis \n')
+        logger.info('Writing result for selected dof in DynamicAnalysis')
 
-        if selected_result == 'displacement':
-            result_data = self.solver.displacement[dof, :]
-        elif selected_result == 'velocity':
-            result_data = self.solver.velocity[dof, :]
-        elif selected_result == 'acceleration':
-            result_data = self.solver.acceleration[dof, :]
-        elif selected_result == 'reaction':
-            if dof in self.structure_model.bc_dofs or dof in self.structure_model.elastic_bc_dofs:
-                result_data = self.solver.dynamic_reaction[dof, :]
-            else:
-                err_msg = "The selected DoF \"" + str(dof)
-                err_msg += "\" is not avaialbe in the list of available boundary condition dofs \n"
-                err_msg += "Choose one of: " + \
-                           ", ".join([str(val)
-                                      for val in self.structure_model.bc_dofs])
-                raise Exception(err_msg)
-        else:
-            err_msg = "The selected result \"" + selected_result
-            err_msg += "\" is not available \n"
-            err_msg += "Choose one of: \"displacement\", \"velocity\", \"acceleration\", \"reaction\""
-            raise Exception(err_msg)
+        if self.n_load_cases is not None:
+            self.write_load_case_statistics_at_dof(global_folder_path, dof, selected_result)
+            return
+
+        result_data = self._get_result_at_dof(dof, selected_result)
 
         coord_label = GD.DOF_LABELS[self.structure_model.domain_size][int(dof % GD.DOFS_PER_NODE[self.structure_model.domain_size])]
 
@@ -312,6 +538,25 @@ class DynamicAnalysis(AnalysisType):
                                              result_data,
                                              self.array_time)
 
+    def write_load_case_statistics_at_dof(self, global_folder_path, dof, selected_result):
+        statistics = self.get_load_case_statistics(dof, selected_result)
+
+        coord_label = GD.DOF_LABELS[self.structure_model.domain_size][int(dof % GD.DOFS_PER_NODE[self.structure_model.domain_size])]
+
+        file_header = "# Dynamic Analysis result " + selected_result + " statistics per load case\n"
+        file_header += "# for DoF " + str(dof) + " -> " + coord_label + " over time \n"
+        file_header += "# load_case max min mean std \n"
+
+        lines = [[str(idx)] + ['{:.8f}'.format(statistics[key][idx]) for key in ['max', 'min', 'mean', 'std']]
+                 for idx in range(self.n_load_cases)]
+
+        file_name = 'dynamic_analysis_load_case_statistics_' + \
+                    selected_result + '_for_dof_' + str(dof) + '.dat'
+
+        writer_utilities.write_table(os_join(global_folder_path, file_name),
+                                     file_header,
+                                     lines)
+
     def plot_selected_time(self, pdf_report, display_plots, selected_time):
         """
         Pass to plot function:
@@ -320,18 +565,19 @@ class DynamicAnalysis(AnalysisType):
 
         """
 
-        print("Plotting result for a selected time step in DynamicAnalysis \n")
+        logger.info("Plotting result for a selected time step in DynamicAnalysis")
 
         # find closet time step
         idx_time = np.where(self.array_time >= selected_time)[0][0]
 
+        self._check_single_load_case('plot_time')
+        displacement = self._get_displacement_at_step(idx_time)
         for idx, label in zip(list(range(GD.DOFS_PER_NODE[self.structure_model.domain_size])),
                               GD.DOF_LABELS[self.structure_model.domain_size]):
             start = idx
             step = GD.DOFS_PER_NODE[self.structure_model.domain_size]
-            stop = self.solver.displacement.shape[0] + idx - step
-            self.structure_model.nodal_coordinates[label] = self.solver.displacement[start:stop +
-                                                                                     1:step][:, idx_time]
+            stop = displacement.shape[0] + idx - step
+            self.structure_model.nodal_coordinates[label] = displacement[start:stop + 1:step]
 
         geometry = {"undeformed": [self.structure_model.nodal_coordinates["x0"],
                                    self.structure_model.nodal_coordinates["y0"],
@@ -366,18 +612,19 @@ class DynamicAnalysis(AnalysisType):
 
         """
 
-        print("Plotting result for a selected time step in DynamicAnalysis \n")
+        logger.info("Plotting result for a selected time step in DynamicAnalysis")
 
         # find closet time step
         idx_time = np.where(self.array_time >= selected_time)[0][0]
 
+        self._check_single_load_case('write_time')
+        displacement = self._get_displacement_at_step(idx_time)
         for idx, label in zip(list(range(GD.DOFS_PER_NODE[self.structure_model.domain_size])),
                               GD.DOF_LABELS[self.structure_model.domain_size]):
             start = idx
             step = GD.DOFS_PER_NODE[self.structure_model.domain_size]
-            stop = self.solver.displacement.shape[0] + idx - step
-            self.structure_model.nodal_coordinates[label] = self.solver.displacement[start:stop +
-                                                                                     1:step][:, idx_time]
+            stop = displacement.shape[0] + idx - step
+            self.structure_model.nodal_coordinates[label] = displacement[start:stop + 1:step]
 
         geometry = {"undeformed": [self.structure_model.nodal_coordinates["x0"],
                                    self.structure_model.nodal_coordinates["y0"],
@@ -410,18 +657,19 @@ class DynamicAnalysis(AnalysisType):
 
         """
 
-        print("Plotting result for a selected step in DynamicAnalysis \n")
+        logger.info("Plotting result for a selected step in DynamicAnalysis")
 
         # TODO refactor so that plot_selected_time calls plot_selected_step
         idx_time = selected_step
 
+        self._check_single_load_case('plot_step')
+        displacement = self._get_displacement_at_step(idx_time)
         for idx, label in zip(list(range(GD.DOFS_PER_NODE[self.structure_model.domain_size])),
                               GD.DOF_LABELS[self.structure_model.domain_size]):
             start = idx
             step = GD.DOFS_PER_NODE[self.structure_model.domain_size]
-            stop = self.solver.displacement.shape[0] + idx - step
-            self.structure_model.nodal_coordinates[label] = self.solver.displacement[start:stop +
-                                                                                     1:step][:, idx_time]
+            stop = displacement.shape[0] + idx - step
+            self.structure_model.nodal_coordinates[label] = displacement[start:stop + 1:step]
 
         geometry = {"undeformed": [self.structure_model.nodal_coordinates["x0"],
                                    self.structure_model.nodal_coordinates["y0"],
@@ -449,7 +697,9 @@ class DynamicAnalysis(AnalysisType):
                                       1)
 
     def output_kinetic_energy(self, global_folder_path, pdf_report, display_plots, settings):
-        print("Calculate modal kinetic energy")       
+        logger.info("Calculate modal kinetic energy")       
+        self._check_full_histories('kinetic_energy')
+        self._check_single_load_case('kinetic_energy')
         
         m = self.structure_model.m  # which mass matrix ? lumped masses ?
         # k = self.structure_model.k  
@@ -460,7 +710,7 @@ class DynamicAnalysis(AnalysisType):
         # el_energy = np.zeros(len(self.array_time))
 
         for i in range(0,len(self.array_time)):
-            kin_energy[i] = 0.5 * np.dot(np.transpose(vel[:,i]),np.dot(m,vel[:,i]))
+            kin_energy[i] = 0.5 * np.dot(np.transpose(vel[:,i]),m.dot(vel[:,i]))
             # el_energy[i] = 0.5 * np.dot(np.transpose(disp[:,i]),np.dot(k,disp[:,i]))
 
 
@@ -517,18 +767,19 @@ class DynamicAnalysis(AnalysisType):
 
         """
 
-        print("Plotting result for a selected step in DynamicAnalysis \n")
+        logger.info("Plotting result for a selected step in DynamicAnalysis")
 
         # TODO refactor so that plot_selected_time calls plot_selected_step
         idx_time = selected_step
 
+        self._check_single_load_case('write_step')
+        displacement = self._get_displacement_at_step(idx_time)
         for idx, label in zip(list(range(GD.DOFS_PER_NODE[self.structure_model.domain_size])),
                               GD.DOF_LABELS[self.structure_model.domain_size]):
             start = idx
             step = GD.DOFS_PER_NODE[self.structure_model.domain_size]
-            stop = self.solver.displacement.shape[0] + idx - step
-            self.structure_model.nodal_coordinates[label] = self.solver.displacement[start:stop +
-                                                                                     1:step][:, idx_time]
+            stop = displacement.shape[0] + idx - step
+            self.structure_model.nodal_coordinates[label] = displacement[start:stop + 1:step]
 
         geometry = {"undeformed": [self.structure_model.nodal_coordinates["x0"],
                                    self.structure_model.nodal_coordinates["y0"],
@@ -559,15 +810,27 @@ class DynamicAnalysis(AnalysisType):
             self.solver.displacement -> here as time series  
         """
 
-        print("Animating time history in DynamicAnalysis \n")
-        print("Copying time step solution from solver")
+        logger.info("Animating time history in DynamicAnalysis")
+        self._check_single_load_case('animate_time_history')
+        logger.info("Copying time step solution from solver")
+        if self.recorder is None:
+            displacement = self.solver.displacement
+            array_time = self.array_time
+        else:
+            # animating the recorded snapshots
+            displacement = self.recorder.snapshots
+            array_time = self.array_time[self.recorder.snapshot_steps]
+            if displacement is None:
+                err_msg = "The animation requires displacement snapshots\n"
+                err_msg += "Set \"recording\" -> \"snapshot_interval\""
+                raise Exception(err_msg)
+
         for idx, label in zip(list(range(GD.DOFS_PER_NODE[self.structure_model.domain_size])),
                               GD.DOF_LABELS[self.structure_model.domain_size]):
             start = idx
             step = GD.DOFS_PER_NODE[self.structure_model.domain_size]
-            stop = self.solver.displacement.shape[0] + idx - step
-            self.structure_model.nodal_coordinates[label] = self.solver.displacement[start:stop +
-                                                                                     1:step]
+            stop = displacement.shape[0] + idx - step
+            self.structure_model.nodal_coordinates[label] = displacement[start:stop + 1:step]
 
         geometry = {"undeformed": [self.structure_model.nodal_coordinates["x0"],
                                    self.structure_model.nodal_coordinates["y0"],
@@ -586,15 +849,17 @@ class DynamicAnalysis(AnalysisType):
         plot_title = "Dyanimc Analyis: Deformation over time"
 
         plotter_utilities.animate_result(plot_title,
-                                         self.array_time,
+                                         array_time,
                                          geometry,
                                          force,
                                          scaling)
 
     def animate_skin_model_time_history(self, skin_model_params):
-        print("Animating skin model time history")
+        logger.info("Animating skin model time history")
+        self._check_full_histories('animate_skin_model_time_history')
+        self._check_single_load_case('animate_skin_model_time_history')
         if not self.parameters['output']['animate_time_history']:
-            print("Copying time step solution from solver")
+            logger.info("Copying time step solution from solver")
             for idx, label in zip(list(range(GD.DOFS_PER_NODE[self.structure_model.domain_size])),
                                   GD.DOF_LABELS[self.structure_model.domain_size]):
                 start = idx
@@ -620,7 +885,7 @@ class DynamicAnalysis(AnalysisType):
         """
         Postprocess something
         """
-        print("Postprocessing in DynamicAnalysis derived class \n")
+        logger.info("Postprocessing in DynamicAnalysis derived class")
 
         for time in self.parameters['output']['selected_instance']['plot_time']:
             self.plot_selected_time(pdf_report, display_plots, time)
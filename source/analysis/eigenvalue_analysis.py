@@ -10,6 +10,9 @@ import source.postprocess.plotter_utilities as plotter_utilities
 import source.postprocess.writer_utilitites as writer_utilities
 import source.postprocess.visualize_skin_model_utilities as visualize_skin_model_utilities
 from source.auxiliary.validate_and_assign_defaults import validate_and_assign_defaults
+from source.auxiliary.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class EigenvalueAnalysis(AnalysisType):
@@ -40,7 +43,7 @@ class EigenvalueAnalysis(AnalysisType):
         self.frequency = None
         self.period = None
 
-        self.comp_m = np.copy(self.structure_model.comp_m)
+        self.comp_m = self.structure_model.comp_m.copy()
 
     def solve(self, check_matrix=False):
 
@@ -56,26 +59,25 @@ class EigenvalueAnalysis(AnalysisType):
         gen_mass_raw = np.zeros(columns)
         gen_mass_norm = np.zeros(columns)
 
-        print("Generalized mass should be identity")
+        logger.debug("Generalized mass should be identity")
         for i in range(len(self.structure_model.eig_values_raw)):
-            gen_mass_raw[i] = np.matmul(np.matmul(np.transpose(self.structure_model.eigen_modes_raw[:, i]),
-                                                  self.comp_m), self.structure_model.eigen_modes_raw[:, i])
+            gen_mass_raw[i] = np.matmul(np.transpose(self.structure_model.eigen_modes_raw[:, i]),
+                                        self.comp_m.dot(self.structure_model.eigen_modes_raw[:, i]))
 
             unit_gen_mass_norm_fact = np.sqrt(gen_mass_raw[i])
 
             eig_modes_norm[:, i] = self.structure_model.eigen_modes_raw[:,
                                                                         i]/unit_gen_mass_norm_fact
 
-            gen_mass_norm[i] = np.matmul(np.matmul(np.transpose(eig_modes_norm[:, i]),
-                                                   self.comp_m), eig_modes_norm[:, i])
+            gen_mass_norm[i] = np.matmul(np.transpose(eig_modes_norm[:, i]),
+                                         self.comp_m.dot(eig_modes_norm[:, i]))
             # print("norm ", i, ": ",gen_mass_norm[i])
 
         if check_matrix:
-            gen_mass_norm = np.matmul(np.matmul(np.transpose(
-                eig_modes_norm), self.comp_m), eig_modes_norm)
-            print("Multiplication check: thethaT dot M dot theta: ",
-                  gen_mass_norm, " numerically 0 for off-diagonal terms")
-            print()
+            gen_mass_norm = np.matmul(np.transpose(
+                eig_modes_norm), self.comp_m.dot(eig_modes_norm))
+            logger.debug("Multiplication check: thethaT dot M dot theta: %s numerically 0 for off-diagonal terms",
+                         gen_mass_norm)
 
         self.eigenform = np.zeros(eig_modes_norm.shape)
         self.frequency = np.zeros(self.structure_model.eig_freqs.shape)
@@ -93,11 +95,12 @@ class EigenvalueAnalysis(AnalysisType):
     def write_eigenmode_summary(self, global_folder_path, considered_modes=15):
         # TODO check to avoid redundancy in EigenvalueAnalysis and StructureModel
         # TODO remove code duplication: considered_modes
+        # NOTE: limited by the number of computed modes
         if considered_modes == 'all':
-            considered_modes = len(self.structure_model.dofs_to_keep)
+            considered_modes = len(self.frequency)
         else:
-            if considered_modes > len(self.structure_model.dofs_to_keep):
-                considered_modes = len(self.structure_model.dofs_to_keep)
+            if considered_modes > len(self.frequency):
+                considered_modes = len(self.frequency)
 
         file_header = '# Result of eigenvalue analysis\n'
         file_header += '# Mode | Eigenfrequency [Hz] | Period [s]\n'
@@ -115,11 +118,12 @@ class EigenvalueAnalysis(AnalysisType):
     def plot_eigenmode_summary(self, pdf_report, display_plot, considered_modes=15):
         # TODO check to avoid redundancy in EigenvalueAnalysis and StructureModel
         # TODO remove code duplication: considered_modes
+        # NOTE: limited by the number of computed modes
         if considered_modes == 'all':
-            considered_modes = len(self.structure_model.dofs_to_keep)
+            considered_modes = len(self.frequency)
         else:
-            if considered_modes > len(self.structure_model.dofs_to_keep):
-                considered_modes = len(self.structure_model.dofs_to_keep)
+            if considered_modes > len(self.frequency):
+                considered_modes = len(self.frequency)
 
         table_data = []
         for idx in range(considered_modes):
@@ -239,7 +243,7 @@ class EigenvalueAnalysis(AnalysisType):
         """
         selected_mode = selected_mode - 1
 
-        print("Plotting result for a selected eigenmode in EigenvalueAnalysis \n")
+        logger.info("Plotting result for a selected eigenmode in EigenvalueAnalysis")
 
         # nullify close to zero values
         # TODO: add to multiple places
@@ -296,7 +300,7 @@ class EigenvalueAnalysis(AnalysisType):
         """
         selected_mode = selected_mode - 1
 
-        print("Plotting result for a selected eigenmode in EigenvalueAnalysis \n")
+        logger.info("Plotting result for a selected eigenmode in EigenvalueAnalysis")
 
         for idx, label in zip(list(range(GD.DOFS_PER_NODE[self.structure_model.domain_size])),
                               GD.DOF_LABELS[self.structure_model.domain_size]):
@@ -345,7 +349,7 @@ class EigenvalueAnalysis(AnalysisType):
             self.period -> in legend
         """
 
-        print("Plotting result for selected first n eigenmodes in EigenvalueAnalysis \n")
+        logger.info("Plotting result for selected first n eigenmodes in EigenvalueAnalysis")
 
         for idx, label in zip(list(range(GD.DOFS_PER_NODE[self.structure_model.domain_size])),
                               GD.DOF_LABELS[self.structure_model.domain_size]):
@@ -394,7 +398,7 @@ class EigenvalueAnalysis(AnalysisType):
         """
         selected_mode = selected_mode - 1
 
-        print("Animating eigenmode in EigenvalueAnalysis \n")
+        logger.info("Animating eigenmode in EigenvalueAnalysis")
 
         time_steps = 100
         array_time = np.sin(2 * np.pi * self.frequency[selected_mode] * np.linspace(
@@ -460,7 +464,7 @@ class EigenvalueAnalysis(AnalysisType):
         """
         Postprocess something
         """
-        print("Postprocessing in EigenvalueAnalysis derived class \n")
+        logger.info("Postprocessing in EigenvalueAnalysis derived class")
 
         if self.parameters['output']['eigenmode_summary']['write']:
             self.write_eigenmode_summary(global_folder_path)
@@ -0,0 +1,204 @@
+from os.path import join as os_join
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import copy
+
+import numpy as np
+
+import source.postprocess.writer_utilitites as writer_utilities
+from source.analysis.dynamic_analysis import DynamicAnalysis
+from source.auxiliary.validate_and_assign_defaults import validate_and_assign_defaults
+from source.auxiliary.logger import get_logger, configure_logging
+
+logger = get_logger(__name__)
+
+STATISTICS_LABELS = ['max', 'min', 'mean', 'std']
+
+# state of a worker process: the model and the settings are shipped once per worker
+_worker_state = {}
+
+
+def run_realization(structure_model, parameters, array_time, seed_sequence,
+                    load_generator=None, parameter_sampler=None):
+    '''
+    Solve a single realization of the dynamic analysis and return the statistics
+    over time of the selected results: {(dof, result): [max, min, mean, std]}
+
+    load_generator(rng, structure_model, array_time) returns the force with the shape (n_dofs, n_steps),
+    parameter_sampler(rng, structure_model) modifies the properties of the (copied) model
+    '''
+    rng = np.random.default_rng(seed_sequence)
+
+    if parameter_sampler is not None:
+        structure_model = copy.deepcopy(structure_model)
+        parameter_sampler(rng, structure_model)
+        structure_model.update_global_matrices(update_rayleigh_coefficients=True)
+
+    force = None
+    if load_generator is not None:
+        force = load_generator(rng, structure_model, array_time)
+
+    analysis = DynamicAnalysis(structure_model, copy.deepcopy(parameters), force)
+    analysis.solve()
+
+    statistics = {}
+    selected_dof = parameters['output']['selected_dof']
+    for idx_dof, dof_id in enumerate(selected_dof['dof_list']):
+        for res in selected_dof['result_type'][idx_dof]:
+            result_statistics = analysis.get_load_case_statistics(dof_id, res)
+            statistics[(dof_id, res)] = [float(result_statistics[label]) for label in STATISTICS_LABELS]
+    return statistics
+
+
+def _initialize_worker(structure_model, parameters, array_time, load_generator, parameter_sampler, logging_level):
+    configure_logging(logging_level)
+    _worker_state['structure_model'] = structure_model
+    _worker_state['parameters'] = parameters
+    _worker_state['array_time'] = array_time
+    _worker_state['load_generator'] = load_generator
+    _worker_state['parameter_sampler'] = parameter_sampler
+
+
+def _run_realization_in_worker(realization, seed_sequence):
+    return realization, run_realization(_worker_state['structure_model'],
+                                        _worker_state['parameters'],
+                                        _worker_state['array_time'],
+                                        seed_sequence,
+                                        _worker_state['load_generator'],
+                                        _worker_state['parameter_sampler'])
+
+
+class MonteCarloAnalysis(object):
+    """
+    Ensemble of dynamic analyses for realizations of stochastic loads and/or parameters
+
+    The realizations run over a process pool, the model is built once and shipped
+    to each worker. Every realization gets its own seed spawned from the ensemble
+    seed, the results do not depend on the number of workers or the scheduling.
+    The workers only record the selected dofs and return their statistics over time.
+
+    NOTE: the load generator and the parameter sampler have to be picklable,
+    e.g. functions defined on module level
+    """
+
+    # using these as default or fallback settings
+    DEFAULT_SETTINGS = {
+        "type": "monte_carlo_analysis",
+        "settings": {},
+        "dynamic_analysis": {},
+        "output": {}}
+
+    def __init__(self, structure_model, parameters, load_generator=None, parameter_sampler=None):
+
+        # validating and assign model parameters
+        validate_and_assign_defaults(
+            MonteCarloAnalysis.DEFAULT_SETTINGS, parameters)
+        self.parameters = parameters
+        self.structure_model = structure_model
+        self.load_generator = load_generator
+        self.parameter_sampler = parameter_sampler
+
+        self.number_of_realizations = self.parameters['settings']['number_of_realizations']
+        if self.number_of_realizations < 1:
+            err_msg = "The number of realizations has to be >= 1, provided: " + \
+                str(self.number_of_realizations)
+            raise Exception(err_msg)
+
+        self.seed = 0
+        if 'seed' in self.parameters['settings']:
+            self.seed = self.parameters['settings']['seed']
+
+        # None uses all available processors, 1 runs in this process
+        self.number_of_workers = None
+        if 'number_of_workers' in self.parameters['settings']:
+            self.number_of_workers = self.parameters['settings']['number_of_workers']
+
+        # the workers keep only the histories of the selected dofs
+        self.dynamic_analysis_parameters = copy.deepcopy(self.parameters['dynamic_analysis'])
+        if 'selected_dof' not in self.dynamic_analysis_parameters['output']:
+            err_msg = "The Monte Carlo analysis requires selected dofs in\n"
+            err_msg += "\"dynamic_analysis\" -> \"output\" -> \"selected_dof\""
+            raise Exception(err_msg)
+        if 'recording' not in self.dynamic_analysis_parameters['settings']:
+            self.dynamic_analysis_parameters['settings']['recording'] = {"selected_dofs_only": True}
+
+        time_settings = self.dynamic_analysis_parameters['settings']['time']
+        steps = int((time_settings['end'] - time_settings['start']) / time_settings['step']) + 1
+        self.array_time = np.linspace(time_settings['start'], time_settings['end'], steps)
+
+        # statistics over time per realization: {(dof, result): array of shape (n_realizations, 4)}
+        self.statistics = {}
+
+    def get_seed_sequences(self):
+        # independent and reproducible streams per realization
+        return np.random.SeedSequence(self.seed).spawn(self.number_of_realizations)
+
+    def _add_realization(self, realization, statistics):
+        for key, values in statistics.items():
+            if key not in self.statistics:
+                self.statistics[key] = np.full((self.number_of_realizations, len(STATISTICS_LABELS)), np.nan)
+            self.statistics[key][realization] = values
+
+    def solve(self):
+        logger.info("Solving %d realizations in the Monte Carlo analysis", self.number_of_realizations)
+        seed_sequences = self.get_seed_sequences()
+
+        if self.number_of_workers == 1:
+            for realization, seed_sequence in enumerate(seed_sequences):
+                self._add_realization(realization, run_realization(
+                    self.structure_model, self.dynamic_analysis_parameters, self.array_time,
+                    seed_sequence, self.load_generator, self.parameter_sampler))
+                logger.info("Realization %d of %d finished", realization + 1, self.number_of_realizations)
+            return
+
+        # the workers only report warnings, the progress is logged here
+        with ProcessPoolExecutor(max_workers=self.number_of_workers,
+                                 initializer=_initialize_worker,
+                                 initargs=(self.structure_model, self.dynamic_analysis_parameters,
+                                           self.array_time, self.load_generator,
+                                           self.parameter_sampler, 'warning')) as executor:
+            futures = [executor.submit(_run_realization_in_worker, realization, seed_sequence)
+                       for realization, seed_sequence in enumerate(seed_sequences)]
+            for counter, future in enumerate(as_completed(futures)):
+                realization, statistics = future.result()
+                self._add_realization(realization, statistics)
+                logger.info("Realization %d of %d finished", counter + 1, self.number_of_realizations)
+
+    def get_ensemble_statistics(self, dof, selected_result):
+        '''
+        mean and standard deviation over the realizations
+        of the statistics over time: max, min, mean, std
+        '''
+        if (dof, selected_result) not in self.statistics:
+            err_msg = "The result \"" + selected_result + "\" for DoF " + str(dof)
+            err_msg += " is not part of the Monte Carlo analysis"
+            raise Exception(err_msg)
+        values = self.statistics[(dof, selected_result)]
+        return {'mean': dict(zip(STATISTICS_LABELS, np.mean(values, axis=0))),
+                'std': dict(zip(STATISTICS_LABELS, np.std(values, axis=0)))}
+
+    def write_statistics_at_dof(self, global_folder_path, dof, selected_result):
+        values = self.statistics[(dof, selected_result)]
+        ensemble_statistics = self.get_ensemble_statistics(dof, selected_result)
+
+        file_header = "# Monte Carlo Analysis result " + selected_result + " for DoF " + str(dof) + "\n"
+        file_header += "# " + str(self.number_of_realizations) + " realizations, seed " + str(self.seed) + "\n"
+        for moment in ['mean', 'std']:
+            file_header += "# " + moment + " over realizations: " + \
+                ' '.join([label + ' = ' + '{:.8f}'.format(ensemble_statistics[moment][label])
+                          for label in STATISTICS_LABELS]) + "\n"
+        file_header += "# realization " + ' '.join(STATISTICS_LABELS) + "\n"
+
+        lines = [[str(idx)] + ['{:.8f}'.format(val) for val in values[idx]]
+                 for idx in range(self.number_of_realizations)]
+
+        file_name = 'monte_carlo_analysis_statistics_' + \
+                    selected_result + '_for_dof_' + str(dof) + '.dat'
+
+        writer_utilities.write_table(os_join(global_folder_path, file_name),
+                                     file_header,
+                                     lines)
+
+    def postprocess(self, global_folder_path, pdf_report=None, display_plots=False, skin_model_params=None):
+        logger.info("Postprocessing in MonteCarloAnalysis")
+        for dof, selected_result in self.statistics.keys():
+            self.write_statistics_at_dof(global_folder_path, dof, selected_result)
@@ -6,9 +6,13 @@ from source.analysis.analysis_type import AnalysisType
 from source.model.structure_model import StraightBeam
 import source.postprocess.plotter_utilities as plotter_utilities
 import source.postprocess.writer_utilitites as writer_utilities
+import source.auxiliary.matrix_utilities as matrix_utilities
 from source.auxiliary.validate_and_assign_defaults import validate_and_assign_defaults
 from source.auxiliary.other_utilities import get_adjusted_path_string
 import source.auxiliary.global_definitions as GD
+from source.auxiliary.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class StaticAnalysis(AnalysisType):
@@ -39,7 +43,7 @@ class StaticAnalysis(AnalysisType):
             err_msg += " is not a valid file!"
             raise Exception(err_msg)
         else:
-            print(get_adjusted_path_string(
+            logger.info(get_adjusted_path_string(
                 self.parameters['input']['file_path']) + ' set as load file path in StaticAnalysis')
             if self.parameters['input']['is_time_history_file']:
                 self.force = np.load(get_adjusted_path_string(self.parameters['input']['file_path']))[
@@ -78,14 +82,13 @@ class StaticAnalysis(AnalysisType):
             raise Exception(err_msg)
 
     def solve(self):
-        print("Solving for ext_force in StaticAnalysis derived class \n")
+        logger.info("Solving for ext_force in StaticAnalysis derived class")
         # self.force = ext_force
         force = self.structure_model.apply_bc_by_reduction(
             self.force, 'row_vector')
 
         k = self.structure_model.apply_bc_by_reduction(self.structure_model.k)
-        print(k)
-        self.static_result = np.linalg.solve(k, force)
+        self.static_result = matrix_utilities.solve(k, force)
         self.static_result = self.structure_model.recuperate_bc_by_extension(
             self.static_result, 'row_vector')
         self.force_action = {"x": np.zeros(0),
@@ -97,7 +100,7 @@ class StaticAnalysis(AnalysisType):
 
         #self.force = self.structure_model.recuperate_bc_by_extension(self.force,'row_vector')
         self.resisting_force = self.force - \
-            np.dot(self.structure_model.k, self.static_result)
+            self.structure_model.k.dot(self.static_result)
         ixgrid = np.ix_(self.structure_model.dofs_to_keep, [0])
         self.resisting_force[ixgrid] = 0
         self.reaction = {"x": np.zeros(0),
@@ -116,7 +119,7 @@ class StaticAnalysis(AnalysisType):
             self.reaction_force
         """
 
-        print("Plotting result in StaticAnalysis \n")
+        logger.info("Plotting result in StaticAnalysis")
 
         for idx, label in zip(list(range(GD.DOFS_PER_NODE[self.structure_model.domain_size])),
                               GD.DOF_LABELS[self.structure_model.domain_size]):
@@ -165,7 +168,7 @@ class StaticAnalysis(AnalysisType):
             self.reaction_force
         """
 
-        print("Plotting result in StaticAnalysis \n")
+        logger.info("Plotting result in StaticAnalysis")
 
         for idx, label in zip(list(range(GD.DOFS_PER_NODE[self.structure_model.domain_size])),
                               GD.DOF_LABELS[self.structure_model.domain_size]):
@@ -206,7 +209,7 @@ class StaticAnalysis(AnalysisType):
         """
         Postprocess something
         """
-        print("Postprocessing in StaticAnalysis derived class \n")
+        logger.info("Postprocessing in StaticAnalysis derived class")
 
         for plot_result in self.parameters['output']['plot']:
             if plot_result == 'deformation':
@@ -0,0 +1,46 @@
+import source.auxiliary.matrix_utilities as matrix_utilities
+
+
+class EigenSolutionCache(object):
+    '''
+    Cache of the generalized eigenvalue solutions keyed by the
+    fingerprints of the stiffness and mass matrix and the number of modes
+
+    Repeated solves on unchanged matrices are served from the cache,
+    the cached arrays are read-only as they are shared between the callers
+    '''
+
+    def __init__(self, max_size=4):
+        # oldest entries are removed first once max_size is reached
+        # NOTE: each entry stores the eigenmodes - a dense matrix
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = {}
+
+    def get_eigen_solution(self, k, m, number_of_modes=None):
+        key = (matrix_utilities.get_fingerprint(k),
+               matrix_utilities.get_fingerprint(m),
+               number_of_modes)
+
+        if key in self._cache:
+            self.hits += 1
+            return self._cache[key]
+
+        self.misses += 1
+        eig_values, eig_modes = matrix_utilities.generalized_eigh(k, m, number_of_modes)
+        eig_values.flags.writeable = False
+        eig_modes.flags.writeable = False
+
+        if self._cache and len(self._cache) >= self.max_size:
+            # dicts keep the insertion order -> remove the oldest entry
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = (eig_values, eig_modes)
+
+        return eig_values, eig_modes
+
+    def cache_info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache)}
+
+    def clear(self):
+        self._cache = {}
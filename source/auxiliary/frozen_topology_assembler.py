@@ -0,0 +1,106 @@
+import numpy as np
+from scipy import sparse
+
+import source.auxiliary.matrix_utilities as matrix_utilities
+
+
+class FrozenTopologyAssembler(object):
+    '''
+    Repeated assembly of element matrices with a fixed sparsity pattern,
+    e.g. the tangent stiffness in each nonlinear iteration
+
+    The global matrix (dense, sparse or banded) is allocated once,
+    the scatter of the element entries into its stored values is precomputed:
+    each assembly gathers the entries, sums the ones with the same position
+    and overwrites the values in place, all in preallocated buffers
+    NOTE: the returned matrix is overwritten by the next assembly
+    '''
+
+    def __init__(self, el_dof_indices, size, matrix_format='dense', point_dofs=(), dof_map=None):
+        if matrix_format not in matrix_utilities.AVAILABLE_MATRIX_FORMATS:
+            err_msg = "The requested matrix format \"" + matrix_format + "\" is not available\n"
+            err_msg += "Choose one of: \"" + "\", \"".join(matrix_utilities.AVAILABLE_MATRIX_FORMATS) + "\""
+            raise Exception(err_msg)
+        self.matrix_format = matrix_format
+        self.size = size
+
+        el_dof_indices = np.asarray(el_dof_indices)
+        n_el, el_size = el_dof_indices.shape
+        self.element_shape = (n_el, el_size, el_size)
+        self.point_dofs = list(point_dofs)
+
+        # the pattern from the entries of all elements and point values
+        n_el_entries = n_el * el_size * el_size
+        n_entries = n_el_entries + len(self.point_dofs)
+        rows, cols, entry_ids = matrix_utilities._get_assembly_entries(
+            np.arange(n_el_entries, dtype=float).reshape(self.element_shape), el_dof_indices,
+            {dof: n_el_entries + idx for idx, dof in enumerate(self.point_dofs)}, dof_map)
+        entry_ids = entry_ids.astype(int)
+
+        self.matrix = self._allocate(rows, cols)
+        targets = self._get_targets(rows, cols)
+
+        # entries sorted by their position, summed up per position
+        order = np.argsort(targets, kind='stable')
+        sorted_targets = targets[order]
+        self.starts = np.flatnonzero(np.concatenate(([True], sorted_targets[1:] != sorted_targets[:-1])))
+        self.targets = sorted_targets[self.starts]
+        self.entry_order = entry_ids[order]
+
+        # buffers
+        self.element_matrices = np.zeros(self.element_shape)
+        self._entries = np.zeros(n_entries)
+        self._sorted_entries = np.zeros(len(self.entry_order))
+        self._values = np.zeros(len(self.targets))
+
+    def _allocate(self, rows, cols):
+        if self.matrix_format == 'dense':
+            return np.zeros((self.size, self.size))
+        pattern = sparse.coo_matrix((np.ones(len(rows)), (rows, cols)), shape=(self.size, self.size)).tocsr()
+        if self.matrix_format == 'banded':
+            matrix = pattern.todia()
+        else:
+            matrix = pattern
+        matrix.data[:] = 0.0
+        return matrix
+
+    def _get_targets(self, rows, cols):
+        '''
+        flat position of each entry in the stored values of the matrix
+        '''
+        if self.matrix_format == 'dense':
+            return rows * self.size + cols
+        if self.matrix_format == 'banded':
+            # DIA: data[i_offset, col] stores matrix[col - offset, col]
+            offset_ids = np.full(2 * self.size - 1, -1, dtype=int)
+            offset_ids[self.matrix.offsets + self.size - 1] = np.arange(len(self.matrix.offsets))
+            return offset_ids[cols - rows + self.size - 1] * self.matrix.data.shape[1] + cols
+        # CSR: lookup of the positions stored as values
+        positions = self.matrix.copy()
+        positions.data = np.arange(1, positions.nnz + 1, dtype=float)
+        return np.asarray(positions[rows, cols]).ravel().astype(int) - 1
+
+    def is_compatible(self, point_values):
+        # same point dofs as the frozen pattern
+        return len(point_values) == len(self.point_dofs) and \
+            all(dof in point_values for dof in self.point_dofs)
+
+    def assemble(self, el_matrices=None, point_values=None):
+        '''
+        el_matrices with shape (n_el, el_size, el_size), by default the buffer self.element_matrices
+        point_values as dict {global_dof: value} for the point dofs of the pattern
+        '''
+        if el_matrices is None:
+            el_matrices = self.element_matrices
+        n_el_entries = self._entries.size - len(self.point_dofs)
+        np.copyto(self._entries[:n_el_entries], np.reshape(el_matrices, -1))
+        for idx, dof in enumerate(self.point_dofs):
+            self._entries[n_el_entries + idx] = point_values[dof]
+
+        np.take(self._entries, self.entry_order, out=self._sorted_entries)
+        np.add.reduceat(self._sorted_entries, self.starts, out=self._values)
+        if self.matrix_format == 'dense':
+            np.put(self.matrix, self.targets, self._values)
+        else:
+            np.put(self.matrix.data, self.targets, self._values)
+        return self.matrix
@@ -0,0 +1,106 @@
+import logging
+import sys
+import time
+
+LOGGER_NAME = 'ParOptBeam'
+
+# 'silent' suppresses all messages - e.g. for production runs and optimization loops
+AVAILABLE_LEVELS = {'debug': logging.DEBUG,
+                    'info': logging.INFO,
+                    'warning': logging.WARNING,
+                    'error': logging.ERROR,
+                    'silent': logging.CRITICAL + 10}
+
+DEFAULT_LEVEL = 'info'
+
+# minimum wall time in seconds between two progress messages
+DEFAULT_PROGRESS_INTERVAL = 1.0
+
+# the file handler of the last configure_logging call, replaced by the next one
+_settings = {'progress_interval': DEFAULT_PROGRESS_INTERVAL, 'file_handler': None}
+
+
+def _get_root_logger():
+    root_logger = logging.getLogger(LOGGER_NAME)
+    if not root_logger.handlers:
+        # same appearance as the print statements used so far
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        root_logger.addHandler(handler)
+        root_logger.setLevel(AVAILABLE_LEVELS[DEFAULT_LEVEL])
+        root_logger.propagate = False
+    return root_logger
+
+
+def get_logger(name):
+    '''
+    Logger for a module, a child of the ParOptBeam logger
+    '''
+    _get_root_logger()
+    return logging.getLogger(LOGGER_NAME + '.' + name)
+
+
+def configure_logging(level=DEFAULT_LEVEL, progress_interval=None, log_file=None):
+    '''
+    level: one of AVAILABLE_LEVELS
+    progress_interval: minimum wall time in seconds between progress messages,
+    0.0 reports every step
+    log_file: optional file the messages are written to in addition to the console,
+    replaces the file of a previous call
+    '''
+    if level not in AVAILABLE_LEVELS:
+        err_msg = "The requested logging level \"" + str(level)
+        err_msg += "\" is not available \n"
+        err_msg += "Choose one of: \"" + "\", \"".join(AVAILABLE_LEVELS.keys()) + "\""
+        raise Exception(err_msg)
+
+    root_logger = _get_root_logger()
+    root_logger.setLevel(AVAILABLE_LEVELS[level])
+
+    if progress_interval is not None:
+        if progress_interval < 0.0:
+            err_msg = "The progress interval has to be >= 0.0, provided: " + str(progress_interval)
+            raise Exception(err_msg)
+        _settings['progress_interval'] = progress_interval
+
+    if log_file is not None:
+        previous_handler = _settings['file_handler']
+        if previous_handler is not None:
+            root_logger.removeHandler(previous_handler)
+            previous_handler.close()
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        root_logger.addHandler(handler)
+        _settings['file_handler'] = handler
+
+
+def set_quiet_mode():
+    configure_logging('silent')
+
+
+class ProgressLogger(object):
+    '''
+    Rate limited progress messages for time loops
+
+    The first and the last step are always reported, in between at most
+    one message per progress interval
+    '''
+
+    def __init__(self, logger, n_steps, progress_interval=None):
+        self.logger = logger
+        self.n_steps = n_steps
+        if progress_interval is None:
+            progress_interval = _settings['progress_interval']
+        self.progress_interval = progress_interval
+        self.last_log_time = None
+
+    def log(self, step, current_time):
+        # cheap check first, in quiet mode nothing else is evaluated
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        now = time.perf_counter()
+        if (self.last_log_time is None or step == self.n_steps - 1
+                or now - self.last_log_time >= self.progress_interval):
+            self.last_log_time = now
+            self.logger.info("time: {0:.2f} (step {1} of {2})".format(
+                current_time, step + 1, self.n_steps))
@@ -0,0 +1,299 @@
+import hashlib
+
+import numpy as np
+from scipy import linalg
+from scipy import sparse
+from scipy.sparse import linalg as sparse_linalg
+
+AVAILABLE_MATRIX_FORMATS = ['dense', 'sparse', 'banded']
+
+# NOTE: default number of modes computed by the sparse eigenvalue solve
+# by default 15 modes are considered in the mode identification
+SPARSE_EIGEN_NUMBER_OF_MODES = 20
+
+
+def is_sparse(matrix):
+    return sparse.issparse(matrix)
+
+
+def is_banded(matrix):
+    # banded matrices are stored as sparse matrices in diagonal (DIA) format
+    return is_sparse(matrix) and matrix.format == 'dia'
+
+
+def is_symmetric(matrix, rel_tol=1e-12):
+    if is_sparse(matrix):
+        difference = abs((matrix - matrix.T).tocsr())
+        reference = abs(matrix.tocsr())
+        if difference.nnz == 0:
+            return True
+        return difference.max() <= rel_tol * reference.max()
+    return np.allclose(matrix, matrix.T, rtol=0.0, atol=rel_tol * abs(matrix).max())
+
+
+def get_fingerprint(matrix):
+    '''
+    Cheap hash of the matrix content - a linear pass over the stored entries
+    '''
+    hash_function = hashlib.sha1()
+    if is_sparse(matrix):
+        matrix = matrix.tocsr()
+        # same entries in a different order should give the same fingerprint
+        if not matrix.has_sorted_indices:
+            matrix = matrix.sorted_indices()
+        arrays = [matrix.data, matrix.indices, matrix.indptr]
+    else:
+        arrays = [matrix]
+    hash_function.update(str((matrix.shape, matrix.dtype.str)).encode())
+    for array in arrays:
+        hash_function.update(np.ascontiguousarray(array))
+    return hash_function.hexdigest()
+
+
+def get_bandwidth(matrix):
+    '''
+    Return the number of lower and upper off-diagonals containing non-zeros
+    '''
+    coo = sparse.coo_matrix(matrix)
+    nonzero = coo.data != 0.0
+    if not np.any(nonzero):
+        return 0, 0
+    offsets = coo.col[nonzero] - coo.row[nonzero]
+    return int(max(-offsets.min(), 0)), int(max(offsets.max(), 0))
+
+
+def to_banded(matrix, lower, upper):
+    '''
+    Convert a square matrix into the LAPACK band storage with shape
+    (lower + upper + 1, n) where ab[upper + i - j, j] = matrix[i, j]
+    '''
+    n_dofs = matrix.shape[0]
+    ab = np.zeros((lower + upper + 1, n_dofs))
+    dia = sparse.dia_matrix(matrix)
+    for offset, diagonal in zip(dia.offsets, dia.data):
+        if -lower <= offset <= upper:
+            width = min(len(diagonal), n_dofs)
+            ab[upper - offset, :width] += diagonal[:width]
+    return ab
+
+
+def _get_assembly_entries(el_matrices, el_dof_indices, point_values=None, dof_map=None):
+    '''
+    Coordinate (row, column, value) entries of a stack of element matrices
+    with shape (n_el, el_size, el_size) and their dof indices with shape (n_el, el_size)
+
+    point_values is a dict with {global_dof: value} for diagonal entries
+    dof_map maps the global dofs to the assembled ones, negative values
+    mark dofs which are not assembled - e.g. the ones constrained by BCs
+    '''
+    el_matrices = np.asarray(el_matrices)
+    el_size = el_matrices.shape[1]
+    el_dof_indices = np.asarray(el_dof_indices)
+
+    rows = np.repeat(el_dof_indices, el_size, axis=1).ravel()
+    cols = np.tile(el_dof_indices, (1, el_size)).ravel()
+    data = el_matrices.ravel()
+
+    if point_values:
+        point_dofs = np.fromiter(point_values.keys(), dtype=int)
+        point_vals = np.fromiter(point_values.values(), dtype=float)
+        rows = np.concatenate((rows, point_dofs))
+        cols = np.concatenate((cols, point_dofs))
+        data = np.concatenate((data, point_vals))
+
+    if dof_map is not None:
+        rows = dof_map[rows]
+        cols = dof_map[cols]
+        is_assembled = (rows >= 0) & (cols >= 0)
+        rows, cols, data = rows[is_assembled], cols[is_assembled], data[is_assembled]
+
+    return rows, cols, data
+
+
+def assemble_sparse(el_matrices, el_dof_indices, size, point_values=None, dof_map=None):
+    '''
+    Assemble a stack of element matrices into a global CSR matrix of shape (size, size)
+
+    duplicate entries (shared nodes) are summed up by the COO to CSR conversion
+    '''
+    rows, cols, data = _get_assembly_entries(el_matrices, el_dof_indices, point_values, dof_map)
+    return sparse.coo_matrix((data, (rows, cols)), shape=(size, size)).tocsr()
+
+
+def assemble_dense(el_matrices, el_dof_indices, size, point_values=None, dof_map=None):
+    '''
+    Assemble a stack of element matrices into a global dense matrix of shape (size, size)
+
+    the entries are summed up in the order of the elements followed by the point values
+    '''
+    rows, cols, data = _get_assembly_entries(el_matrices, el_dof_indices, point_values, dof_map)
+    return np.bincount(rows * size + cols, weights=data, minlength=size * size).reshape(size, size)
+
+
+def add_to_assembled(matrix, el_matrices, el_dof_indices, point_values=None, dof_map=None):
+    '''
+    Add a stack of element matrices (e.g. changes of some elements) and point values
+    into an already assembled matrix, dense matrices are updated in place
+    '''
+    rows, cols, data = _get_assembly_entries(el_matrices, el_dof_indices, point_values, dof_map)
+    if is_sparse(matrix):
+        delta = sparse.coo_matrix((data, (rows, cols)), shape=matrix.shape)
+        return (matrix + delta).asformat(matrix.format)
+    np.add.at(matrix, (rows, cols), data)
+    return matrix
+
+
+def solve(lhs, rhs):
+    '''
+    Solve lhs * x = rhs for a dense or a sparse lhs
+    '''
+    if is_banded(lhs):
+        return factorized_banded(lhs)(rhs)
+    if is_sparse(lhs):
+        return sparse_linalg.spsolve(lhs.tocsc(), rhs)
+    return np.linalg.solve(lhs, rhs)
+
+
+def factorized(lhs):
+    '''
+    Factorize lhs once and return a function solving lhs * x = rhs
+    for repeated right hand sides
+
+    Dense symmetric positive definite matrices use the Cholesky, others the LU
+    '''
+    if is_banded(lhs):
+        return factorized_banded(lhs)
+    if is_sparse(lhs):
+        return sparse_linalg.factorized(lhs.tocsc())
+    if lhs.ndim == 1:
+        # system: in vector (from diagonal matrix) form
+        return lambda rhs: rhs / lhs
+    if is_symmetric(lhs):
+        try:
+            cholesky = linalg.cho_factor(lhs, check_finite=False)
+            return lambda rhs: linalg.cho_solve(cholesky, rhs, check_finite=False)
+        except linalg.LinAlgError:
+            # not positive definite - fall back to LU
+            pass
+    lu_and_piv = linalg.lu_factor(lhs)
+    return lambda rhs: linalg.lu_solve(lu_and_piv, rhs, check_finite=False)
+
+
+def factorized_banded(lhs):
+    '''
+    Factorize lhs in band storage, the cost scales linearly with the size
+    for a fixed bandwidth
+
+    Symmetric positive definite matrices use the banded Cholesky,
+    non-symmetric or indefinite ones (e.g. nonlinear tangents) the banded LU
+    '''
+    lower, upper = get_bandwidth(lhs)
+
+    if lower == upper and is_symmetric(lhs):
+        try:
+            cholesky = linalg.cholesky_banded(to_banded(lhs, 0, upper),
+                                              lower=False, check_finite=False)
+            return lambda rhs: linalg.cho_solve_banded((cholesky, False), rhs,
+                                                       check_finite=False)
+        except linalg.LinAlgError:
+            # not positive definite - fall back to LU
+            pass
+
+    # the LU factorization needs lower additional rows for the fill-in by pivoting
+    ab = np.zeros((2 * lower + upper + 1, lhs.shape[0]))
+    ab[lower:, :] = to_banded(lhs, lower, upper)
+    gbtrf, gbtrs = linalg.get_lapack_funcs(('gbtrf', 'gbtrs'), (ab,))
+    lu, piv, info = gbtrf(ab, lower, upper)
+    if info > 0:
+        err_msg = "The banded matrix is singular, zero pivot in row " + str(info)
+        raise Exception(err_msg)
+
+    def solve_lu(rhs):
+        x, info = gbtrs(lu, lower, upper, rhs, piv)
+        if info != 0:
+            err_msg = "The banded LU solve failed, illegal value in argument " + str(-info)
+            raise Exception(err_msg)
+        return x
+
+    return solve_lu
+
+
+def generalized_eigh(k, m, number_of_modes=None):
+    '''
+    Solve the generalized symmetric eigenvalue problem k * phi = lambda * m * phi
+    for the lowest number_of_modes modes, sorted ascending
+
+    Dense input computes the full spectrum by default, otherwise only the
+    requested subset of eigenpairs
+    Sparse (and banded) input uses a shift-invert Lanczos around 0.0,
+    for small systems where this is not possible it falls back to dense
+    '''
+    if number_of_modes is None:
+        if not is_sparse(k):
+            return linalg.eigh(k, m)
+        number_of_modes = SPARSE_EIGEN_NUMBER_OF_MODES
+
+    n_dofs = k.shape[0]
+    number_of_modes = min(number_of_modes, n_dofs)
+
+    # the Lanczos method needs number_of_modes < n_dofs - 1
+    if not is_sparse(k) or number_of_modes >= n_dofs - 1:
+        if is_sparse(k):
+            k = k.toarray()
+            m = m.toarray()
+        return linalg.eigh(k, m, subset_by_index=[0, number_of_modes - 1])
+
+    eig_values, eig_modes = sparse_linalg.eigsh(k.tocsc(), k=number_of_modes, M=m.tocsc(),
+                                                sigma=0.0, which='LM')
+    # eigsh does not guarantee the order
+    sorted_indices = np.argsort(eig_values)
+    return eig_values[sorted_indices], eig_modes[:, sorted_indices]
+
+
+def get_diagonal(matrix):
+    '''
+    Diagonal of a dense or sparse matrix as a vector, vectors are returned as they are
+    '''
+    if is_sparse(matrix):
+        return matrix.diagonal()
+    if matrix.ndim == 1:
+        return matrix
+    return np.diag(matrix).copy()
+
+
+def is_diagonal(matrix):
+    if np.ndim(matrix) == 1:
+        return True
+    off_diagonal = abs(matrix).sum() - np.sum(abs(get_diagonal(matrix)))
+    return off_diagonal <= 1e-12 * np.sum(abs(get_diagonal(matrix)))
+
+
+def get_highest_eigenpair(k, m_diagonal, v0=None):
+    '''
+    Largest eigenvalue and mode of k * phi = lambda * diag(m) * phi
+    only products with k are needed - e.g. for the critical time step of explicit schemes
+
+    v0: optional start vector, e.g. the mode of a previous (slightly changed) system
+    '''
+    scaling = 1.0 / np.sqrt(m_diagonal)
+    n_dofs = len(m_diagonal)
+    if np.ndim(k) == 1:
+        # system: in vector (from diagonal matrix) form
+        idx = np.argmax(k / m_diagonal)
+        mode = np.zeros(n_dofs)
+        mode[idx] = scaling[idx]
+        return k[idx] / m_diagonal[idx], mode
+
+    # symmetric standard problem for diag(m)^-1/2 * k * diag(m)^-1/2
+    if n_dofs < 3:
+        if is_sparse(k):
+            k = k.toarray()
+        eig_values, eig_modes = linalg.eigh(scaling[:, None] * k * scaling[None, :])
+        return eig_values[-1], scaling * eig_modes[:, -1]
+
+    operator = sparse_linalg.LinearOperator((n_dofs, n_dofs), dtype=float,
+                                            matvec=lambda x: scaling * k.dot(scaling * np.ravel(x)))
+    if v0 is not None:
+        v0 = v0 / scaling
+    eig_values, eig_modes = sparse_linalg.eigsh(operator, k=1, which='LA', v0=v0)
+    return eig_values[0], scaling * eig_modes[:, 0]
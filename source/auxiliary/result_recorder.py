@@ -0,0 +1,109 @@
+import numpy as np
+
+from source.auxiliary.result_store import ResultStore
+
+RECORDED_QUANTITIES = ['displacement', 'velocity', 'acceleration']
+
+
+class ResultRecorder(object):
+    '''
+    Recording of selected results during the time loop instead of full histories
+
+    The solver hands over the state in its own (reduced or modal) coordinates,
+    the recorded rows follow from output operators of shape (n_selected, n_state):
+        history = operator * quantity
+        reaction = force_rows - op_m * acceleration - op_b * velocity - op_k * displacement
+    the memory follows from the number of selected dofs, not from the model size
+
+    Optionally snapshots of the full displacement are kept for some steps,
+    the snapshot operator extends the state to all dofs
+    '''
+
+    def __init__(self, n_steps, dofs, operators,
+                 reaction_force=None, reaction_operators=None,
+                 snapshot_operator=None, snapshot_steps=(),
+                 result_store=None, n_cases=None):
+        self.n_steps = n_steps
+        # the histories of several load cases have the shape (n_rows, n_cases, n_steps)
+        self.n_cases = n_cases
+        self.result_store = ResultStore() if result_store is None else result_store
+
+        # global dofs per recorded result type and the corresponding rows
+        self.dofs = {}
+        self.rows = {}
+        self.operators = {}
+        self.histories = {}
+        for label in RECORDED_QUANTITIES:
+            if label in dofs and len(dofs[label]) > 0:
+                self._add_history(label, dofs[label])
+                self.operators[label] = operators[label]
+
+        if 'reaction' in dofs and len(dofs['reaction']) > 0:
+            if reaction_force is None or reaction_operators is None:
+                err_msg = "The recording of the reaction requires the force rows\n"
+                err_msg += "and the mass, damping and stiffness operators"
+                raise Exception(err_msg)
+            self._add_history('reaction', dofs['reaction'])
+            self.reaction_force = reaction_force
+            self.reaction_operators = reaction_operators
+
+        self.snapshot_operator = snapshot_operator
+        self.snapshot_steps = sorted(set(snapshot_steps)) if snapshot_operator is not None else []
+        self.snapshot_columns = {step: idx for idx, step in enumerate(self.snapshot_steps)}
+        self.snapshots = None
+        if len(self.snapshot_steps) > 0:
+            self.snapshots = self.result_store.allocate(
+                'displacement_snapshots', snapshot_operator.shape[0], len(self.snapshot_steps), n_cases)
+
+    def _add_history(self, label, dofs):
+        self.dofs[label] = list(dofs)
+        self.rows[label] = {dof: row for row, dof in enumerate(dofs)}
+        self.histories[label] = self.result_store.allocate(label, len(dofs), self.n_steps, self.n_cases)
+
+    def record(self, steps, displacement, velocity, acceleration):
+        '''
+        steps is either a single step with state vectors
+        or a slice of steps with the states as columns
+        '''
+        quantities = {'displacement': displacement,
+                      'velocity': velocity,
+                      'acceleration': acceleration}
+
+        for label, operator in self.operators.items():
+            self.histories[label][..., steps] = operator.dot(quantities[label])
+
+        if 'reaction' in self.histories:
+            op_m, op_b, op_k = self.reaction_operators
+            self.histories['reaction'][..., steps] = self.reaction_force[..., steps] - \
+                op_m.dot(acceleration) - op_b.dot(velocity) - op_k.dot(displacement)
+
+        if self.snapshots is not None:
+            if isinstance(steps, slice):
+                for step in range(*steps.indices(self.n_steps)):
+                    if step in self.snapshot_columns:
+                        self.snapshots[:, self.snapshot_columns[step]] = \
+                            self.snapshot_operator.dot(displacement[:, step - steps.start])
+            elif steps in self.snapshot_columns:
+                self.snapshots[..., self.snapshot_columns[steps]] = self.snapshot_operator.dot(displacement)
+
+    def get_history(self, label, dof):
+        if label not in self.rows or dof not in self.rows[label]:
+            err_msg = "The result \"" + label + "\" for DoF " + str(dof)
+            err_msg += " has not been recorded\n"
+            err_msg += "Recorded DoFs: " + \
+                ", ".join([str(val) for val in self.dofs.get(label, [])])
+            raise Exception(err_msg)
+        return self.histories[label][self.rows[label][dof]]
+
+    def get_snapshot(self, step):
+        if step not in self.snapshot_columns:
+            err_msg = "No displacement snapshot has been recorded for step " + str(step) + "\n"
+            err_msg += "Recorded steps: " + \
+                ", ".join([str(val) for val in self.snapshot_steps])
+            raise Exception(err_msg)
+        return self.snapshots[..., self.snapshot_columns[step]]
+
+    def flush(self):
+        self.result_store.flush(*self.histories.values())
+        if self.snapshots is not None:
+            self.result_store.flush(self.snapshots)
@@ -0,0 +1,97 @@
+from os.path import join, isdir
+from os import makedirs
+
+import numpy as np
+
+# number of time steps processed together in the postprocessing of out-of-core results
+DEFAULT_CHUNK_SIZE = 10000
+
+
+class ResultStore(object):
+    '''
+    Storage of result histories with shape (n_rows, n_steps)
+    or (n_rows, n_cases, n_steps) for several load cases
+
+    Without a folder the histories are arrays in memory, otherwise
+    memory-mapped .npy files in the folder. These are stored time-major
+    (the transposed history) so that a time step and a chunk of steps are
+    contiguous on disk, the returned arrays are (n_rows, n_steps) views
+    which are read lazily
+    '''
+
+    def __init__(self, folder=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        if chunk_size < 1:
+            err_msg = "The chunk size has to be >= 1, provided: " + str(chunk_size)
+            raise Exception(err_msg)
+        self.folder = folder
+        self.chunk_size = chunk_size
+        self.files = {}
+
+        if self.is_out_of_core() and not isdir(self.folder):
+            makedirs(self.folder)
+
+    def is_out_of_core(self):
+        return self.folder is not None
+
+    def allocate(self, name, n_rows, n_steps, n_cases=None):
+        '''
+        zero initialized history with shape (n_rows, n_steps)
+        or (n_rows, n_cases, n_steps)
+        '''
+        shape = (n_rows, n_steps) if n_cases is None else (n_rows, n_cases, n_steps)
+        if not self.is_out_of_core():
+            return np.zeros(shape)
+
+        file_path = join(self.folder, name + '.npy')
+        self.files[name] = file_path
+        # open_memmap creates a zero filled file
+        history = np.lib.format.open_memmap(file_path, mode='w+', dtype=float,
+                                            shape=shape[::-1])
+        return history.T
+
+    def get_chunks(self, n_steps):
+        '''
+        slices over the time steps, a single one for results in memory
+        '''
+        chunk_size = self.chunk_size if self.is_out_of_core() else max(n_steps, 1)
+        return [slice(start, min(start + chunk_size, n_steps))
+                for start in range(0, n_steps, chunk_size)]
+
+    def flush(self, *histories):
+        # write the pages of memory-mapped histories to disk
+        for history in histories:
+            if isinstance(history, np.memmap):
+                history.flush()
+
+
+class ReducedLoadHistory(object):
+    '''
+    Lazy BC reduced view of a load history with shape (n_dofs, n_steps)
+    or (n_dofs, n_cases, n_steps), e.g. a memory-mapped .npy
+
+    Indexing reads the selected steps only, reduces them by the dofs to keep
+    and optionally projects them onto the modes (columns in the reduced dofs)
+    NOTE: the full history is never materialized
+    '''
+
+    def __init__(self, force, dofs_to_keep, modes=None):
+        self.force = force
+        self.dofs_to_keep = np.asarray(dofs_to_keep)
+        self.modes = modes
+        n_rows = len(self.dofs_to_keep) if modes is None else modes.shape[1]
+        self.shape = (n_rows,) + force.shape[1:]
+        self.ndim = force.ndim
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if key[0] is Ellipsis:
+            key = (slice(None),) * (self.ndim - len(key) + 1) + key[1:]
+        # the rows are selected after the reduction and the projection
+        chunk = self.force[(self.dofs_to_keep,) + key[1:]]
+        if self.modes is not None:
+            chunk = np.tensordot(np.transpose(self.modes), chunk, axes=1)
+        return chunk[key[0]]
@@ -1,5 +1,9 @@
 import numpy as np
 
+from source.auxiliary.logger import get_logger
+
+logger = get_logger(__name__)
+
 
 class BeamElement(object):
     def __init__(self, material_params, element_params, nodal_coords, index, domain_size):
@@ -58,7 +62,7 @@ class BeamElement(object):
             msg = "Linear "
         msg += str(self.domain_size) + " Base Class Element " + \
             str(self.index) + "\n"
-        print(msg)
+        logger.debug(msg)
 
     def evaluate_torsional_inertia(self):
         # polar moment of inertia
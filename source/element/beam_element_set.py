@@ -0,0 +1,212 @@
+"""
+Vectorized counterparts of the linear TimoshenkoBeamElement and BernoulliBeamElement
+matrices: all elements are evaluated in one numpy pass and returned
+as a stack of element matrices with shape (n_el, el_size, el_size)
+
+The expressions follow the element-wise implementation in timoshenko_beam_element.py,
+the Bernoulli element is the special case without shear deformation (Py = Pz = 0)
+"""
+
+import numpy as np
+
+# element types which can be evaluated as a set
+AVAILABLE_ELEMENT_TYPES = ['Timoshenko', 'Bernoulli']
+
+# local dof ids of the 2 noded element
+# 3D: [x, y, z, a(rot x), b(rot y), g(rot z)] per node
+# 2D: [x, y, g(rot z)] per node
+ELEMENT_SIZE = {'2D': 6, '3D': 12}
+DOF_IDS = {
+    '3D': {'x': [0, 6],
+           'a': [3, 9],
+           'yg': [1, 5, 7, 11],
+           'zb': [2, 4, 8, 10]},
+    '2D': {'x': [0, 3],
+           'yg': [1, 2, 4, 5]}}
+
+
+def _symmetric_2x2(factor, c_11, c_12):
+    c_11, c_12 = np.broadcast_arrays(c_11, c_12)
+    block = np.array([[c_11, c_12],
+                      [c_12, c_11]], dtype=float)
+    # from (2, 2, n_el) to (n_el, 2, 2)
+    return factor[:, None, None] * np.moveaxis(block, -1, 0)
+
+
+def _symmetric_4x4(factor, c_11, c_12, c_13, c_14, c_22, c_23, c_24, c_33, c_34, c_44):
+    c = np.broadcast_arrays(c_11, c_12, c_13, c_14, c_22, c_23, c_24, c_33, c_34, c_44)
+    c_11, c_12, c_13, c_14, c_22, c_23, c_24, c_33, c_34, c_44 = c
+    block = np.array([[c_11, c_12, c_13, c_14],
+                      [c_12, c_22, c_23, c_24],
+                      [c_13, c_23, c_33, c_34],
+                      [c_14, c_24, c_34, c_44]], dtype=float)
+    # from (4, 4, n_el) to (n_el, 4, 4)
+    return factor[:, None, None] * np.moveaxis(block, -1, 0)
+
+
+def _assemble_components(components, domain_size, out=None):
+    n_el = next(iter(components.values())).shape[0]
+    if out is None:
+        el_matrices = np.zeros((n_el, ELEMENT_SIZE[domain_size], ELEMENT_SIZE[domain_size]))
+    else:
+        el_matrices = out
+        el_matrices[...] = 0.0
+    for label, block in components.items():
+        dof_ids = np.asarray(DOF_IDS[domain_size][label])
+        el_matrices[:, dof_ids[:, None], dof_ids[None, :]] += block
+    return el_matrices
+
+
+def evaluate_relative_importance_of_shear(E, nu, Asy, Asz, Iy, Iz, L, shear_deformation=True):
+    '''
+    Vectorized BeamElement.evaluate_relative_importance_of_shear
+    returns G, Py, Pz
+    '''
+    G = E / 2 / (1 + nu)
+    Py = np.zeros_like(L)
+    Pz = np.zeros_like(L)
+
+    if shear_deformation:
+        # relative importance of the shear deformation to the bending one
+        has_asy = Asy != 0.0
+        has_asz = Asz != 0.0
+        Py[has_asy] = (12 * E * Iz / (G * np.where(has_asy, Asy, 1.0) * L ** 2))[has_asy]
+        Pz[has_asz] = (12 * E * Iy / (G * np.where(has_asz, Asz, 1.0) * L ** 2))[has_asz]
+
+    return G, Py, Pz
+
+
+def _as_arrays(n_el, *values):
+    return [np.broadcast_to(np.asarray(val, dtype=float), (n_el,)) for val in values]
+
+
+def get_element_mass_matrices(rho, A, Asy, Asz, Iy, Iz, It, L, E, nu, domain_size='3D',
+                              shear_deformation=True, Ip=None, out=None):
+    '''
+    Consistent mass matrices of all elements - see TimoshenkoBeamElement.get_element_mass_matrix
+
+    Ip is the polar moment of inertia, by default Iy + Iz
+    out: optional buffer with shape (n_el, el_size, el_size) for the result
+    '''
+    n_el = np.size(L)
+    rho, A, Asy, Asz, Iy, Iz, It, L, E, nu = _as_arrays(
+        n_el, rho, A, Asy, Asz, Iy, Iz, It, L, E, nu)
+    Ip = Iy + Iz if Ip is None else _as_arrays(n_el, Ip)[0]
+    G, Py, Pz = evaluate_relative_importance_of_shear(
+        E, nu, Asy, Asz, Iy, Iz, L, shear_deformation)
+
+    m_const = rho * A * L
+
+    components = {}
+
+    # axial inertia - along axis x - here marked as x
+    components['x'] = _symmetric_2x2(m_const / 6.0, 2., 1.)
+
+    if domain_size == '3D':
+        # torsion inertia - around axis x - here marked as alpha - a
+        components['a'] = _symmetric_2x2(m_const * Ip / A / 6.0, 2., 1.)
+
+    # bending - inertia along axis y, rotations around axis z - here marked as gamma - g
+    m_yg_12 = (35 * Py ** 2 + 77 * Py + 44) * L / 4
+    m_yg_14 = -(35 * Py ** 2 + 63 * Py + 26) * L / 4
+    m_yg_22 = (7 * Py ** 2 + 14 * Py + 8) * L ** 2 / 4
+    m_el_yg_trans = _symmetric_4x4(m_const / 210 / (1 + Py) ** 2,
+                                   70 * Py ** 2 + 147 * Py + 78, m_yg_12,
+                                   35 * Py ** 2 + 63 * Py + 27, m_yg_14,
+                                   m_yg_22, -m_yg_14, -(7 * Py ** 2 + 14 * Py + 6) * L ** 2 / 4,
+                                   70 * Py ** 2 + 147 * Py + 78, -m_yg_12,
+                                   m_yg_22)
+    m_yg_12 = -(15 * Py - 3) * L
+    m_yg_22 = (10 * Py ** 2 + 5 * Py + 4) * L ** 2
+    m_el_yg_rot = _symmetric_4x4(rho * Iz / 30 / (1 + Py) ** 2 / L,
+                                 36., m_yg_12, -36., m_yg_12,
+                                 m_yg_22, -m_yg_12, (5 * Py ** 2 - 5 * Py - 1) * L ** 2,
+                                 36., -m_yg_12,
+                                 m_yg_22)
+    components['yg'] = m_el_yg_trans + m_el_yg_rot
+
+    if domain_size == '3D':
+        # bending - inertia along axis z, rotations around axis y - here marked as beta - b
+        m_zb_12 = -(35 * Pz ** 2 + 77 * Pz + 44) * L / 4.
+        m_zb_14 = (35 * Pz ** 2 + 63 * Pz + 26) * L / 4.
+        m_zb_22 = (7 * Pz ** 2 + 14 * Pz + 8) * L ** 2 / 4.
+        m_el_zb_trans = _symmetric_4x4(m_const / 210 / (1 + Pz) ** 2,
+                                       70 * Pz ** 2 + 147 * Pz + 78, m_zb_12,
+                                       35 * Pz ** 2 + 63 * Pz + 27, m_zb_14,
+                                       m_zb_22, -m_zb_14, -(7 * Pz ** 2 + 14 * Pz + 6) * L ** 2 / 4.,
+                                       70 * Pz ** 2 + 147 * Pz + 78, -m_zb_12,
+                                       m_zb_22)
+        m_zb_12 = (15. * Pz - 3) * L
+        m_zb_22 = (10 * Pz ** 2 + 5 * Pz + 4) * L ** 2
+        m_el_zb_rot = _symmetric_4x4(rho * Iy / 30. / (1 + Pz) ** 2 / L,
+                                     36., m_zb_12, -36., m_zb_12,
+                                     m_zb_22, -m_zb_12, (5 * Pz ** 2 - 5 * Pz - 1) * L ** 2,
+                                     36., -m_zb_12,
+                                     m_zb_22)
+        components['zb'] = m_el_zb_trans + m_el_zb_rot
+
+    return _assemble_components(components, domain_size, out)
+
+
+def get_element_stiffness_matrices(rho, A, Asy, Asz, Iy, Iz, It, L, E, nu, domain_size='3D',
+                                   shear_deformation=True, Ip=None, out=None):
+    '''
+    Material stiffness matrices of all elements
+    see TimoshenkoBeamElement._get_element_stiffness_matrix_material
+
+    rho and Ip are not needed, kept for the same signature as the mass matrices
+    out: optional buffer with shape (n_el, el_size, el_size) for the result
+    '''
+    n_el = np.size(L)
+    rho, A, Asy, Asz, Iy, Iz, It, L, E, nu = _as_arrays(
+        n_el, rho, A, Asy, Asz, Iy, Iz, It, L, E, nu)
+    G, Py, Pz = evaluate_relative_importance_of_shear(
+        E, nu, Asy, Asz, Iy, Iz, L, shear_deformation)
+
+    components = {}
+
+    # axial stiffness - along axis x - here marked as x
+    components['x'] = _symmetric_2x2(E * A / L, 1.0, -1.0)
+
+    if domain_size == '3D':
+        # torsion stiffness - around axis x - here marked as alpha - a
+        components['a'] = _symmetric_2x2(G * It / L, 1.0, -1.0)
+
+    # bending - displacement along axis y, rotations around axis z - here marked as gamma - g
+    components['yg'] = _symmetric_4x4(E * Iz / (1 + Py) / L ** 3,
+                                      12., 6. * L, -12., 6. * L,
+                                      (4. + Py) * L ** 2, -6. * L, (2 - Py) * L ** 2,
+                                      12., -6. * L,
+                                      (4. + Py) * L ** 2)
+
+    if domain_size == '3D':
+        # bending - displacement along axis z, rotations around axis y - here marked as beta - b
+        components['zb'] = _symmetric_4x4(E * Iy / (1 + Pz) / L ** 3,
+                                          12., -6. * L, -12., -6. * L,
+                                          (4. + Pz) * L ** 2, 6. * L, (2 - Pz) * L ** 2,
+                                          12., 6. * L,
+                                          (4. + Pz) * L ** 2)
+
+    return _assemble_components(components, domain_size, out)
+
+
+def get_lumped_mass_matrices(el_matrices, domain_size='3D'):
+    '''
+    Diagonal (lumped) mass matrices from the consistent ones by the HRZ scaling
+    (Hinton, Rock and Zienkiewicz): per component the diagonal is scaled such that
+    the translational (torsional) entries sum up to the mass (polar inertia) of the element,
+    the rotations of bending use the factor of the corresponding translation
+
+    The translational entries are the equivalent nodal masses 0.5 * rho * A * L
+    '''
+    el_matrices = np.asarray(el_matrices, dtype=float)
+    lumped = np.zeros_like(el_matrices)
+    for dof_ids in DOF_IDS[domain_size].values():
+        dof_ids = np.asarray(dof_ids)
+        # bending: displacements at the positions 0 and 2, rotations at 1 and 3
+        main_ids = dof_ids if len(dof_ids) == 2 else dof_ids[[0, 2]]
+        # sum of all entries of the block = mass for a rigid body translation
+        total = np.sum(el_matrices[:, main_ids[:, None], main_ids[None, :]], axis=(1, 2))
+        factor = total / np.sum(el_matrices[:, main_ids, main_ids], axis=1)
+        lumped[:, dof_ids, dof_ids] = factor[:, None] * el_matrices[:, dof_ids, dof_ids]
+    return lumped
@@ -1,6 +1,7 @@
 import numpy as np
 
 from source.element.timoshenko_beam_element import TimoshenkoBeamElement
+from source.element.beam_element import logger
 
 
 class BernoulliBeamElement(TimoshenkoBeamElement):
@@ -26,7 +27,7 @@ class BernoulliBeamElement(TimoshenkoBeamElement):
         msg += "Iz: " + str(self.Iz) + "\n"
         msg += "Pz: " + str(self.Pz) + "\n"
         msg += "Py: " + str(self.Py) + "\n"
-        print(msg)
+        logger.debug(msg)
 
     def evaluate_relative_importance_of_shear(self):
         self.G = self.E / 2 / (1 + self.nu)
@@ -2,10 +2,94 @@ import numpy as np
 from pyquaternion import Quaternion
 import sys
 
-from source.element.beam_element import BeamElement
+from source.element.beam_element import BeamElement, logger
 
 EPSILON = sys.float_info.epsilon
 
+# quantities from the local nodal forces and the current length l,
+# the geometric stiffness is linear in these
+GEOMETRIC_STIFFNESS_QUANTITIES = ['N/l', 'N', 'N*l', 'Mt/l', 'Mt',
+                                  'my_A/l', 'my_B/l', 'mz_A/l', 'mz_B/l',
+                                  'my_A', 'my_B', 'mz_A', 'mz_B',
+                                  'Qy/l', 'Qz/l', 'Qy*l', 'Qz*l']
+
+# upper triangle of the geometric stiffness: (row, column, [(quantity, factor)])
+GEOMETRIC_STIFFNESS_ENTRIES = [
+    (0, 1, [('Qy/l', -1.0)]), (0, 2, [('Qz/l', -1.0)]), (0, 7, [('Qy/l', 1.0)]), (0, 8, [('Qz/l', 1.0)]),
+    (1, 1, [('N/l', 1.2)]), (1, 3, [('my_A/l', 1.0)]), (1, 4, [('Mt/l', 1.0)]), (1, 5, [('N', 0.1)]),
+    (1, 6, [('Qy/l', 1.0)]), (1, 7, [('N/l', -1.2)]), (1, 9, [('my_B/l', 1.0)]), (1, 10, [('Mt/l', -1.0)]),
+    (1, 11, [('N', 0.1)]),
+    (2, 2, [('N/l', 1.2)]), (2, 3, [('mz_A/l', 1.0)]), (2, 4, [('N', -0.1)]), (2, 5, [('Mt/l', 1.0)]),
+    (2, 6, [('Qz/l', 1.0)]), (2, 8, [('N/l', -1.2)]), (2, 9, [('mz_B/l', 1.0)]), (2, 10, [('N', -0.1)]),
+    (2, 11, [('Mt/l', -1.0)]),
+    (3, 4, [('mz_A', -1.0 / 3.0), ('mz_B', 1.0 / 6.0)]), (3, 5, [('my_A', 1.0 / 3.0), ('my_B', -1.0 / 6.0)]),
+    (3, 7, [('my_A/l', -1.0)]), (3, 8, [('mz_A/l', -1.0)]), (3, 10, [('Qy*l', 1.0 / 6.0)]),
+    (3, 11, [('Qz*l', 1.0 / 6.0)]),
+    (4, 4, [('N*l', 2.0 / 15.0)]), (4, 7, [('Mt/l', -1.0)]), (4, 8, [('N', 0.1)]), (4, 9, [('Qy*l', 1.0 / 6.0)]),
+    (4, 10, [('N*l', -1.0 / 30.0)]), (4, 11, [('Mt', 0.5)]),
+    (5, 5, [('N*l', 2.0 / 15.0)]), (5, 7, [('N', -0.1)]), (5, 8, [('Mt/l', -1.0)]), (5, 9, [('Qz*l', 1.0 / 6.0)]),
+    (5, 10, [('Mt', -0.5)]), (5, 11, [('N*l', -1.0 / 30.0)]),
+    (6, 7, [('Qy/l', -1.0)]), (6, 8, [('Qz/l', -1.0)]),
+    (7, 7, [('N/l', 1.2)]), (7, 9, [('my_B/l', -1.0)]), (7, 10, [('Mt/l', 1.0)]), (7, 11, [('N', -0.1)]),
+    (8, 8, [('N/l', 1.2)]), (8, 9, [('mz_B/l', -1.0)]), (8, 10, [('N', 0.1)]), (8, 11, [('Mt/l', 1.0)]),
+    (9, 10, [('mz_A', 1.0 / 6.0), ('mz_B', -1.0 / 3.0)]), (9, 11, [('my_A', -1.0 / 6.0), ('my_B', 1.0 / 3.0)]),
+    (10, 10, [('N*l', 2.0 / 15.0)]),
+    (11, 11, [('N*l', 2.0 / 15.0)])]
+
+
+def _build_geometric_stiffness_template():
+    template = np.zeros([len(GEOMETRIC_STIFFNESS_QUANTITIES), 12, 12])
+    for row, col, terms in GEOMETRIC_STIFFNESS_ENTRIES:
+        for quantity, factor in terms:
+            idx = GEOMETRIC_STIFFNESS_QUANTITIES.index(quantity)
+            template[idx, row, col] += factor
+            if row != col:
+                template[idx, col, row] += factor
+    return template
+
+
+# constant template, shape (n_quantities, 12, 12)
+GEOMETRIC_STIFFNESS_TEMPLATE = _build_geometric_stiffness_template()
+
+# entries of the geometric part of the deformation stiffness: Qy1, Qy1, Qz1, Qz1, N1, N1, N2, N2
+DEFORMATION_STIFFNESS_ROWS = np.array([0, 1, 0, 2, 1, 2, 4, 5])
+DEFORMATION_STIFFNESS_COLS = np.array([1, 0, 2, 0, 1, 2, 4, 5])
+
+
+def get_geometric_stiffness_quantities(nodal_force_local, l):
+    '''
+    nodal_force_local with shape (..., 12) and the current length l with shape (...)
+    returns the quantities with shape (..., n_quantities)
+    '''
+    N = nodal_force_local[..., 6]
+    Mt = nodal_force_local[..., 9]
+    my_A = nodal_force_local[..., 4]
+    mz_A = nodal_force_local[..., 5]
+    my_B = nodal_force_local[..., 10]
+    mz_B = nodal_force_local[..., 11]
+    Qy = -1.0 * (mz_A + mz_B) / l
+    Qz = (my_A + my_B) / l
+    return np.stack([N / l, N, N * l, Mt / l, Mt,
+                     my_A / l, my_B / l, mz_A / l, mz_B / l,
+                     my_A, my_B, mz_A, mz_B,
+                     Qy / l, Qz / l, Qy * l, Qz * l], axis=-1)
+
+
+def get_deformation_stiffness_geometry_values(nodal_force_local, l):
+    '''
+    values of the geometric part of the deformation stiffness, Eq.(4.115) Klaus
+    at DEFORMATION_STIFFNESS_ROWS, DEFORMATION_STIFFNESS_COLS with shape (..., 8)
+    '''
+    N = nodal_force_local[..., 6]
+    Qy = -1.0 * (nodal_force_local[..., 5] + nodal_force_local[..., 11]) / l
+    Qz = 1.0 * (nodal_force_local[..., 4] + nodal_force_local[..., 10]) / l
+
+    N1 = l * N / 12.0
+    N2 = l * N / 20.0
+    Qy1 = -l * Qy / 6.0
+    Qz1 = -l * Qz / 6.0
+    return np.stack([Qy1, Qy1, Qz1, Qz1, N1, N1, N2, N2], axis=-1)
+
 
 def apply_transformation(transformation_matrix, M):
     # transformation M = T * M * trans(T)
@@ -64,6 +148,7 @@ class CRBeamElement(BeamElement):
         # Storing constant matrices to avoid computation overload
         self.Ke_mat = self._get_element_stiffness_matrix_material()
         self.Kd_mat = self._calculate_deformation_stiffness_material()
+        self.M_mat = self._get_consistent_mass_matrix()
 
         self._print_element_information()
 
@@ -82,7 +167,7 @@ class CRBeamElement(BeamElement):
         msg += "Asz: " + str(self.Asz) + "\n"
         msg += "Iy: " + str(self.Iy) + "\n"
         msg += "Iz: " + str(self.Iz) + "\n"
-        print(msg)
+        logger.debug(msg)
 
     def update_total(self, new_displacement):
         self._assign_new_deformation(new_displacement)
@@ -159,8 +244,7 @@ class CRBeamElement(BeamElement):
         self.nodal_force_global = np.dot(self.TransformationMatrix, self.nodal_force_local)
 
     def get_element_mass_matrix(self):
-        MassMatrix = self._get_consistent_mass_matrix()
-        TransformedMassMatrix = apply_transformation(self.TransformationMatrix, MassMatrix)
+        TransformedMassMatrix = apply_transformation(self.TransformationMatrix, self.M_mat)
         return TransformedMassMatrix
 
     def _get_consistent_mass_matrix(self):
@@ -227,10 +311,8 @@ class CRBeamElement(BeamElement):
         MassMatrix[8, 10] = temp_bending_mass_matrix[2, 3]
         MassMatrix[10, 10] = temp_bending_mass_matrix[3, 3]
 
-        for j in range(1, self.ElementSize):
-            for i in range(j):
-                MassMatrix[j, i] = MassMatrix[i, j]
-        return MassMatrix
+        # symmetric from the upper triangle
+        return np.triu(MassMatrix) + np.triu(MassMatrix, 1).T
 
     def build_single_mass_matrix(self, Phi, CT, CR, L, dir):
         MatSize = self.NumberOfNodes * 2
@@ -286,10 +368,8 @@ class CRBeamElement(BeamElement):
         return mass_matrix
 
     def get_element_stiffness_matrix(self):
-        # Initializing the with the geometric stiffness
-        Ke = self.Ke_mat
-        # creating LHS
-        Ke += self._get_element_stiffness_matrix_geometry()
+        # the constant material part and the geometric stiffness
+        Ke = self.Ke_mat + self._get_element_stiffness_matrix_geometry()
 
         TransformedStiffnessMatrix = apply_transformation(self.TransformationMatrix, Ke)
         return TransformedStiffnessMatrix
@@ -363,121 +443,10 @@ class CRBeamElement(BeamElement):
     def _get_element_stiffness_matrix_geometry(self):
         """
             geometric part of the total stiffness matrix
+            from the constant template, linear in the local nodal forces
         """
-
-        N = self.nodal_force_local[6]
-        Mt = self.nodal_force_local[9]
-        my_A = self.nodal_force_local[4]
-        mz_A = self.nodal_force_local[5]
-        my_B = self.nodal_force_local[10]
-        mz_B = self.nodal_force_local[11]
-
-        l = self._calculate_current_length()
-        Qy = -1.0 * (mz_A + mz_B) / l
-        Qz = (my_A + my_B) / l
-
-        ke_geo = np.zeros([self.ElementSize, self.ElementSize])
-
-        ke_geo[0, 1] = -Qy / l
-        ke_geo[0, 2] = -Qz / l
-        ke_geo[0, 7] = -1.0 * ke_geo[0, 1]
-        ke_geo[0, 8] = -1.0 * ke_geo[0, 2]
-
-        ke_geo[1, 0] = ke_geo[0, 1]
-
-        ke_geo[1, 1] = 1.2 * N / l
-
-        ke_geo[1, 3] = my_A / l
-        ke_geo[1, 4] = Mt / l
-
-        ke_geo[1, 5] = N / 10.0
-
-        ke_geo[1, 6] = ke_geo[0, 7]
-        ke_geo[1, 7] = -1.0 * ke_geo[1, 1]
-        ke_geo[1, 9] = my_B / l
-        ke_geo[1, 10] = -1.0 * ke_geo[1, 4]
-        ke_geo[1, 11] = ke_geo[1, 5]
-
-        ke_geo[2, 0] = ke_geo[0, 2]
-        ke_geo[2, 2] = ke_geo[1, 1]
-        ke_geo[2, 3] = mz_A / l
-        ke_geo[2, 4] = -1.0 * ke_geo[1, 5]
-        ke_geo[2, 5] = ke_geo[1, 4]
-        ke_geo[2, 6] = ke_geo[0, 8]
-        ke_geo[2, 8] = ke_geo[1, 7]
-        ke_geo[2, 9] = mz_B / l
-        ke_geo[2, 10] = ke_geo[2, 4]
-        ke_geo[2, 11] = ke_geo[1, 10]
-
-        for i in range(3):
-            ke_geo[3, i] = ke_geo[i, 3]
-
-        ke_geo[3, 4] = (-mz_A / 3.0) + (mz_B / 6.0)
-        ke_geo[3, 5] = (my_A / 3.0) - (my_B / 6.0)
-        ke_geo[3, 7] = -my_A / l
-        ke_geo[3, 8] = -mz_A / l
-        ke_geo[3, 10] = l * Qy / 6.0
-        ke_geo[3, 11] = l * Qz / 6.0
-
-        for i in range(4):
-            ke_geo[4, i] = ke_geo[i, 4]
-
-        ke_geo[4, 4] = 2.0 * l * N / 15.0
-        ke_geo[4, 7] = -Mt / l
-        ke_geo[4, 8] = N / 10.0
-        ke_geo[4, 9] = ke_geo[3, 10]
-        ke_geo[4, 10] = -l * N / 30.0
-        ke_geo[4, 11] = Mt / 2.0
-
-        for i in range(5):
-            ke_geo[5, i] = ke_geo[i, 5]
-
-        ke_geo[5, 5] = ke_geo[4, 4]
-        ke_geo[5, 7] = -N / 10.0
-        ke_geo[5, 8] = -Mt / l
-        ke_geo[5, 9] = ke_geo[3, 11]
-        ke_geo[5, 10] = -1.0 * ke_geo[4, 11]
-        ke_geo[5, 11] = ke_geo[4, 10]
-
-        for i in range(6):
-            ke_geo[6, i] = ke_geo[i, 6]
-
-        ke_geo[6, 7] = ke_geo[0, 1]
-        ke_geo[6, 8] = ke_geo[0, 2]
-
-        for i in range(7):
-            ke_geo[7, i] = ke_geo[i, 7]
-
-        ke_geo[7, 7] = ke_geo[1, 1]
-        ke_geo[7, 9] = -1.0 * ke_geo[1, 9]
-        ke_geo[7, 10] = ke_geo[4, 1]
-        ke_geo[7, 11] = ke_geo[2, 4]
-
-        for i in range(8):
-            ke_geo[8, i] = ke_geo[i, 8]
-
-        ke_geo[8, 8] = ke_geo[1, 1]
-        ke_geo[8, 9] = -1.0 * ke_geo[2, 9]
-        ke_geo[8, 10] = ke_geo[1, 5]
-        ke_geo[8, 11] = ke_geo[1, 4]
-
-        for i in range(9):
-            ke_geo[9, i] = ke_geo[i, 9]
-
-        ke_geo[9, 10] = (mz_A / 6.0) - (mz_B / 3.0)
-        ke_geo[9, 11] = (-my_A / 6.0) + (my_B / 3.0)
-
-        for i in range(10):
-            ke_geo[10, i] = ke_geo[i, 10]
-
-        ke_geo[10, 10] = ke_geo[4, 4]
-
-        for i in range(11):
-            ke_geo[11, i] = ke_geo[i, 11]
-
-        ke_geo[11, 11] = ke_geo[4, 4]
-
-        return ke_geo
+        quantities = get_geometric_stiffness_quantities(self.nodal_force_local, self._calculate_current_length())
+        return np.tensordot(quantities, GEOMETRIC_STIFFNESS_TEMPLATE, axes=1)
 
     def _calculate_deformation_stiffness_material(self):
         """
@@ -505,30 +474,11 @@ class CRBeamElement(BeamElement):
         This function calculates the element stiffness w.r.t. deformation modes
         :return: Kd
         """
-        Kd = self.Kd_mat
-
         # Eq.(4.115) Klaus, geometric contribution of the deformation stiffness matrix
-        l = self._calculate_current_length()
-        N = self.nodal_force_local[6]
-        Qy = -1.0 * (self.nodal_force_local[5] + self.nodal_force_local[11]) / l
-        Qz = 1.0 * (self.nodal_force_local[4] + self.nodal_force_local[10]) / l
-
-        N1 = l * N / 12.0
-        N2 = l * N / 20.0
-        Qy1 = -l * Qy / 6.0
-        Qz1 = -l * Qz / 6.0
-
-        Kd_geo = np.array([
-            [0., Qy1, Qz1, 0., 0., 0.],
-            [Qy1, N1, 0., 0., 0., 0.],
-            [Qz1, 0., N1, 0., 0., 0.],
-            [0., 0., 0., 0., 0., 0.],
-            [0., 0., 0., 0., N2, 0.],
-            [0., 0., 0.,  0., 0., N2]
-        ])
-
-        Kd += Kd_geo
-
+        # not accumulating in the constant material part
+        Kd = np.array(self.Kd_mat)
+        Kd[DEFORMATION_STIFFNESS_ROWS, DEFORMATION_STIFFNESS_COLS] += get_deformation_stiffness_geometry_values(
+            self.nodal_force_local, self._calculate_current_length())
         return Kd
 
     def _calculate_psi(self, I, A_eff):
@@ -716,17 +666,9 @@ class CRBeamElement(BeamElement):
         self.TransformationMatrix = self._assemble_small_in_big_matrix(self.LocalRotationMatrix)
 
     def _assemble_small_in_big_matrix(self, small_matrix):
-        numerical_limit = EPSILON
-        big_matrix = np.zeros([self.ElementSize, self.ElementSize])
-
-        for k in range(0, self.ElementSize, self.Dimension):
-            for i in range(self.Dimension):
-                for j in range(self.Dimension):
-                    if abs(small_matrix[i, j]) <= numerical_limit:
-                        big_matrix[i + k, j + k] = 0.0
-                    else:
-                        big_matrix[i + k, j + k] = small_matrix[i, j]
-        return big_matrix
+        # the small matrix on the diagonal blocks, the numerical noise removed
+        small_matrix = np.where(np.abs(small_matrix) <= EPSILON, 0.0, small_matrix)
+        return np.kron(np.identity(self.ElementSize // self.Dimension), small_matrix)
 
     def _calculate_initial_local_cs(self):
         direction_vector_x = np.zeros(self.Dimension)
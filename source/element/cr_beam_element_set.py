@@ -0,0 +1,316 @@
+"""
+Vectorized counterpart of the nonlinear CRBeamElement state update:
+the states of all elements are held in contiguous arrays with shape (n_el, ...)
+and the rotations, deformation modes and nodal forces are updated in one numpy pass
+
+The expressions follow the element-wise implementation in cr_beam_element.py
+"""
+
+import copy
+
+import numpy as np
+
+from source.element.cr_beam_element import EPSILON, GEOMETRIC_STIFFNESS_TEMPLATE, \
+    DEFORMATION_STIFFNESS_ROWS, DEFORMATION_STIFFNESS_COLS, \
+    get_geometric_stiffness_quantities, get_deformation_stiffness_geometry_values
+
+# state of the element update, shared with the element objects
+STATE_ATTRIBUTES = ['current_deformation', 'previous_deformation', 'IncrementalDeformation',
+                    'rA_sca', 'rA_vec', 'rB_sca', 'rB_vec',
+                    'VectorDifferences', 'Bisector', 'LocalRotationMatrix', 'TransformationMatrix',
+                    'phi_s', 'phi_a', 'v', 'nodal_force_local', 'nodal_force_global']
+
+
+def _dot_rows(a, b):
+    return np.einsum('ni,ni->n', a, b)
+
+
+def _matvec(matrices, vectors):
+    return np.einsum('nij,nj->ni', matrices, vectors)
+
+
+def _rotate(quaternion_scalar, quaternion_vector, vectors):
+    '''
+    rotate the vectors (n_el, 3) with the unit quaternions - as Quaternion.rotate
+    '''
+    norm = np.sqrt(quaternion_scalar ** 2 + _dot_rows(quaternion_vector, quaternion_vector))
+    w = (quaternion_scalar / norm)[:, None]
+    r = quaternion_vector / norm[:, None]
+    r_cross_v = np.cross(r, vectors)
+    return vectors + 2.0 * w * r_cross_v + 2.0 * np.cross(r, r_cross_v)
+
+
+class CRBeamElementSet(object):
+    '''
+    State of all nonlinear CRBeamElements of a model as arrays
+
+    The element objects keep their role for the element matrices,
+    their state attributes are bound once to the rows of the arrays,
+    which are updated in place
+    NOTE: the states are only consistent if the elements are updated through the set
+    '''
+
+    def __init__(self, elements):
+        self.elements = elements
+        self.n_el = len(elements)
+
+        # constant properties
+        self.ReferenceCoords = np.array([e.ReferenceCoords for e in elements])
+        self.L = np.array([e.L for e in elements])
+        self.LocalReferenceRotationMatrix = np.array([e.LocalReferenceRotationMatrix for e in elements])
+        self.Kd_mat = np.array([e.Kd_mat for e in elements])
+        self.Ke_mat = np.array([e.Ke_mat for e in elements])
+        self.M_mat = np.array([e.M_mat for e in elements])
+        # buffers of the stiffness evaluation into a given output
+        self._stiffness_buffers = None
+
+        # state - copied from the elements
+        for label in STATE_ATTRIBUTES:
+            setattr(self, label, np.array([getattr(e, label) for e in elements], dtype=float))
+
+        # buffers of the update
+        self._deformation_stiffness = np.zeros(self.Kd_mat.shape)
+        self._element_forces = np.zeros((self.n_el, 6))
+        # S with the constant entries, the length dependent ones are set in each update
+        self._transformation_s = np.zeros((self.n_el, 12, 6))
+        self._transformation_s[:, [3, 4, 5, 0], [0, 1, 2, 3]] = -1.0
+        self._transformation_s[:, [9, 10, 11, 6, 4, 5, 10, 11], [0, 1, 2, 3, 4, 5, 4, 5]] = 1.0
+
+        self._bind_elements()
+
+    def __deepcopy__(self, memo):
+        # the copied elements are bound to the copied arrays
+        element_set = CRBeamElementSet.__new__(CRBeamElementSet)
+        memo[id(self)] = element_set
+        for label, value in self.__dict__.items():
+            setattr(element_set, label, copy.deepcopy(value, memo))
+        element_set._bind_elements()
+        return element_set
+
+    def _bind_elements(self):
+        for idx, e in enumerate(self.elements):
+            for label in STATE_ATTRIBUTES:
+                # [idx, ...] is a view also for the scalar states
+                setattr(e, label, getattr(self, label)[idx, ...])
+
+    def _assign_new_deformation(self, new_deformation):
+        self.previous_deformation[...] = self.current_deformation
+        self.current_deformation[...] = new_deformation
+
+    def _calculate_current_length(self):
+        delta = self.ReferenceCoords[:, 3:6] - self.ReferenceCoords[:, 0:3] + \
+            self.current_deformation[:, 6:9] - self.current_deformation[:, 0:3]
+        return np.sqrt(_dot_rows(delta, delta))
+
+    def update_total(self, new_displacement):
+        '''
+        new_displacement: total displacements of the element dofs with shape (n_el, 12)
+        '''
+        self._assign_new_deformation(new_displacement)
+        self._update_rotation_matrix_local()
+        self._calculate_local_nodal_forces()
+        self._update_transformation_matrix()
+
+    def update_incremental(self, dp):
+        '''
+        dp: increments of the element dofs with shape (n_el, 12)
+        '''
+        self.IncrementalDeformation[...] = dp
+        dp = self.IncrementalDeformation
+        self.previous_deformation[...] = self.current_deformation
+        self.current_deformation += dp
+
+        self._update_rotation_matrix_local()
+
+        # Element extension:
+        delta_u = dp[:, 6:9] - dp[:, 0:3]
+        l = self._calculate_current_length()
+
+        # Symmetric and anti-symmetric rotation increments:
+        nx = self.LocalRotationMatrix[:, :, 0]
+        ny = self.LocalRotationMatrix[:, :, 1]
+        nz = self.LocalRotationMatrix[:, :, 2]
+        rotation_transposed = np.transpose(self.LocalRotationMatrix, (0, 2, 1))
+
+        d_phi_A = dp[:, 3:6]
+        d_phi_B = dp[:, 9:12]
+
+        # updating incremental phi_s Eq. (5.125) Krenk
+        d_phi_s = _matvec(rotation_transposed, d_phi_B - d_phi_A)
+
+        # updating incremental phi_a Eq. (5.126) Krenk
+        tmp = (d_phi_B + d_phi_A) - 2 * np.cross(nx, delta_u) / l[:, None]
+        d_phi_a = _matvec(rotation_transposed, tmp)
+
+        self.phi_s += d_phi_s
+        self.phi_a += d_phi_a
+
+        # Rotate element basis around axis:
+        cos_a = np.cos(d_phi_a[:, 0])[:, None]
+        sin_a = np.sin(d_phi_a[:, 0])[:, None]
+        rotated_coordinate_system = np.stack([nx,
+                                              cos_a * ny + sin_a * nz,
+                                              -sin_a * ny + cos_a * nz], axis=1)
+        self._rotate_basis_to_element_axis(rotated_coordinate_system)
+
+        # updating the nodal element forces
+        self._calculate_nodal_forces_from_modes(l)
+        self._update_transformation_matrix()
+
+    def get_nodal_force_global(self):
+        return self.nodal_force_global
+
+    def get_element_stiffness_matrices(self, element_ids=None, out=None):
+        '''
+        tangent stiffness matrices in global coordinates with shape (n_el, 12, 12):
+        the cached material part, the geometric part from the template
+        and a single transformation product
+        out: optional buffer for the matrices of all elements, e.g. of the tangent assembly
+        '''
+        if element_ids is not None or out is None:
+            ids = slice(None) if element_ids is None else element_ids
+            quantities = get_geometric_stiffness_quantities(self.nodal_force_local[ids],
+                                                            self._calculate_current_length()[ids])
+            Ke = self.Ke_mat[ids] + np.tensordot(quantities, GEOMETRIC_STIFFNESS_TEMPLATE, axes=1)
+            return self._apply_transformation(self.TransformationMatrix[ids], Ke)
+
+        # in the preallocated buffers
+        if self._stiffness_buffers is None:
+            self._stiffness_buffers = (np.zeros(self.Ke_mat.shape), np.zeros(self.Ke_mat.shape))
+        Ke, aux = self._stiffness_buffers
+        quantities = get_geometric_stiffness_quantities(self.nodal_force_local, self._calculate_current_length())
+        np.einsum('nq,qij->nij', quantities, GEOMETRIC_STIFFNESS_TEMPLATE, out=Ke)
+        Ke += self.Ke_mat
+        np.matmul(self.TransformationMatrix, Ke, out=aux)
+        return np.matmul(aux, np.transpose(self.TransformationMatrix, (0, 2, 1)), out=out)
+
+    def get_element_mass_matrices(self, element_ids=None):
+        ids = slice(None) if element_ids is None else element_ids
+        return self._apply_transformation(self.TransformationMatrix[ids], self.M_mat[ids])
+
+    def _apply_transformation(self, transformation_matrices, matrices):
+        # transformation T * M * trans(T) per element
+        return np.matmul(np.matmul(transformation_matrices, matrices),
+                         np.transpose(transformation_matrices, (0, 2, 1)))
+
+    def _update_rotation_matrix_local(self):
+        '''
+        quaternion update of the nodal rotations and the mean rotation of the element basis
+        see CRBeamElement._update_rotation_matrix_local
+        '''
+        increment_deformation = self.current_deformation - self.previous_deformation
+
+        # Eq.(4.70) Klaus
+        drA_vec = 0.5 * increment_deformation[:, 3:6]
+        drB_vec = 0.5 * increment_deformation[:, 9:12]
+        drA_sca = np.sqrt(1.0 - _dot_rows(drA_vec, drA_vec))
+        drB_sca = np.sqrt(1.0 - _dot_rows(drB_vec, drB_vec))
+
+        # Node A
+        rA_sca, rA_vec = self.rA_sca, self.rA_vec
+        new_rA_sca = drA_sca * rA_sca - _dot_rows(drA_vec, rA_vec)
+        rA_vec[...] = drA_sca[:, None] * rA_vec + rA_sca[:, None] * drA_vec + np.cross(drA_vec, rA_vec)
+        rA_sca[...] = new_rA_sca
+
+        # Node B
+        rB_sca, rB_vec = self.rB_sca, self.rB_vec
+        new_rB_sca = drB_sca * rB_sca - _dot_rows(drB_vec, rB_vec)
+        rB_vec[...] = drB_sca[:, None] * rB_vec + rB_sca[:, None] * drB_vec + np.cross(drB_vec, rB_vec)
+        rB_sca[...] = new_rB_sca
+
+        # scalar part of difference quaternion
+        # Eq.(4.72) Klaus
+        sum_vec = self.rA_vec + self.rB_vec
+        s = 0.5 * np.sqrt((self.rA_sca + self.rB_sca) ** 2 + _dot_rows(sum_vec, sum_vec))
+
+        # mean rotation quaternion
+        # Eq.(4.74) and Eq.(4.75) Klaus
+        mean_rotation_scalar = (self.rA_sca + self.rB_sca) * 0.5 / s
+        mean_rotation_vector = sum_vec * 0.5 / s[:, None]
+
+        # Eq.(4.73) Klaus
+        # vector part of difference quaternion, s_vec
+        self.VectorDifferences[...] = (self.rA_sca[:, None] * self.rB_vec - self.rB_sca[:, None] * self.rA_vec +
+                                       np.cross(self.rA_vec, self.rB_vec)) / (2 * s[:, None])
+
+        # rotate initial element basis
+        rotated_coordinate_system = np.stack(
+            [_rotate(mean_rotation_scalar, mean_rotation_vector, self.LocalReferenceRotationMatrix[:, idx])
+             for idx in range(3)], axis=1)
+        self._rotate_basis_to_element_axis(rotated_coordinate_system)
+
+    def _rotate_basis_to_element_axis(self, rotated_coordinate_system):
+        '''
+        rotated_coordinate_system: rows nx, ny, nz per element with shape (n_el, 3, 3)
+        '''
+        nx = rotated_coordinate_system[:, 0]
+
+        # rotate basis to element axis + redefine R
+        delta_x = self.ReferenceCoords[:, 3:6] - self.ReferenceCoords[:, 0:3] + \
+            self.current_deformation[:, 6:9] - self.current_deformation[:, 0:3]
+        delta_x /= np.sqrt(_dot_rows(delta_x, delta_x))[:, None]
+
+        # vector n of Eq. (4.78) Klaus
+        n = nx + delta_x
+        n /= np.sqrt(_dot_rows(n, n))[:, None]
+
+        # the vectors as columns: [-nx, ny, nz] reflected at the plane normal to n
+        n_xyz = np.transpose(rotated_coordinate_system, (0, 2, 1)) * np.array([-1.0, 1.0, 1.0])
+        self.LocalRotationMatrix[...] = n_xyz - 2 * n[:, :, None] * np.einsum('ni,nij->nj', n, n_xyz)[:, None, :]
+        self.Bisector[...] = n
+
+    def _calculate_deformation_stiffness(self, l):
+        '''
+        material and geometric deformation stiffness with shape (n_el, 6, 6)
+        see CRBeamElement._calculate_deformation_stiffness
+        '''
+        # Eq.(4.115) Klaus, geometric contribution of the deformation stiffness matrix
+        Kd = self._deformation_stiffness
+        np.copyto(Kd, self.Kd_mat)
+        Kd[:, DEFORMATION_STIFFNESS_ROWS, DEFORMATION_STIFFNESS_COLS] += \
+            get_deformation_stiffness_geometry_values(self.nodal_force_local, l)
+        return Kd
+
+    def _calculate_transformation_s(self, l):
+        '''
+        Transformation Matrix: from Element Forces to Nodal Forces
+        Eq.(4.61) Klaus, shape (n_el, 12, 6)
+        '''
+        S = self._transformation_s
+        S[:, 1, 5] = 2 / l
+        S[:, 2, 4] = -2 / l
+        S[:, 7, 5] = -2 / l
+        S[:, 8, 4] = 2 / l
+        return S
+
+    def _calculate_local_nodal_forces(self):
+        l = self._calculate_current_length()
+        rotation_transposed = np.transpose(self.LocalRotationMatrix, (0, 2, 1))
+        # symmetric deformation mode - Eq. (4.53) Klaus
+        self.phi_s[...] = 4.0 * _matvec(rotation_transposed, self.VectorDifferences)
+        # asymmetric deformation mode - Eq. (4.54) Klaus
+        self.phi_a[...] = 4.0 * _matvec(rotation_transposed,
+                                        np.cross(self.LocalRotationMatrix[:, :, 0], self.Bisector))
+        self._calculate_nodal_forces_from_modes(l)
+
+    def _calculate_nodal_forces_from_modes(self, l):
+        # deformation mode vector
+        self.v[:, 0:3] = self.phi_s
+        self.v[:, 3] = l - self.L
+        self.v[:, 4:6] = self.phi_a[:, 1:3]
+
+        np.einsum('nij,nj->ni', self._calculate_deformation_stiffness(l), self.v, out=self._element_forces)
+        np.einsum('nij,nj->ni', self._calculate_transformation_s(l), self._element_forces,
+                  out=self.nodal_force_local)
+
+    def _update_transformation_matrix(self):
+        '''
+        block diagonal transformation matrices, the rotation of the nodal forces to global
+        '''
+        rotation = np.where(np.abs(self.LocalRotationMatrix) <= EPSILON, 0.0, self.LocalRotationMatrix)
+        # the zero blocks are kept from the initial state
+        for k in range(0, 12, 3):
+            self.TransformationMatrix[:, k:k + 3, k:k + 3] = rotation
+
+        np.einsum('nij,nbj->nbi', rotation, self.nodal_force_local.reshape(self.n_el, 4, 3),
+                  out=self.nodal_force_global.reshape(self.n_el, 4, 3))
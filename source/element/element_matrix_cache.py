@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class ElementMatrixCache(object):
+    '''
+    Memoization of element matrices keyed on the section and material properties
+
+    Elements with identical properties (e.g. constant sections on an interval
+    and a uniform mesh) share one computed block: the property table is deduplicated,
+    the kernel only evaluates the unique rows not in the cache.
+    The hit and miss counters are per element lookup
+    '''
+
+    # properties which define the element matrices
+    # NOTE: Ip is included as the optimization can modify it independently of Iy and Iz
+    KEY_PROPERTIES = ['E', 'rho', 'nu', 'A', 'Asy', 'Asz', 'Iy', 'Iz', 'It', 'L', 'Ip']
+
+    def __init__(self, max_size=10000):
+        # oldest entries are removed first once max_size is reached
+        # the optimization creates new keys in each objective function evaluation
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = {}
+
+    def get_element_matrices(self, matrix_type, element_type, properties, kernel, out=None):
+        '''
+        matrix_type: label for the matrix, e.g. 'mass' or 'stiffness'
+        properties: dict of arrays with the element properties and further arguments for the kernel
+        kernel: function evaluating a stack of element matrices for the properties
+        out: optional buffer with shape (n_el, el_size, el_size) for the result
+        '''
+        n_el = len(properties['L'])
+        values = np.column_stack([np.broadcast_to(properties[label], (n_el,))
+                                  for label in self.KEY_PROPERTIES])
+        # elements with identical properties share one row
+        unique_values, inverse = np.unique(values, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        prefix = (matrix_type, element_type, properties['domain_size'])
+        keys = [prefix + tuple(row) for row in unique_values.tolist()]
+
+        missing = [idx for idx, key in enumerate(keys) if key not in self._cache]
+        # one miss for the first element of each missing row, all other elements are hits
+        self.misses += len(missing)
+        self.hits += n_el - len(missing)
+
+        unique_blocks = [self._cache.get(key) for key in keys]
+        if missing:
+            subset = dict(properties)
+            for label in self.KEY_PROPERTIES:
+                subset[label] = unique_values[missing, self.KEY_PROPERTIES.index(label)]
+            for idx, el_matrix in zip(missing, kernel(**subset)):
+                unique_blocks[idx] = el_matrix
+                self._store(keys[idx], el_matrix)
+
+        return np.take(np.array(unique_blocks), inverse, axis=0, out=out)
+
+    def _store(self, key, el_matrix):
+        if self._cache and len(self._cache) >= self.max_size:
+            # dicts keep the insertion order -> remove the oldest entry
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = el_matrix
+
+    def cache_info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache)}
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+        self._cache = {}
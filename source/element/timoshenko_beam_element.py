@@ -1,6 +1,6 @@
 import numpy as np
 
-from source.element.beam_element import BeamElement
+from source.element.beam_element import BeamElement, logger
 
 
 class TimoshenkoBeamElement(BeamElement):
@@ -29,7 +29,7 @@ class TimoshenkoBeamElement(BeamElement):
         msg += "Iz: " + str(self.Iz) + "\n"
         msg += "Pz: " + str(self.Pz) + "\n"
         msg += "Py: " + str(self.Py) + "\n"
-        print(msg)
+        logger.debug(msg)
 
     def get_element_mass_matrix(self):
         """
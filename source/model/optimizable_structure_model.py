@@ -8,6 +8,9 @@ import matplotlib.pyplot as plt
 from source.model.structure_model import StraightBeam
 from source.auxiliary.validate_and_assign_defaults import validate_and_assign_defaults
 from source.auxiliary.global_definitions import *
+from source.auxiliary.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 CUST_MAGNITUDE = 2
@@ -71,29 +74,28 @@ class OptimizableStraightBeam(object):
             OptimizableStraightBeam.DEFAULT_SETTINGS, parameters)
         self.parameters = parameters
 
-        print('BEFORE OPTIMIZATION')
+        logger.info('BEFORE OPTIMIZATION')
         self.model.identify_decoupled_eigenmodes(print_to_console=True)
-        print()
 
-        print('Found need for adapting structure for target values')
+        logger.info('Found need for adapting structure for target values')
 
         # if a target mass is set, the density will be adjusted, no additional dependencies
         if 'density_for_total_mass' in self.parameters:
-            print('DENSITY OPTIMIZATION')
+            logger.info('DENSITY OPTIMIZATION')
 
             target_total_mass = self.parameters["density_for_total_mass"]
-            print('Adapting density for target total mass: ', target_total_mass)
+            logger.info('Adapting density for target total mass: %s', target_total_mass)
 
             self.adjust_density_for_target_total_mass(target_total_mass)
 
         # if generically a target mode and frequency is set, the e-modul will be adjusted, g-modul recomputed
         if 'youngs_modulus_for' in self.parameters and self.parameters['youngs_modulus_for']:
-            print('YOUNG\'S MODULUS OPTIMIZATION')
+            logger.info('YOUNG\'S MODULUS OPTIMIZATION')
 
             target_mode = self.parameters["youngs_modulus_for"]["eigenmode"]
             target_freq = self.parameters["youngs_modulus_for"]["eigenfrequency"]
-            print('Adapting young\'s modulus for target eigenfrequency: ' +
-                  str(target_freq) + ' and mode: ' + str(target_mode))
+            logger.info('Adapting young\'s modulus for target eigenfrequency: ' +
+                        str(target_freq) + ' and mode: ' + str(target_mode))
 
             self.adjust_e_modul_for_target_eigenfreq(
                 target_freq, target_mode, True)
@@ -122,7 +124,7 @@ class OptimizableStraightBeam(object):
 
             # NOTE: it seems to need total mass and in general difficult/insesitive to tuning...
             if 'longitudinal' in self.parameters["geometric_properties_for"]["consider_decomposed_modes"]:
-                print('LONGITUDINAL OPTIMIZATION')
+                logger.info('LONGITUDINAL OPTIMIZATION')
 
                 identifier = 'longitudinal'
 
@@ -137,7 +139,7 @@ class OptimizableStraightBeam(object):
             # 2. and 3. - on of SWAY_Y and/or SWAY_Z
             # TODO: optimize for iz, iy (maybe also extend to a_sy, a_sz -> multi design param opt) -> update ip with new values, also pz, py
             if 'sway_y' in self.parameters["geometric_properties_for"]["consider_decomposed_modes"]:
-                print('SWAY_Y OPTIMIZATION')
+                logger.info('SWAY_Y OPTIMIZATION')
 
                 identifier = 'sway_y'
 
@@ -155,7 +157,7 @@ class OptimizableStraightBeam(object):
                     target_freq, target_mode, True)
 
             if 'sway_z' in self.parameters["geometric_properties_for"]["consider_decomposed_modes"]:
-                print('SWAY_Z OPTIMIZATION')
+                logger.info('SWAY_Z OPTIMIZATION')
 
                 identifier = 'sway_z'
 
@@ -170,7 +172,7 @@ class OptimizableStraightBeam(object):
             # 4. TORSIONAL
             # TODO: optimize for it -> needs updated model from previous cases
             if 'torsional' in self.parameters["geometric_properties_for"]["consider_decomposed_modes"]:
-                print('TORSIONAL OPTIMIZATION')
+                logger.info('TORSIONAL OPTIMIZATION')
 
                 identifier = 'torsional'
 
@@ -182,13 +184,12 @@ class OptimizableStraightBeam(object):
                 self.adjust_torsional_stiffness_for_target_eigenfreq(
                     target_freq, target_mode, True)
 
-        print('AFTER OPTIMIZATION')
+        logger.info('AFTER OPTIMIZATION')
         self.model.identify_decoupled_eigenmodes(print_to_console=True)
-        print()
 
     def adjust_density_for_target_total_mass(self, target_total_mass, print_to_console=False):
 
-        print('BEFORE TUNED DENSITY')
+        logger.info('BEFORE TUNED DENSITY')
         # calculate to be sure to have most current
         self.model.calculate_total_mass(True)
 
@@ -210,17 +211,15 @@ class OptimizableStraightBeam(object):
         self.model.parameters['rho'] = initial_rho * opt_rho_fctr
 
         if print_to_console:
-            print('INITIAL rho:', initial_rho)
-            print('OPTIMIZED rho: ', opt_rho_fctr * initial_rho)
-            print()
+            logger.info('INITIAL rho: %s', initial_rho)
+            logger.info('OPTIMIZED rho: %s', opt_rho_fctr * initial_rho)
 
         # re-calculate and print to console
-        print('AFTER TUNED DENSITY')
+        logger.info('AFTER TUNED DENSITY')
         self.model.calculate_total_mass(True)
-        print()
 
         # re-evaluate
-        self.model.calculate_global_matrices()
+        self.model.update_global_matrices(update_rayleigh_coefficients=True)
 
     def generic_material_density_objective_function(self, target_total_mass, initial_rho, multiplier_fctr):
 
@@ -251,9 +250,8 @@ class OptimizableStraightBeam(object):
         opt_e_fctr = minimization_result.x
 
         if print_to_console:
-            print('INITIAL e:', initial_e)
-            print('OPTIMIZED e: ', opt_e_fctr * initial_e)
-            print()
+            logger.info('INITIAL e: %s', initial_e)
+            logger.info('OPTIMIZED e: %s', opt_e_fctr * initial_e)
     def generic_material_stiffness_objective_function(self, target_freq, target_mode, initial_e, multiplier_fctr):
 
         for e in self.model.elements:
@@ -263,7 +261,7 @@ class OptimizableStraightBeam(object):
             e.evaluate_relative_importance_of_shear()
 
         # re-evaluate
-        self.model.calculate_global_matrices()
+        self.model.update_global_matrices(update_rayleigh_coefficients=True)
 
         self.model.eigenvalue_solve()
 
@@ -292,13 +290,10 @@ class OptimizableStraightBeam(object):
         opt_a_fctr = minimization_result.x
 
         if print_to_console:
-            print('INITIAL a:', ', '.join([str(val) for val in initial_a]))
-            print()
-            print('OPTIMIZED a: ', ', '.join(
-                [str(opt_a_fctr * val) for val in initial_a]))
-            print()
-            print('FACTOR: ', opt_a_fctr)
-            print()
+            logger.info('INITIAL a: %s', ', '.join([str(val) for val in initial_a]))
+            logger.info('OPTIMIZED a: %s', ', '.join(
+                      [str(opt_a_fctr * val) for val in initial_a]))
+            logger.info('FACTOR: %s', opt_a_fctr)
 
     def longitudinal_geometric_stiffness_objective_function(self, target_freq, target_mode, initial_a, initial_a_sy, initial_a_sz, multiplier_fctr):
 
@@ -316,7 +311,7 @@ class OptimizableStraightBeam(object):
         # self.adjust_density_for_target_total_mass(target_total_mass)
 
         # re-evaluate
-        self.model.calculate_global_matrices()
+        self.model.update_global_matrices(update_rayleigh_coefficients=True)
 
         self.model.eigenvalue_solve()
 
@@ -356,18 +351,14 @@ class OptimizableStraightBeam(object):
         opt_fctr = minimization_result.x
 
         if print_to_console:
-            print('INITIAL iy:', ', '.join([str(val) for val in initial_iy]))
-            print()
-            print('OPTIMIZED iy: ', ', '.join(
-                [str(opt_fctr[0] * val) for val in initial_iy]))
-            print('INITIAL a_sz:', ', '.join(
-                [str(val) for val in initial_a_sz]))
-            print()
-            print('OPTIMIZED a_sz: ', ', '.join(
-                [str(opt_fctr[1] * val) for val in initial_a_sz]))
-            print()
-            print('FACTORS: ', ', '.join([str(val) for val in opt_fctr]))
-            print()
+            logger.info('INITIAL iy: %s', ', '.join([str(val) for val in initial_iy]))
+            logger.info('OPTIMIZED iy: %s', ', '.join(
+                      [str(opt_fctr[0] * val) for val in initial_iy]))
+            logger.info('INITIAL a_sz: %s', ', '.join(
+                      [str(val) for val in initial_a_sz]))
+            logger.info('OPTIMIZED a_sz: %s', ', '.join(
+                      [str(opt_fctr[1] * val) for val in initial_a_sz]))
+            logger.info('FACTORS: %s', ', '.join([str(val) for val in opt_fctr]))
 
     def bending_y_geometric_stiffness_objective_function(self, target_freq, target_mode, initial_iy, initial_a_sz, multiplier_fctr):
 
@@ -380,7 +371,7 @@ class OptimizableStraightBeam(object):
             e.evaluate_torsional_inertia()
 
         # re-evaluate
-        self.model.calculate_global_matrices()
+        self.model.update_global_matrices(update_rayleigh_coefficients=True)
 
         self.model.eigenvalue_solve()
 
@@ -421,18 +412,14 @@ class OptimizableStraightBeam(object):
         opt_iz_fctr = minimization_result.x
 
         if print_to_console:
-            print('INITIAL iz:', ', '.join([str(val) for val in initial_iz]))
-            print()
-            print('OPTIMIZED iz: ', ', '.join(
-                [str(opt_iz_fctr[0] * val) for val in initial_iz]))
-            print()
-            print('INITIAL a_sy:', ', '.join(
-                [str(val) for val in initial_a_sy]))
-            print()
-            print('OPTIMIZED a_sy: ', ', '.join(
-                [str(opt_iz_fctr[1] * val) for val in initial_a_sy]))
-            print('FACTOR: ', opt_iz_fctr)
-            print()
+            logger.info('INITIAL iz: %s', ', '.join([str(val) for val in initial_iz]))
+            logger.info('OPTIMIZED iz: %s', ', '.join(
+                      [str(opt_iz_fctr[0] * val) for val in initial_iz]))
+            logger.info('INITIAL a_sy: %s', ', '.join(
+                      [str(val) for val in initial_a_sy]))
+            logger.info('OPTIMIZED a_sy: %s', ', '.join(
+                      [str(opt_iz_fctr[1] * val) for val in initial_a_sy]))
+            logger.info('FACTOR: %s', opt_iz_fctr)
 
     def bending_z_geometric_stiffness_objective_function(self, target_freq, target_mode, initial_iz, initial_a_sy, multiplier_fctr):
 
@@ -446,7 +433,7 @@ class OptimizableStraightBeam(object):
             e.evaluate_torsional_inertia()
 
         # re-evaluate
-        self.model.calculate_global_matrices()
+        self.model.update_global_matrices(update_rayleigh_coefficients=True)
 
         self.model.eigenvalue_solve()
 
@@ -495,16 +482,13 @@ class OptimizableStraightBeam(object):
         opt_fctr = minimization_result.x
 
         if print_to_console:
-            print('INITIAL it:', ', '.join([str(val) for val in initial_it]))
-            print('OPTIMIZED it: ', ', '.join(
-                [str(opt_fctr[0] * val) for val in initial_it]))
-            print()
-            print('INITIAL ip:', ', '.join([str(val) for val in initial_ip]))
-            print('OPTIMIZED ip: ', ', '.join(
-                [str(opt_fctr[1] * val) for val in initial_ip]))
-            print()
-            print('FACTORS: ', ', '.join([str(val) for val in opt_fctr]))
-            print()
+            logger.info('INITIAL it: %s', ', '.join([str(val) for val in initial_it]))
+            logger.info('OPTIMIZED it: %s', ', '.join(
+                      [str(opt_fctr[0] * val) for val in initial_it]))
+            logger.info('INITIAL ip: %s', ', '.join([str(val) for val in initial_ip]))
+            logger.info('OPTIMIZED ip: %s', ', '.join(
+                      [str(opt_fctr[1] * val) for val in initial_ip]))
+            logger.info('FACTORS: %s', ', '.join([str(val) for val in opt_fctr]))
 
     def torsional_geometric_stiffness_objective_function(self, target_freq, target_mode, initial_it, initial_ip, multiplier_fctr):
 
@@ -513,7 +497,7 @@ class OptimizableStraightBeam(object):
             e.Ip = multiplier_fctr[1] * initial_ip[e.index]
 
         # re-evaluate
-        self.model.calculate_global_matrices()
+        self.model.update_global_matrices(update_rayleigh_coefficients=True)
 
         self.model.eigenvalue_solve()
 
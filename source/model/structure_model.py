@@ -5,16 +5,24 @@ from os.path import join as os_join
 
 from source.auxiliary.auxiliary_functionalities import evaluate_polynomial
 import source.auxiliary.global_definitions as GD
+import source.auxiliary.matrix_utilities as matrix_utilities
+import source.element.beam_element_set as beam_element_set
+from source.element.element_matrix_cache import ElementMatrixCache
+from source.auxiliary.frozen_topology_assembler import FrozenTopologyAssembler
+from source.auxiliary.eigen_solution_cache import EigenSolutionCache
 from source.auxiliary.validate_and_assign_defaults import validate_and_assign_defaults
+from source.auxiliary.logger import get_logger
 import source.postprocess.plotter_utilities as plotter_utilities
 import source.postprocess.writer_utilitites as writer_utilities
 
+logger = get_logger(__name__)
+
 
 class StraightBeam(object):
     """
     A 2D/3D prismatic homogeneous isotropic Timoshenko beam element
     Including shear and rotationary inertia and deformation
-    Using a consistent mass formulation
+    Using a consistent mass formulation by default, optionally a lumped (diagonal) one
 
     Definition of axes:
         1. Longitudinal axis: x with rotation alpha around x
@@ -49,7 +57,12 @@ class StraightBeam(object):
         "domain_size": "3D",
         "system_parameters": {},
         "boundary_conditions": "fixed-free",
-        "elastic_fixity_dofs": {}}
+        "elastic_fixity_dofs": {},
+        "matrix_format": "dense",
+        "mass_formulation": "consistent",
+        "element_matrix_cache": True,
+        "update_rayleigh_coefficients": False,
+        "number_of_modes": 0}
 
     def __init__(self, parameters):
         # TODO: add number of considered modes for output parameters upper level
@@ -66,6 +79,46 @@ class StraightBeam(object):
         # needed to identify output results
         self.name = parameters["name"]
 
+        # storage of the global matrices: dense numpy arrays, sparse CSR matrices
+        # or banded (sparse DIA) matrices solved with banded factorizations
+        if parameters["matrix_format"] not in matrix_utilities.AVAILABLE_MATRIX_FORMATS:
+            err_msg = "The requested matrix format \"" + \
+                      parameters["matrix_format"]
+            err_msg += "\" is not available \n"
+            err_msg += "Choose one of: \""
+            err_msg += '\", \"'.join(matrix_utilities.AVAILABLE_MATRIX_FORMATS) + '\"'
+            raise Exception(err_msg)
+        self.matrix_format = parameters["matrix_format"]
+
+        # consistent or lumped (diagonal) mass matrix - the latter for explicit schemes
+        if parameters["mass_formulation"] not in ['consistent', 'lumped']:
+            err_msg = "The requested mass formulation \"" + \
+                      parameters["mass_formulation"]
+            err_msg += "\" is not available \n"
+            err_msg += "Choose one of: \"consistent\", \"lumped\""
+            raise Exception(err_msg)
+        self.mass_formulation = parameters["mass_formulation"]
+
+        # Rayleigh damping coefficients are computed once with the initial
+        # eigenvalues and frozen for later reassemblies - e.g. in nonlinear runs
+        # unless updating them with each reassembly is requested
+        self.update_rayleigh_coefficients_on_reassembly = parameters["update_rayleigh_coefficients"]
+        self.rayleigh_coefficients = None
+
+        # number of the lowest eigenmodes computed by the eigenvalue solve
+        # 0 -> full spectrum for dense matrices, a default number of modes for sparse ones
+        # at least 2 modes are needed for the Rayleigh damping
+        if parameters["number_of_modes"] < 0 or parameters["number_of_modes"] == 1:
+            err_msg = "The requested number of modes \"" + \
+                      str(parameters["number_of_modes"])
+            err_msg += "\" is not available \n"
+            err_msg += "Choose 0 for the default or at least 2 modes"
+            raise Exception(err_msg)
+        self.number_of_modes = parameters["number_of_modes"]
+        # the same eigenvalue problem is solved multiple times - e.g. for the damping,
+        # the mode identification and the analyses - on unchanged matrices
+        self.eigen_solution_cache = EigenSolutionCache()
+
         # TODO: validate and assign parameters
         # NOTE: for now using the assumption of the prismatic homogeneous isotropic beam
         self.parameters = {'rho': parameters["system_parameters"]["material"]["density"],
@@ -115,7 +168,7 @@ class StraightBeam(object):
                 self.parameters["intervals"][idx]['m'] = None
                 self.parameters["intervals"][idx]['out_stif_y'] = None
                 self.parameters["intervals"][idx]['out_stif_z'] = None
-                print('No outrigger mass for interval ' + str(idx))
+                logger.info('No outrigger mass for interval ' + str(idx))
 
         # define element type
         self.n_elements = self.parameters['n_el']
@@ -125,6 +178,20 @@ class StraightBeam(object):
         self.nodal_coordinates = {}
         self.elements = []
         self.initialize_elements()
+        # the state update of the nonlinear co-rotational elements in one vectorized pass
+        self.cr_element_set = None
+        if self.parameters['element_type'] == "CRBeam" and self.parameters['is_nonlinear']:
+            from source.element.cr_beam_element_set import CRBeamElementSet
+            self.cr_element_set = CRBeamElementSet(self.elements)
+        # elements with identical properties share their mass and stiffness matrices
+        self.element_matrix_cache = None
+        if parameters["element_matrix_cache"]:
+            self.element_matrix_cache = ElementMatrixCache()
+        # element matrices and point values of the last full assembly
+        # used to track the changes for the incremental update
+        self.assembled_state = None
+        # preallocated assembly of the tangent stiffness in the nonlinear iterations
+        self.tangent_assembler = None
 
         # initialize empty place holders for point stiffness and mass entries
         # elastic bcs and outriggers might contribute to these
@@ -284,7 +351,7 @@ class StraightBeam(object):
         if 'elastic_fixity_dofs' in self.parameters:
             elastic_bc_dofs_tmp = self.parameters["elastic_fixity_dofs"]
         else:
-            print(
+            logger.info(
                 'parameters does not have "elastic_fixity_dofs"')
             elastic_bc_dofs_tmp = {}
 
@@ -298,7 +365,7 @@ class StraightBeam(object):
                 err_msg += ', '.join([str(val) for val in self.bc_dofs])
                 raise Exception(err_msg)
             else:
-                print('Valid DoF ' + key +
+                logger.info('Valid DoF ' + key +
                       ' for elastic constraint, removing from constrained DoFs')
                 self.bc_dofs.remove(int(key))
 
@@ -342,6 +409,25 @@ class StraightBeam(object):
         self.dofs_to_keep = list(
             set(self.all_dofs_global) - set(bc_dofs_global))
 
+        self.initialize_dof_maps()
+
+    def initialize_dof_maps(self):
+        '''
+        precomputed index maps between the global and the BC reduced dofs
+        to assemble directly into the reduced system and scatter results back
+        '''
+        # global dof ids of each element - shape (n_el, el_size)
+        el_size = GD.DOFS_PER_NODE[self.domain_size] * GD.NODES_PER_LEVEL
+        i_starts = np.array([GD.DOFS_PER_NODE[self.domain_size] * element.index
+                             for element in self.elements])
+        self.element_dofs = i_starts[:, None] + np.arange(el_size)[None, :]
+
+        # reduced dof id for each global dof, -1 for the constrained ones
+        self.global_to_reduced_dofs = np.full(len(self.all_dofs_global), -1, dtype=int)
+        self.global_to_reduced_dofs[self.dofs_to_keep] = np.arange(len(self.dofs_to_keep))
+
+        self.reduction_ixgrid = np.ix_(self.dofs_to_keep, self.dofs_to_keep)
+
     def update_outrigger_contribution(self):
 
         # point stiffness and point masses at respective dof for the outrigger
@@ -354,11 +440,12 @@ class StraightBeam(object):
                     geom_location = values['bounds'][1]
                     height_of_interval = geom_location - values['bounds'][0]
 
-                print('Outrigger at\n')
-                print(' geometric location ', str(geom_location))
+                # called in each update of the optimization - only on request
+                logger.debug('Outrigger at')
+                logger.debug(' geometric location %s', geom_location)
 
                 geom_node_id = int(geom_location / self.lx_i)
-                print(' geometric node id ', str(geom_node_id))
+                logger.debug(' geometric node id %s', geom_node_id)
 
                 # Point mass entries
                 # existing nodal mass from area, length and density
@@ -382,7 +469,7 @@ class StraightBeam(object):
                     msg += "larger than target outrigger of " + \
                         str(values['m']) + " [kg].\n"
                     msg += "Not incrementing to target (as is it lower) but adding up to existing.\n"
-                    print(msg)
+                    logger.debug(msg)
 
                     # values['m']  DONE : check
                     self.parameters['point_m'][geom_node_id] += 0
@@ -442,49 +529,161 @@ class StraightBeam(object):
         self.update_equivalent_nodal_mass()
         self.update_outrigger_contribution()
         # adding the point mass entries to this
-        print(self.parameters['m'])
+        logger.debug("nodal masses: %s", self.parameters['m'])
         self.parameters['m_tot'] = 0.0
         for val in self.parameters['m']:
             self.parameters['m_tot'] += val
         # Done: Add outrigger masses to this entry as the parameters['m '] is
         # already updated with the point masses in calculate_global matrices
         if print_to_console:
-            print('CURRENT:')
-            print('total mass ', self.parameters['m_tot'])
-            print('density: ', self.parameters['rho'])
-            print()
+            logger.info('CURRENT:')
+            logger.info('total mass %s', self.parameters['m_tot'])
+            logger.info('density: %s', self.parameters['rho'])
 
     def update_stiffness_matrix(self):
-        k = self._get_stiffness()
-        comp_k = self.apply_bc_by_reduction(k)
-        return comp_k
+        '''
+        tangent stiffness assembled directly into the reduced system - called in each nonlinear iteration
+        the pattern does not change: the values of a preallocated matrix are overwritten in place
+        NOTE: the returned matrix is overwritten by the next call
+        '''
+        if self.tangent_assembler is None or not self.tangent_assembler.is_compatible(self.point_stiffness):
+            self.tangent_assembler = FrozenTopologyAssembler(
+                self.element_dofs, len(self.dofs_to_keep), self.matrix_format,
+                list(self.point_stiffness.keys()), self.global_to_reduced_dofs)
+
+        # the element matrices are evaluated into the buffer of the assembler
+        el_matrices = self._get_element_matrices('stiffness', out=self.tangent_assembler.element_matrices)
+        return self.tangent_assembler.assemble(el_matrices, self.point_stiffness)
 
-    def calculate_global_matrices(self):
+    def calculate_global_matrices(self, update_rayleigh_coefficients=None):
         # using computational values for m,b,k as this reduction is done otherwise many times
         # also update the outrigger contribution
         self.update_outrigger_contribution()
         # mass matrix
-        self.m = self._get_mass()
-        self.comp_m = self.apply_bc_by_reduction(self.m)
+        # the reduced matrices are assembled directly from the same element matrices
+        el_mass = self._get_element_matrices('mass')
+        self.m = self._assemble_global_matrix(el_mass, self.point_mass)
+        self.comp_m = self._assemble_global_matrix(el_mass, self.point_mass, reduced=True)
         # stiffness matrix
-        self.k = self._get_stiffness()
-        self.comp_k = self.apply_bc_by_reduction(self.k)
+        el_stiffness = self._get_element_matrices('stiffness')
+        self.k = self._assemble_global_matrix(el_stiffness, self.point_stiffness)
+        self.comp_k = self._assemble_global_matrix(el_stiffness, self.point_stiffness, reduced=True)
         # damping matrix - needs to be done after mass and stiffness as Rayleigh method nees these
+        if update_rayleigh_coefficients is None:
+            update_rayleigh_coefficients = self.update_rayleigh_coefficients_on_reassembly
+        if update_rayleigh_coefficients or self.rayleigh_coefficients is None:
+            self.update_rayleigh_coefficients()
         self.b = self._get_damping()
-        self.comp_b = self.apply_bc_by_reduction(self.b)
+        self.comp_b = self._get_damping(reduced=True)
+        # updating the eleemnt mass contribution
+        self._add_point_mass_contribution()
+
+        # the state for the incremental update is tracked for the vectorized element types
+        if self.parameters['element_type'] in beam_element_set.AVAILABLE_ELEMENT_TYPES:
+            self.assembled_state = {
+                'properties': self._get_element_property_table(),
+                'mass': np.array(el_mass),
+                'stiffness': np.array(el_stiffness),
+                'point_mass': dict(self.point_mass),
+                'point_stiffness': dict(self.point_stiffness),
+                'rayleigh_coefficients': np.copy(self.rayleigh_coefficients)}
+
+    def update_global_matrices(self, update_rayleigh_coefficients=None):
+        '''
+        Incremental counterpart of calculate_global_matrices
+
+        Only the elements with changed properties (dirty elements) and the changed
+        point values contribute: their old blocks are subtracted and the new ones
+        added into the existing global and reduced matrices
+        NOTE: dense matrices are updated in place
+
+        Falls back to the full reassembly if no assembled state is tracked
+        '''
+        if self.assembled_state is None:
+            self.calculate_global_matrices(update_rayleigh_coefficients)
+            return
+
+        state = self.assembled_state
+        self.update_outrigger_contribution()
+
+        properties = self._get_element_property_table()
+        dirty_ids = np.flatnonzero(np.any(properties != state['properties'], axis=1))
+
+        deltas = {}
+        for matrix_type, point_values in [('mass', self.point_mass),
+                                          ('stiffness', self.point_stiffness)]:
+            el_delta = np.zeros_like(state[matrix_type][dirty_ids])
+            if len(dirty_ids) > 0:
+                el_matrices = self._get_element_matrices(matrix_type, dirty_ids)
+                el_delta = el_matrices - state[matrix_type][dirty_ids]
+                state[matrix_type][dirty_ids] = el_matrices
+
+            old_point_values = state['point_' + matrix_type]
+            point_delta = {}
+            for dof in set(point_values) | set(old_point_values):
+                delta = point_values.get(dof, 0.0) - old_point_values.get(dof, 0.0)
+                if delta != 0.0:
+                    point_delta[dof] = delta
+            state['point_' + matrix_type] = dict(point_values)
+
+            deltas[matrix_type] = (el_delta, point_delta)
+
+        self.m, self.comp_m = self._add_to_global_matrices(
+            self.m, self.comp_m, dirty_ids, *deltas['mass'])
+        self.k, self.comp_k = self._add_to_global_matrices(
+            self.k, self.comp_k, dirty_ids, *deltas['stiffness'])
+
+        # damping matrix
+        if update_rayleigh_coefficients is None:
+            update_rayleigh_coefficients = self.update_rayleigh_coefficients_on_reassembly
+        if update_rayleigh_coefficients:
+            self.update_rayleigh_coefficients()
+
+        if np.array_equal(self.rayleigh_coefficients, state['rayleigh_coefficients']):
+            # same linear combination of the mass and stiffness changes
+            alpha, beta = self.rayleigh_coefficients
+            el_delta = alpha * deltas['mass'][0] + beta * deltas['stiffness'][0]
+            point_delta = {}
+            for dof in set(deltas['mass'][1]) | set(deltas['stiffness'][1]):
+                point_delta[dof] = alpha * deltas['mass'][1].get(dof, 0.0) + \
+                    beta * deltas['stiffness'][1].get(dof, 0.0)
+            self.b, self.comp_b = self._add_to_global_matrices(
+                self.b, self.comp_b, dirty_ids, el_delta, point_delta)
+        else:
+            self.b = self._get_damping()
+            self.comp_b = self._get_damping(reduced=True)
+            state['rayleigh_coefficients'] = np.copy(self.rayleigh_coefficients)
+
+        state['properties'] = properties
         # updating the eleemnt mass contribution
+        self._add_point_mass_contribution()
+
+    def _add_to_global_matrices(self, matrix, comp_matrix, element_ids, el_delta, point_delta):
+        '''
+        add the element and point value changes into the global and the reduced matrix
+        '''
+        if len(element_ids) == 0 and not point_delta:
+            return matrix, comp_matrix
+        el_dofs = self.element_dofs[element_ids]
+        matrix = matrix_utilities.add_to_assembled(matrix, el_delta, el_dofs, point_delta)
+        comp_matrix = matrix_utilities.add_to_assembled(
+            comp_matrix, el_delta, el_dofs, point_delta, self.global_to_reduced_dofs)
+        return matrix, comp_matrix
+
+    def _add_point_mass_contribution(self):
         for idx in range(len(self.parameters['x'])):
             self.parameters['m'][idx] += self.parameters['point_m'][idx]
 
     def decompose_and_quantify_eigenmodes(self, considered_modes=15):
+        self.eigenvalue_solve()
+
         # TODO remove code duplication: considered_modes
+        # NOTE: limited by the number of computed modes
         if considered_modes == 'all':
-            considered_modes = len(self.dofs_to_keep)
+            considered_modes = len(self.eig_freqs)
         else:
-            if considered_modes > len(self.dofs_to_keep):
-                considered_modes = len(self.dofs_to_keep)
-
-        self.eigenvalue_solve()
+            if considered_modes > len(self.eig_freqs):
+                considered_modes = len(self.eig_freqs)
 
         self.decomposed_eigenmodes = {'values': [], 'rel_contribution': [], 'eff_modal_mass': [],
                                       'rel_participation': []}
@@ -561,14 +760,15 @@ class StraightBeam(object):
                 rel_participation)
 
     def identify_decoupled_eigenmodes(self, considered_modes=15, print_to_console=False):
+        self.decompose_and_quantify_eigenmodes()
+
         # TODO remove code duplication: considered_modes
+        # NOTE: limited by the number of decomposed modes
         if considered_modes == 'all':
-            considered_modes = len(self.dofs_to_keep)
+            considered_modes = len(self.decomposed_eigenmodes['values'])
         else:
-            if considered_modes > len(self.dofs_to_keep):
-                considered_modes = len(self.dofs_to_keep)
-
-        self.decompose_and_quantify_eigenmodes()
+            if considered_modes > len(self.decomposed_eigenmodes['values']):
+                considered_modes = len(self.decomposed_eigenmodes['values'])
 
         self.mode_identification_results = {}
 
@@ -602,23 +802,28 @@ class StraightBeam(object):
                         }]
 
         if print_to_console:
-            print('Result of decoupled eigenmode identification for the first ' +
-                  str(considered_modes) + ' mode(s)')
+            logger.info('Result of decoupled eigenmode identification for the first %d mode(s)',
+                        considered_modes)
 
             for mode_type, type_results in self.mode_identification_results.items():
-                print('  Mode type:', mode_type)
+                logger.info('  Mode type: %s', mode_type)
                 for t_res in type_results:
                     m_id = t_res['mode_id']
                     # will have: mode_id, eff_modal_mass, rel_participation
                     # TODO use different datatype to avoid list(mode_id.keys())[0]
-                    print('    Eigenform ' + str(m_id) + ' with eigenfrequency ' + '{:.2f}'.format(
-                        self.eig_freqs[self.eig_freqs_sorted_indices[m_id - 1]]) + ' Hz')
+                    logger.info('    Eigenform %d with eigenfrequency %.2f Hz',
+                                m_id, self.eig_freqs[self.eig_freqs_sorted_indices[m_id - 1]])
 
-    def eigenvalue_solve(self):
+    def eigenvalue_solve(self, number_of_modes=None):
+        # by default the number of modes of the model settings
+        if number_of_modes is None:
+            number_of_modes = self.number_of_modes
         # raw results
         # solving for reduced m and k - applying BCs leads to avoiding rigid body modes
-        self.eig_values_raw, self.eigen_modes_raw = linalg.eigh(
-            self.comp_k, self.comp_m)
+        # only the lowest modes if a number of modes is given
+        # NOTE: cached results are read-only
+        self.eig_values_raw, self.eigen_modes_raw = self.eigen_solution_cache.get_eigen_solution(
+            self.comp_k, self.comp_m, number_of_modes if number_of_modes > 0 else None)
         # rad/s
         self.eig_values = np.sqrt(np.real(self.eig_values_raw))
         self.eig_freqs = self.eig_values / 2. / np.pi
@@ -755,6 +960,9 @@ class StraightBeam(object):
         use np.ix_ and ixgrid to extract relevant elements
         '''
 
+        if matrix_utilities.is_sparse(matrix):
+            return self._apply_bc_by_reduction_sparse(matrix, axis)
+
         # NOTE: should be quite robust
         # TODO: test
         if axis == 'row':
@@ -764,8 +972,8 @@ class StraightBeam(object):
             # make a grid of indices on interest
             ixgrid = np.ix_(np.arange(matrix.shape[0]), self.dofs_to_keep)
         elif axis == 'both':
-            # make a grid of indices on interest
-            ixgrid = np.ix_(self.dofs_to_keep, self.dofs_to_keep)
+            # precomputed grid of indices on interest
+            ixgrid = self.reduction_ixgrid
         elif axis == 'row_vector':
             ixgrid = np.ix_(self.dofs_to_keep, [0])
             matrix = matrix.reshape([len(matrix), 1])
@@ -779,11 +987,33 @@ class StraightBeam(object):
 
         return matrix[ixgrid]
 
-    def recuperate_bc_by_extension(self, matrix, axis='row'):
+    def _apply_bc_by_reduction_sparse(self, matrix, axis='both'):
+        '''
+        sparse counterpart of apply_bc_by_reduction for matrices
+        slicing rows of the CSR and then columns keeps the result sparse
+        '''
+        if axis == 'row':
+            return matrix.tocsr()[self.dofs_to_keep, :]
+        elif axis == 'column':
+            return matrix.tocsc()[:, self.dofs_to_keep].tocsr()
+        elif axis == 'both':
+            reduced = matrix.tocsr()[self.dofs_to_keep, :].tocsc()[:, self.dofs_to_keep]
+            # keep the storage format of the square matrix - e.g. banded
+            return reduced.asformat(matrix.format)
+        else:
+            err_msg = "The reduction mode with input \"" + axis
+            err_msg += "\" for axis is not avaialbe for sparse matrices \n"
+            err_msg += "Choose one of: \"row\", \"column\", \"both\""
+            raise Exception(err_msg)
+
+    def recuperate_bc_by_extension(self, matrix, axis='row', out=None):
         '''
         list of dofs to apply the effect of bc
         by extension
         use np.ix_ and ixgrid to extract relevant elements
+
+        out: optional preallocated full size array to scatter into,
+        the entries of the constrained dofs are expected to be zero
         '''
 
         # NOTE: should be quite robust
@@ -799,36 +1029,40 @@ class StraightBeam(object):
             cols = matrix.shape[1]
             # make a grid of indices on interest
             ixgrid = np.ix_(self.dofs_to_keep, np.arange(matrix.shape[1]))
-            extended_matrix = np.zeros((rows, cols))
+            shape = (rows, cols)
         elif axis == 'column':
             rows = matrix.shape[0]
             cols = len(self.all_dofs_global)
             # make a grid of indices on interest
             ixgrid = np.ix_(np.arange(matrix.shape[0]), self.dofs_to_keep)
-            extended_matrix = np.zeros((rows, cols))
+            shape = (rows, cols)
         elif axis == 'both':
             rows = len(self.all_dofs_global)
             cols = rows
-            # make a grid of indices on interest
-            ixgrid = np.ix_(self.dofs_to_keep, self.dofs_to_keep)
-            extended_matrix = np.zeros((rows, cols))
+            # precomputed grid of indices on interest
+            ixgrid = self.reduction_ixgrid
+            shape = (rows, cols)
         elif axis == 'row_vector':
             rows = len(self.all_dofs_global)
             cols = 1
             ixgrid = np.ix_(self.dofs_to_keep, [0])
             matrix = matrix.reshape([len(matrix), 1])
-            extended_matrix = np.zeros((rows, cols))
+            shape = (rows, cols)
         elif axis == 'column_vector':
             rows = len(self.all_dofs_global)
             cols = 1
             ixgrid = np.ix_(self.dofs_to_keep)
-            extended_matrix = np.zeros((rows,))
+            shape = (rows,)
         else:
             err_msg = "The extension mode with input \"" + axis
             err_msg += "\" for axis is not avaialbe \n"
             err_msg += "Choose one of: \"row\", \"column\", \"both\", \"row_vector\""
             raise Exception(err_msg)
 
+        if out is not None:
+            extended_matrix = out
+        else:
+            extended_matrix = np.zeros(shape)
         extended_matrix[ixgrid] = matrix
 
         return extended_matrix
@@ -850,53 +1084,138 @@ class StraightBeam(object):
                     self.domain_size] * GD.NODES_PER_LEVEL] += el_matrix
         return glob_matrix
 
-    def _get_mass(self):
+    def _assemble_global_matrix(self, el_matrices, point_values, reduced=False):
+        """
+        Assemble the element matrices and the point values into
+        the global matrix in the format given by self.matrix_format
 
-        # global stiffness matrix initialization with zeros
-        glob_matrix = np.zeros((self.n_nodes * GD.DOFS_PER_NODE[self.domain_size],
-                                self.n_nodes * GD.DOFS_PER_NODE[self.domain_size]))
+        reduced: assemble directly into the BC reduced system using the dof map
+        """
+        if reduced:
+            n_dofs = len(self.dofs_to_keep)
+            dof_map = self.global_to_reduced_dofs
+        else:
+            n_dofs = len(self.all_dofs_global)
+            dof_map = None
 
-        # fill global mass matrix entries
-        for element in self.elements:
-            el_matrix = element.get_element_mass_matrix()
-            i_start = GD.DOFS_PER_NODE[self.domain_size] * element.index
-            i_end = i_start + \
-                GD.DOFS_PER_NODE[self.domain_size] * GD.NODES_PER_LEVEL
-            glob_matrix[
-                i_start: i_end,
-                i_start: i_end
-            ] += el_matrix
+        if self.matrix_format == 'sparse':
+            return matrix_utilities.assemble_sparse(
+                el_matrices, self.element_dofs, n_dofs, point_values, dof_map)
+        elif self.matrix_format == 'banded':
+            # the element blocks only couple neighbouring nodes -> band structure
+            return matrix_utilities.assemble_sparse(
+                el_matrices, self.element_dofs, n_dofs, point_values, dof_map).todia()
 
-        for idx, val in self.point_mass.items():
-            glob_matrix[idx, idx] += val
+        return matrix_utilities.assemble_dense(
+            el_matrices, self.element_dofs, n_dofs, point_values, dof_map)
 
-        return glob_matrix
+    def _get_element_set_properties(self, element_ids=None):
+        '''
+        current properties of all or the selected elements as arrays for the vectorized element set
+        NOTE: read from the elements as the optimization modifies these directly
+        '''
+        if element_ids is None:
+            elements = self.elements
+        else:
+            elements = [self.elements[idx] for idx in element_ids]
+        return {'rho': np.array([e.rho for e in elements]),
+                'A': np.array([e.A for e in elements]),
+                'Asy': np.array([e.Asy for e in elements]),
+                'Asz': np.array([e.Asz for e in elements]),
+                'Iy': np.array([e.Iy for e in elements]),
+                'Iz': np.array([e.Iz for e in elements]),
+                'It': np.array([e.It for e in elements]),
+                'L': np.array([e.L for e in elements]),
+                'E': np.array([e.E for e in elements]),
+                'nu': np.array([e.nu for e in elements]),
+                'Ip': np.array([e.Ip for e in elements]),
+                'domain_size': self.domain_size,
+                'shear_deformation': self.parameters['element_type'] != 'Bernoulli'}
+
+    def _get_element_property_table(self):
+        # one row per element with the properties defining its matrices
+        properties = self._get_element_set_properties()
+        return np.column_stack([properties[label] for label in ElementMatrixCache.KEY_PROPERTIES])
+
+    def _get_element_matrices(self, matrix_type, element_ids=None, out=None):
+        '''
+        mass or stiffness matrices of all or the selected elements
+        out: optional buffer for the matrices, e.g. of the tangent assembly
+        '''
+        if matrix_type == 'mass' and self.mass_formulation == 'lumped':
+            # the nodal masses and rotational inertias on the diagonal
+            # the point masses are added as point values in the assembly
+            el_matrices = beam_element_set.get_lumped_mass_matrices(
+                self._get_consistent_element_matrices(matrix_type, element_ids), self.domain_size)
+            if out is None:
+                return el_matrices
+            out[...] = el_matrices
+            return out
+        return self._get_consistent_element_matrices(matrix_type, element_ids, out)
+
+    def _get_consistent_element_matrices(self, matrix_type, element_ids=None, out=None):
+        if self.parameters['element_type'] in beam_element_set.AVAILABLE_ELEMENT_TYPES:
+            if matrix_type == 'mass':
+                kernel = beam_element_set.get_element_mass_matrices
+            else:
+                kernel = beam_element_set.get_element_stiffness_matrices
+            properties = self._get_element_set_properties(element_ids)
+            if self.element_matrix_cache is None:
+                return kernel(**properties, out=out)
+            return self.element_matrix_cache.get_element_matrices(
+                matrix_type, self.parameters['element_type'], properties, kernel, out)
+
+        if self.cr_element_set is not None:
+            # nonlinear co-rotational elements: cached material parts and templates for all elements at once
+            if matrix_type == 'mass':
+                el_matrices = self.cr_element_set.get_element_mass_matrices(element_ids)
+            elif element_ids is None:
+                return self.cr_element_set.get_element_stiffness_matrices(out=out)
+            else:
+                el_matrices = self.cr_element_set.get_element_stiffness_matrices(element_ids)
+        else:
+            if element_ids is None:
+                elements = self.elements
+            else:
+                elements = [self.elements[idx] for idx in element_ids]
+            if matrix_type == 'mass':
+                el_matrices = [element.get_element_mass_matrix() for element in elements]
+            else:
+                el_matrices = [element.get_element_stiffness_matrix() for element in elements]
 
-    def _get_stiffness(self):
-        # global stiffness matrix initialization with zeros
-        glob_matrix = np.zeros((self.n_nodes * GD.DOFS_PER_NODE[self.domain_size],
-                                self.n_nodes * GD.DOFS_PER_NODE[self.domain_size]))
+        if out is None:
+            return el_matrices
+        out[...] = el_matrices
+        return out
 
-        # fill global stiffness matrix entries
-        for element in self.elements:
-            el_matrix = element.get_element_stiffness_matrix()
-            i_start = GD.DOFS_PER_NODE[self.domain_size] * element.index
-            i_end = i_start + \
-                GD.DOFS_PER_NODE[self.domain_size] * GD.NODES_PER_LEVEL
+    def _get_mass(self, reduced=False):
+        el_matrices = self._get_element_matrices('mass')
+        return self._assemble_global_matrix(el_matrices, self.point_mass, reduced)
 
-            glob_matrix[
-                i_start: i_end,
-                i_start: i_end] += el_matrix
+    def _get_stiffness(self, reduced=False):
+        el_matrices = self._get_element_matrices('stiffness')
+        return self._assemble_global_matrix(el_matrices, self.point_stiffness, reduced)
 
-        for idx, val in self.point_stiffness.items():
-            glob_matrix[idx, idx] += val
+    def _get_damping(self, reduced=False):
+        """
+        Calculate damping b based upon the Rayleigh assumption
+        with the current coefficients
 
-        return glob_matrix
+        reduced: from the BC reduced mass and stiffness matrices
+        """
+        if reduced:
+            m, k = self.comp_m, self.comp_k
+        else:
+            # return back the whole matrix - without BCs applied
+            m, k = self.m, self.k
+        return self.rayleigh_coefficients[0] * m + self.rayleigh_coefficients[1] * k
 
-    def _get_damping(self):
+    def update_rayleigh_coefficients(self):
         """
-        Calculate damping b based upon the Rayleigh assumption
+        Calculate the Rayleigh coefficients
         using the first 2 eigemodes - here generically i and i
+
+        NOTE: needs the current mass and stiffness matrices
         """
 
         mode_i = 0
@@ -916,6 +1235,3 @@ class StraightBeam(object):
                                                                self.eig_freqs_sorted_indices[
                                                                    mode_j]]]]),
                                                      [zeta_i, zeta_j])
-
-        # return back the whole matrix - without BCs applied
-        return self.rayleigh_coefficients[0] * self.m + self.rayleigh_coefficients[1] * self.k
@@ -1,5 +1,8 @@
 import numpy as np
 from source.postprocess.skin_model.node_model import Node
+from source.auxiliary.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class LineStructure:
@@ -53,7 +56,7 @@ class LineStructure:
 
         self.update_dofs(0)
 
-        print("Undeformed Nodes added successfully!")
+        logger.debug("Undeformed Nodes added successfully!")
 
     def update_dofs(self, step):
 
@@ -6,6 +6,9 @@ from os.path import join
 import numpy as np
 
 from source.postprocess.skin_model.skin_components_model import Structure
+from source.auxiliary.logger import get_logger
+
+logger = get_logger(__name__)
 from source.postprocess.skin_model.line_structure_model import LineStructure
 from source.postprocess.skin_model.mapper import Mapper
 
@@ -176,7 +179,7 @@ class Visualiser:
                                     repeat=False)
         if self.is_record_animation:
             a.save(self.file, self.writer)
-            print("Successfully written animation video!")
+            logger.info("Successfully written animation video!")
 
         plt.grid()
         plt.tight_layout()
@@ -190,7 +193,7 @@ class Visualiser:
         if wframe is not None:
             self.ax.cla()
         real_step = step * self.record_step + self.start_step
-        print("time: " + "{0:.2f}".format(real_step * self.dt))
+        logger.info("time: " + "{0:.2f}".format(real_step * self.dt))
         self.line_structure.update_dofs(real_step)
         self.mapper.map_line_structure_to_structure()
 
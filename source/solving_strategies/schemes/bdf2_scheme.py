@@ -1,6 +1,6 @@
 import numpy as np
 
-from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme
+from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme, logger
 
 
 class BDF2(TimeIntegrationScheme):
@@ -16,10 +16,7 @@ class BDF2(TimeIntegrationScheme):
 
         super().__init__(dt, comp_model, initial_conditions)
 
-        # bdf2 scheme coefficients
-        self.bdf0 = 1.5 / self.dt
-        self.bdf1 = -2. / self.dt
-        self.bdf2 = 0.5 / self.dt
+        self._init_coefficients()
 
         # structure
         # initial displacement, velocity and acceleration
@@ -32,10 +29,44 @@ class BDF2(TimeIntegrationScheme):
 
         self._print_time_integration_setup()
 
+    def _init_coefficients(self):
+        # bdf2 scheme coefficients
+        self.bdf0 = 1.5 / self.dt
+        self.bdf1 = -2. / self.dt
+        self.bdf2 = 0.5 / self.dt
+
+    def set_time_step(self, dt):
+        '''
+        The history is resampled to the new time step: the cubic through the
+        last four displacements is evaluated at the new previous time points and
+        the velocities follow from these with the new coefficients
+        '''
+        if dt == self.dt:
+            return
+        old_times = -self.dt * np.arange(4)
+        new_times = -dt * np.arange(1, 4)
+        # Lagrange weights of the old points for each new point
+        weights = np.ones((len(new_times), len(old_times)))
+        for j, t_j in enumerate(old_times):
+            for m, t_m in enumerate(old_times):
+                if m != j:
+                    weights[:, j] *= (new_times - t_m) / (t_j - t_m)
+        history = [self.un1, self.un2, self.un3, self.un4]
+        self.un2, self.un3, self.un4 = [sum(w * u for w, u in zip(row, history)) for row in weights]
+
+        super().set_time_step(dt)
+        self.vn1 = self.bdf0 * self.un1 + self.bdf1 * self.un2 + self.bdf2 * self.un3
+        self.vn2 = self.bdf0 * self.un2 + self.bdf1 * self.un3 + self.bdf2 * self.un4
+
+    def get_error_estimate(self):
+        # Milne's device with the quadratic extrapolation of the history as predictor
+        u_predicted = 3.0 * self.un1 - 3.0 * self.un2 + self.un3
+        return 2.0 / 7.0 * (self.u1 - u_predicted)
+
     def _print_time_integration_setup(self):
-        print("Printing BDF2 2nd order method integration scheme setup:")
-        print("dt: ", self.dt)
-        print(" ")
+        logger.info("Printing BDF2 2nd order method integration scheme setup:")
+        logger.info("dt: %s", self.dt)
+        logger.info(" ")
 
     def predict_velocity(self, u1):
         v1 = self.bdf0 * u1 + self.bdf1 * self.un1 + self.bdf2 * self.un2
@@ -45,19 +76,36 @@ class BDF2(TimeIntegrationScheme):
         a1 = self.bdf0 * v1 + self.bdf1 * self.vn1 + self.bdf2 * self.vn2
         return a1
 
-    def solve_single_step(self, f1):
-        # TODO: needs check for system size, LHS missing
+    def get_lhs(self):
+        # from a1 = bdf0 * v1 + ... with v1 = bdf0 * u1 + ...
+        return self.bdf0 ** 2 * self.M + self.bdf0 * self.B + self.K
 
-        RHS = - np.dot(self.B, self.bdf1 * self.un1) - \
-            np.dot(self.B, self.bdf2 * self.un2)
-        RHS += - 2 * self.bdf0 * self.bdf1 * np.dot(self.M, self.un1)
-        RHS += - 2 * self.bdf0 * self.bdf2 * np.dot(self.M, self.un2)
-        RHS += -     self.bdf1 * self.bdf1 * np.dot(self.M, self.un2)
-        RHS += - 2 * self.bdf1 * self.bdf2 * np.dot(self.M, self.un3)
-        RHS += -     self.bdf2 * self.bdf2 * np.dot(self.M, self.un4) + f1
+    def solve_single_step(self, f1):
+        if self.M.ndim == 2:
+            # system: in matrix form
+            RHS = - self.B.dot(self.bdf1 * self.un1) - \
+                self.B.dot(self.bdf2 * self.un2)
+            RHS += - 2 * self.bdf0 * self.bdf1 * self.M.dot(self.un1)
+            RHS += - 2 * self.bdf0 * self.bdf2 * self.M.dot(self.un2)
+            RHS += -     self.bdf1 * self.bdf1 * self.M.dot(self.un2)
+            RHS += - 2 * self.bdf1 * self.bdf2 * self.M.dot(self.un3)
+            RHS += -     self.bdf2 * self.bdf2 * self.M.dot(self.un4) + f1
+
+        elif self.M.ndim == 1:
+            # system: in vector (from diagonal matrix) or scalar form
+            RHS = - self.B * (self.bdf1 * self.un1) - \
+                self.B * (self.bdf2 * self.un2)
+            RHS += - 2 * self.bdf0 * self.bdf1 * self.M * self.un1
+            RHS += - 2 * self.bdf0 * self.bdf2 * self.M * self.un2
+            RHS += -     self.bdf1 * self.bdf1 * self.M * self.un2
+            RHS += - 2 * self.bdf1 * self.bdf2 * self.M * self.un3
+            RHS += -     self.bdf2 * self.bdf2 * self.M * self.un4 + f1
+
+        else:
+            raise Exception('Dimension of system parameters is BDF2 is wrong')
 
         # calculates self.un0,vn0,an0
-        self.u1 = np.linalg.solve(LHS, RHS)
+        self.u1 = self.solve_lhs(RHS)
         self.v1 = self.predict_velocity(self.u1)
         self.a1 = self.predict_acceleration(self.v1)
 
@@ -0,0 +1,141 @@
+import numpy as np
+
+import source.auxiliary.matrix_utilities as matrix_utilities
+from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme, logger
+
+
+class CentralDifference(TimeIntegrationScheme):
+    """
+    Explicit central difference scheme in the velocity Verlet form
+
+    Requires a diagonal (lumped) mass: each step is an elementwise division and
+    the products of K and B with the state, no factorization
+    The damping force is evaluated with the velocity at the half step
+
+    The stable (sub)step follows from the highest eigenfrequency and the damping ratio
+    of the corresponding mode: dt_cr = 2 / omega_max * (sqrt(1 + zeta^2) - zeta),
+    a time step above safety_factor * dt_cr is subdivided into equal substeps
+    with the force linearly interpolated
+
+    For an updated model (e.g. nonlinear elements) the eigenvalue of the highest mode
+    is first estimated by its Rayleigh quotient, the eigenvalue solve is repeated only
+    if the estimate changed by more than update_tolerance (relative)
+    """
+
+    def __init__(self, dt, comp_model, initial_conditions, safety_factor=0.9, update_tolerance=0.01):
+        super().__init__(dt, comp_model, initial_conditions)
+
+        if not 0.0 < safety_factor <= 1.0:
+            err_msg = "The safety factor of the critical time step has to be in (0.0, 1.0], provided: " + \
+                str(safety_factor)
+            raise Exception(err_msg)
+        self.safety_factor = safety_factor
+        if update_tolerance < 0.0:
+            err_msg = "The update tolerance of the critical time step has to be >= 0.0, provided: " + \
+                str(update_tolerance)
+            raise Exception(err_msg)
+        self.update_tolerance = update_tolerance
+
+        self.mass = self._get_lumped_mass(self.M)
+        # highest mode of the previous model, start vector for the update
+        self.highest_mode = None
+        self.highest_eig_value = None
+        self.n_eigenvalue_solves = 0
+        self._init_critical_time_step()
+
+        # force from a previous time step (initial force)
+        self.f0 = self._dot(self.M, self.a0) + self._dot(self.B, self.v0) + self._dot(self.K, self.u0)
+        self.f1 = self.f0
+
+        # velocity at the last half step
+        self.v_half = self.v0
+
+        self._print_time_integration_setup()
+
+    def _print_time_integration_setup(self):
+        logger.info("Printing central difference integration scheme setup:")
+        logger.info("dt: %s", self.dt)
+        logger.info("critical dt: %s", self.critical_dt)
+        logger.info("substeps per dt: %s", self.n_substeps)
+        logger.info(" ")
+
+    def _get_lumped_mass(self, M):
+        if not matrix_utilities.is_diagonal(M):
+            err_msg = "The CentralDifference scheme requires a diagonal mass matrix\n"
+            err_msg += "Use \"mass_formulation\": \"lumped\" for the model"
+            raise Exception(err_msg)
+        return matrix_utilities.get_diagonal(M)
+
+    def _dot(self, matrix, x):
+        if matrix.ndim == 1:
+            # system: in vector (from diagonal matrix) or scalar form
+            return matrix * x
+        return matrix.dot(x)
+
+    def _init_critical_time_step(self):
+        eig_value, self.highest_mode = matrix_utilities.get_highest_eigenpair(
+            self.K, self.mass, self.highest_mode)
+        self.highest_eig_value = eig_value
+        self.n_eigenvalue_solves += 1
+        omega_max = np.sqrt(max(eig_value, 0.0))
+        if omega_max == 0.0:
+            self.critical_dt = np.inf
+        else:
+            # damping ratio of the highest mode
+            zeta = self.highest_mode.dot(self._dot(self.B, self.highest_mode)) / \
+                (2.0 * omega_max * np.sum(self.mass * self.highest_mode ** 2))
+            self.critical_dt = 2.0 / omega_max * (np.sqrt(1.0 + zeta ** 2) - zeta)
+
+        self._init_coefficients()
+
+    def _is_highest_mode_changed(self):
+        # Rayleigh quotient of the previous highest mode with the new matrices
+        mode = self.highest_mode
+        estimate = mode.dot(self._dot(self.K, mode)) / np.sum(self.mass * mode ** 2)
+        return abs(estimate - self.highest_eig_value) > self.update_tolerance * abs(self.highest_eig_value)
+
+    def _get_acceleration(self, u, v_half, f):
+        # elementwise division by the diagonal mass, also for several load cases as columns
+        return ((f - self._dot(self.K, u) - self._dot(self.B, v_half)).T / self.mass).T
+
+    def _init_coefficients(self):
+        # equal substeps below the stable time step
+        self.n_substeps = max(1, int(np.ceil(self.dt / (self.safety_factor * self.critical_dt))))
+        self.h = self.dt / self.n_substeps
+
+    def predict_velocity(self, u1):
+        return self.v_half + 0.5 * self.h * self._get_acceleration(u1, self.v_half, self.f1)
+
+    def predict_acceleration(self, v1):
+        # the damping force of the explicit step uses the half step velocity
+        return self._get_acceleration(self.u1, self.v_half, self.f1)
+
+    def solve_single_step(self, f1):
+        u, v, a = self.un1, self.vn1, self.an1
+        for substep in range(1, self.n_substeps + 1):
+            # force linearly interpolated within the time step
+            f = self.f0 + (f1 - self.f0) * (substep / self.n_substeps)
+            self.v_half = v + 0.5 * self.h * a
+            u = u + self.h * self.v_half
+            a = self._get_acceleration(u, self.v_half, f)
+            v = self.v_half + 0.5 * self.h * a
+
+        self.u1 = u
+        self.v1 = v
+        self.a1 = a
+        self.f1 = f1
+
+    def update(self):
+        self.un1 = self.u1
+        self.vn1 = self.v1
+        self.an1 = self.a1
+        self.f0 = self.f1
+
+    def update_comp_model(self, new_comp_model):
+        super().update_comp_model(new_comp_model)
+        self.mass = self._get_lumped_mass(self.M)
+        # e.g. nonlinear elements: the highest frequency changes with the stiffness,
+        # the previous highest mode is a close start vector
+        # NOTE: small changes are covered by the safety factor, no eigenvalue solve in each step
+        if self._is_highest_mode_changed():
+            self._init_critical_time_step()
@@ -1,6 +1,6 @@
 import numpy as np
 
-from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme
+from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme, logger
 
 
 class Euler12(TimeIntegrationScheme):
@@ -26,9 +26,9 @@ class Euler12(TimeIntegrationScheme):
         self._print_time_integration_setup()
 
     def _print_time_integration_setup(self):
-        print("Printing Euler 1st and 2nd order method integration scheme setup:")
-        print("dt: ", self.dt)
-        print(" ")
+        logger.info("Printing Euler 1st and 2nd order method integration scheme setup:")
+        logger.info("dt: %s", self.dt)
+        logger.info(" ")
 
     def predict_velocity(self, u1):
         v1 = (u1 - self. un2) / 2 / self.dt
@@ -38,18 +38,19 @@ class Euler12(TimeIntegrationScheme):
         a1 = (v1 - self. vn2) / 2 / self.dt
         return a1
 
-    def solve_single_step(self, f1):
-        # LHS needs to be updated in case of non-linear elements
-        LHS = self.M + np.dot(self.B, self.dt / 2)
+    def get_lhs(self):
+        return self.M + self.B * (self.dt / 2)
 
+    def solve_single_step(self, f1):
         if self.M.ndim == 2:
             # system: in matrix form
+            # NOTE: M, B, K are symmetric, so u * A == A * u
             RHS = f1 * self.dt ** 2 + \
-                np.dot(self.un1, (2 * self.M - self.K * self.dt ** 2))
-            RHS += np.dot(self.un2, (-self.M + self.B * self.dt/2))
+                (2 * self.M - self.K * self.dt ** 2).dot(self.un1)
+            RHS += (-self.M + self.B * self.dt/2).dot(self.un2)
 
             # main solve
-            self.u1 = np.linalg.solve(LHS, RHS)
+            self.u1 = self.solve_lhs(RHS)
 
         elif self.M.ndim == 1:
             # system: in vector (from diagonal matrix) or scalar form
@@ -58,7 +59,7 @@ class Euler12(TimeIntegrationScheme):
             RHS += self.un2 * (-self.M + self.B * self.dt/2)
 
             # main solve
-            self.u1 = RHS/LHS
+            self.u1 = self.solve_lhs(RHS)
 
         else:
             raise Exception('Dimension of system parameters is Euler12 is wrong')
@@ -0,0 +1,191 @@
+import numpy as np
+from scipy import linalg
+
+import source.auxiliary.matrix_utilities as matrix_utilities
+from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme, logger
+
+
+def get_piecewise_exact_operators(m, b, k, dt):
+    '''
+    Exact step operators for decoupled single dof systems m * a + b * v + k * u = f
+    with the load linearly interpolated within the time step (Nigam-Jennings)
+
+    Returns A with shape (n_modes, 2, 2), G0 and G1 with shape (n_modes, 2) such that
+    [u, v]_n+1 = A * [u, v]_n + G0 * f_n + G1 * f_n+1
+
+    Evaluated as the matrix exponential of the system augmented with the
+    load and its increment, valid for any damping ratio
+    '''
+    m, b, k = np.broadcast_arrays(*[np.atleast_1d(np.asarray(val, dtype=float))
+                                    for val in [m, b, k]])
+    n_modes = len(m)
+    # state [u, v, f, df] with f' = df / dt
+    system = np.zeros((n_modes, 4, 4))
+    system[:, 0, 1] = dt
+    system[:, 1, 0] = -k / m * dt
+    system[:, 1, 1] = -b / m * dt
+    system[:, 1, 2] = dt / m
+    system[:, 2, 3] = 1.0
+    phi = linalg.expm(system)
+    return phi[:, :2, :2], phi[:, :2, 2] - phi[:, :2, 3], phi[:, :2, 3]
+
+
+def get_exact_step_operators(m, b, k, dt):
+    '''
+    Coupled counterpart of get_piecewise_exact_operators for the state x = [u, v]
+    x_n+1 = Phi * x_n + Gamma0 * f_n + Gamma1 * f_n+1
+
+    NOTE: dense operators of twice the system size, meant for modal or small systems
+    '''
+    n_dofs = m.shape[0]
+    m_inv_system = linalg.solve(m, np.hstack((k, b, np.eye(n_dofs))))
+
+    # state [x, f, df] with f' = df / dt
+    system = np.zeros((4 * n_dofs, 4 * n_dofs))
+    system[:n_dofs, n_dofs:2 * n_dofs] = dt * np.eye(n_dofs)
+    system[n_dofs:2 * n_dofs, :3 * n_dofs] = -dt * m_inv_system
+    system[n_dofs:2 * n_dofs, 2 * n_dofs:3 * n_dofs] *= -1.0
+    system[2 * n_dofs:3 * n_dofs, 3 * n_dofs:] = np.eye(n_dofs)
+    phi = linalg.expm(system)
+
+    state = slice(0, 2 * n_dofs)
+    load = slice(2 * n_dofs, 3 * n_dofs)
+    load_increment = slice(3 * n_dofs, 4 * n_dofs)
+    return phi[state, state], phi[state, load] - phi[state, load_increment], phi[state, load_increment]
+
+
+class ExactStateSpace(TimeIntegrationScheme):
+    """
+    Exact integration of the linear time invariant system in state space form
+    for a load linearly interpolated within the time step
+
+    The step operators are precomputed once for the constant time step, each step
+    is a single fused matrix-vector product
+    In vector (from diagonal matrix) form the modes are advanced independently
+
+    block_size > 1 advances blocks of steps: the load contributions and the
+    accelerations of a block are evaluated as matrix-matrix products
+    """
+
+    def __init__(self, dt, comp_model, initial_conditions, block_size=1):
+        # introducing and initializing properties and coefficients
+        # construct an object self with the input arguments dt, M, B, K,
+        # u0, v0, a0
+
+        super().__init__(dt, comp_model, initial_conditions)
+
+        if block_size < 1:
+            err_msg = "The block size has to be >= 1, provided: " + str(block_size)
+            raise Exception(err_msg)
+        self.block_size = block_size
+
+        self._init_operators()
+
+        # force from a previous time step (initial force)
+        self.f0 = self.M.dot(self.a0) + self.B.dot(self.v0) + self.K.dot(self.u0) \
+            if self.M.ndim == 2 else self.M * self.a0 + self.B * self.v0 + self.K * self.u0
+        self.f1 = self.f0
+
+        self._print_time_integration_setup()
+
+    def _init_operators(self):
+        if self.M.ndim == 1:
+            # operators of shape (n_modes, 2, 4) acting on [u, v, f_n, f_n+1]
+            phi, gamma0, gamma1 = get_piecewise_exact_operators(self.M, self.B, self.K, self.dt)
+            self.step_operator = np.concatenate((phi, gamma0[:, :, None], gamma1[:, :, None]), axis=2)
+        else:
+            if matrix_utilities.is_sparse(self.M):
+                m, b, k = self.M.toarray(), self.B.toarray(), self.K.toarray()
+            else:
+                m, b, k = self.M, self.B, self.K
+            # operator acting on [u, v, f_n, f_n+1]
+            phi, gamma0, gamma1 = get_exact_step_operators(m, b, k, self.dt)
+            self.step_operator = np.hstack((phi, gamma0, gamma1))
+
+    def _print_time_integration_setup(self):
+        logger.info("Printing exact state space integration scheme setup:")
+        logger.info("dt: %s", self.dt)
+        logger.info("block size: %s", self.block_size)
+        logger.info(" ")
+
+    def get_lhs(self):
+        # the acceleration follows from the equation of motion
+        return self.M
+
+    def predict_velocity(self, u1):
+        # velocity is part of the state
+        return self.v1
+
+    def predict_acceleration(self, v1):
+        if self.M.ndim == 1:
+            return (self.f1 - self.B * v1 - self.K * self.u1) / self.M
+        return self.solve_lhs(self.f1 - self.B.dot(v1) - self.K.dot(self.u1))
+
+    def solve_single_step(self, f1):
+        if self.M.ndim == 1:
+            # system: in vector (from diagonal matrix) or scalar form
+            state = np.stack((self.un1, self.vn1, self.f0, f1), axis=1)
+            new_state = np.einsum('nij,nj->ni', self.step_operator, state)
+            self.u1, self.v1 = new_state[:, 0], new_state[:, 1]
+        elif self.M.ndim == 2:
+            # system: in matrix form
+            new_state = self.step_operator.dot(np.concatenate((self.un1, self.vn1, self.f0, f1)))
+            self.u1, self.v1 = np.split(new_state, 2)
+        else:
+            raise Exception('Dimension of system parameters is ExactStateSpace is wrong')
+
+        self.f1 = f1
+        self.a1 = self.predict_acceleration(self.v1)
+
+    def solve_block(self, forces):
+        '''
+        Advance len(forces[0]) steps starting from the last updated step
+        returns the displacement, velocity and acceleration histories of the block
+        and leaves the scheme updated to the last step of the block
+        '''
+        n_steps = forces.shape[1]
+        previous_forces = np.hstack((self.f0[:, None], forces[:, :-1]))
+        n_dofs = len(self.un1)
+
+        if self.M.ndim == 1:
+            # load contributions to the state of all steps
+            load = self.step_operator[:, :, 2, None] * previous_forces[:, None, :] + \
+                self.step_operator[:, :, 3, None] * forces[:, None, :]
+            phi = self.step_operator[:, :, :2]
+            states = np.empty((n_dofs, 2, n_steps))
+            state = np.stack((self.un1, self.vn1), axis=1)
+            for step in range(n_steps):
+                state = np.einsum('nij,nj->ni', phi, state) + load[:, :, step]
+                states[:, :, step] = state
+            displacement, velocity = states[:, 0, :], states[:, 1, :]
+            acceleration = (forces - self.B[:, None] * velocity -
+                            self.K[:, None] * displacement) / self.M[:, None]
+        else:
+            load = self.step_operator[:, 2 * n_dofs:3 * n_dofs].dot(previous_forces) + \
+                self.step_operator[:, 3 * n_dofs:].dot(forces)
+            phi = self.step_operator[:, :2 * n_dofs]
+            states = np.empty((2 * n_dofs, n_steps))
+            state = np.concatenate((self.un1, self.vn1))
+            for step in range(n_steps):
+                state = phi.dot(state) + load[:, step]
+                states[:, step] = state
+            displacement, velocity = states[:n_dofs], states[n_dofs:]
+            acceleration = self.solve_lhs(forces - self.B.dot(velocity) - self.K.dot(displacement))
+
+        self.u1, self.v1, self.a1 = displacement[:, -1], velocity[:, -1], acceleration[:, -1]
+        self.f1 = forces[:, -1]
+        self.update()
+        return displacement, velocity, acceleration
+
+    def update_comp_model(self, new_comp_model):
+        super().update_comp_model(new_comp_model)
+        self._init_operators()
+
+    def update(self):
+        # update displacement, velocity and acceleration
+        self.un1 = self.u1
+        self.vn1 = self.v1
+        self.an1 = self.a1
+
+        # update the force
+        self.f0 = self.f1
@@ -1,6 +1,6 @@
 import numpy as np
 
-from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme
+from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme, logger
 
 
 class ForwardEuler1(TimeIntegrationScheme):
@@ -25,9 +25,9 @@ class ForwardEuler1(TimeIntegrationScheme):
         self._print_time_integration_setup()
 
     def _print_time_integration_setup(self):
-        print("Printing (Explicit) Forward Euler 1 st order approximation integration scheme setup:")
-        print("dt: ", self.dt)
-        print(" ")
+        logger.info("Printing (Explicit) Forward Euler 1 st order approximation integration scheme setup:")
+        logger.info("dt: %s", self.dt)
+        logger.info(" ")
 
     def predict_velocity(self, u1):
         v1 = (u1 - self.un1) / self.dt
@@ -37,21 +37,21 @@ class ForwardEuler1(TimeIntegrationScheme):
         a1 = (v1 - self.vn1) / self.dt
         return a1
 
-    def solve_single_step(self, f1):
-        # LHS needs to be updated in case of non-linear elements
-        LHS = self.M
+    def get_lhs(self):
+        return self.M
 
+    def solve_single_step(self, f1):
         if self.M.ndim == 2:
             # system: in matrix form
-            RHS = -self.dt * np.dot(self.B, self.un1) + \
-                self.dt * np.dot(self.B, self.un2)
+            RHS = -self.dt * self.B.dot(self.un1) + \
+                self.dt * self.B.dot(self.un2)
             RHS += -self.dt ** 2 * \
-                np.dot(self.K, self.un2) + \
-                np.dot(self.M, (2 * self.un1 - self.un2))
+                self.K.dot(self.un2) + \
+                self.M.dot(2 * self.un1 - self.un2)
             RHS += self.dt ** 2 * f1
 
             # main solve
-            self.u1 = np.linalg.solve(LHS, RHS)
+            self.u1 = self.solve_lhs(RHS)
 
         elif self.M.ndim == 1:
             # system: in vector (from diagonal matrix) or scalar form
@@ -63,7 +63,7 @@ class ForwardEuler1(TimeIntegrationScheme):
             RHS += self.dt ** 2 * f1
 
             # main solve
-            self.u1 = RHS/LHS
+            self.u1 = self.solve_lhs(RHS)
 
         else:
             raise Exception('Dimension of system parameters is ForwardEuler1 is wrong')
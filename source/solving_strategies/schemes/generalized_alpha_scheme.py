@@ -1,6 +1,6 @@
 import numpy as np
 
-from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme
+from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme, logger
 
 
 class GeneralizedAlphaScheme(TimeIntegrationScheme):
@@ -12,11 +12,40 @@ class GeneralizedAlphaScheme(TimeIntegrationScheme):
 
         super().__init__(dt, comp_model, initial_conditions)
 
+        self.p_inf = p_inf
+        self._init_coefficients()
+
+        # structure
+        # initial displacement, velocity and acceleration
+        self.u0 = initial_conditions[0]
+        self.v0 = initial_conditions[1]
+        self.a0 = initial_conditions[2]
+        # initial displacement, velocity and acceleration
+        self.u1 = self.u0
+        self.v1 = self.v0
+        self.a1 = self.a0
+
+        # force from a previous time step (initial force)
+        if self.M.ndim == 2:
+            logger.debug('System: in matrix form')
+            self.f0 = self.M.dot(self.a0) + self.B.dot(self.v0) + self.K.dot(self.u0)
+            self.f1 = self.M.dot(self.a1) + self.B.dot(self.v1) + self.K.dot(self.u1)
+        
+        elif self.M.ndim == 1:
+            logger.debug('System: in vector (from diagonal matrix) or scalar form')
+            self.f0 = self.M * self.a0 + self.B * self.v0 + self.K * self.u0
+            self.f1 = self.M * self.a1 + self.B * self.v1 + self.K * self.u1
+
+        else:
+            raise Exception('Dimension of system parameters is GeneralizedAlphaScheme is wrong')
+        
+        self._print_time_integration_setup()
+
+    def _init_coefficients(self):
         # generalized alpha parameters (to ensure unconditional stability, 2nd order accuracy)
-        self.alphaM = (2.0 * p_inf - 1.0) / (p_inf + 1.0)
-        print("alphaM: ", self.alphaM)
+        self.alphaM = (2.0 * self.p_inf - 1.0) / (self.p_inf + 1.0)
 
-        self.alphaF = p_inf / (p_inf + 1.0)
+        self.alphaF = self.p_inf / (self.p_inf + 1.0)
         self.beta = 0.25 * (1 - self.alphaM + self.alphaF)**2
         self.gamma = 0.5 - self.alphaM + self.alphaF
 
@@ -49,42 +78,17 @@ class GeneralizedAlphaScheme(TimeIntegrationScheme):
         self.a2a = -1.0 / (self.beta * self.dt)
         self.a3a = 1.0 - 1.0 / (2.0 * self.beta)
 
-        # structure
-        # initial displacement, velocity and acceleration
-        self.u0 = initial_conditions[0]
-        self.v0 = initial_conditions[1]
-        self.a0 = initial_conditions[2]
-        # initial displacement, velocity and acceleration
-        self.u1 = self.u0
-        self.v1 = self.v0
-        self.a1 = self.a0
-
-        # force from a previous time step (initial force)
-        if self.M.ndim == 2:
-            print('System: in matrix form')
-            self.f0 = np.dot(self.M, self.a0) + np.dot(self.B,
-                                                    self.v0) + np.dot(self.K, self.u0)
-            self.f1 = np.dot(self.M, self.a1) + np.dot(self.B,
-                                                    self.v1) + np.dot(self.K, self.u1)
-        
-        elif self.M.ndim == 1:
-            print('System: in vector (from diagonal matrix) or scalar form')
-            self.f0 = self.M * self.a0 + self.B * self.v0 + self.K * self.u0
-            self.f1 = self.M * self.a1 + self.B * self.v1 + self.K * self.u1
-
-        else:
-            raise Exception('Dimension of system parameters is GeneralizedAlphaScheme is wrong')
-        
-        self._print_time_integration_setup()
+        # local error estimate
+        self.error_factor = (self.beta - 1.0 / 6.0) * self.dt**2
 
     def _print_time_integration_setup(self):
-        print("Printing Generalized Alpha Method integration scheme setup:")
-        print("dt: ", self.dt)
-        print("alphaM: ", self.alphaM)
-        print("alphaF: ", self.alphaF)
-        print("gamma: ", self.gamma)
-        print("beta: ", self.beta)
-        print(" ")
+        logger.info("Printing Generalized Alpha Method integration scheme setup:")
+        logger.info("dt: %s", self.dt)
+        logger.info("alphaM: %s", self.alphaM)
+        logger.info("alphaF: %s", self.alphaF)
+        logger.info("gamma: %s", self.gamma)
+        logger.info("beta: %s", self.beta)
+        logger.info(" ")
 
     def predict_velocity(self, u1):
         v1 = self.a1v * (u1 - self.un1) + self.a2v * \
@@ -97,33 +101,33 @@ class GeneralizedAlphaScheme(TimeIntegrationScheme):
             self.vn1 + self.a3a * self.an1
         return a1
 
-    def solve_single_step(self, f1):
-        # LHS needs to be updated in case of non-linear elements
-        LHS = self.a1h * self.M + self.a2h * self.B + self.a3h * self.K
+    def get_lhs(self):
+        return self.a1h * self.M + self.a2h * self.B + self.a3h * self.K
 
+    def solve_single_step(self, f1):
         F = (1.0 - self.alphaF) * f1 + self.alphaF * self.f0
 
         if self.M.ndim == 2:
             # system: in matrix form
-            RHS = np.dot(self.M, (self.a1m * self.un1 +
-                                self.a2m * self.vn1 + self.a3m * self.an1))
-            RHS += np.dot(self.B, (self.a1b * self.un1 +
-                                self.a2b * self.v0 + self.a3b * self.an1))
-            RHS += np.dot(self.a1k * self.K, self.un1) + F
+            RHS = self.M.dot(self.a1m * self.un1 +
+                             self.a2m * self.vn1 + self.a3m * self.an1)
+            RHS += self.B.dot(self.a1b * self.un1 +
+                              self.a2b * self.vn1 + self.a3b * self.an1)
+            RHS += self.a1k * self.K.dot(self.un1) + F
 
             # main solve
-            self.u1 = np.linalg.solve(LHS, RHS)
+            self.u1 = self.solve_lhs(RHS)
 
         elif self.M.ndim == 1:
             # system: in vector (from diagonal matrix) or scalar form
             RHS = self.M * (self.a1m * self.un1 +
                                 self.a2m * self.vn1 + self.a3m * self.an1)
             RHS += self.B * (self.a1b * self.un1 +
-                                self.a2b * self.v0 + self.a3b * self.an1)
+                                self.a2b * self.vn1 + self.a3b * self.an1)
             RHS += (self.a1k * self.K) * self.un1 + F
 
             # main solve
-            self.u1 = RHS/LHS
+            self.u1 = self.solve_lhs(RHS)
 
         else:
             raise Exception('Dimension of system parameters is GeneralizedAlphaScheme is wrong')
@@ -133,6 +137,10 @@ class GeneralizedAlphaScheme(TimeIntegrationScheme):
         self.a1 = self.predict_acceleration(self.v1)
         self.f1 = f1
 
+    def get_error_estimate(self):
+        # predictor-corrector type estimate of the Newmark family
+        return self.error_factor * (self.a1 - self.an1)
+
     def update(self):
         # update displacement, velocity and acceleration
         self.un1 = self.u1
@@ -1,6 +1,6 @@
 import numpy as np
 
-from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme
+from source.solving_strategies.schemes.time_integration_scheme import TimeIntegrationScheme, logger
 
 
 class RungeKutta4(TimeIntegrationScheme):
@@ -16,21 +16,16 @@ class RungeKutta4(TimeIntegrationScheme):
 
         super().__init__(dt, comp_model, initial_conditions)
 
-        # inverse matrix
-        self.InvM = np.linalg.inv(self.M)
-
         # force from a previous time step (initial force)
-        self.f0 = np.dot(self.M, self.a0) + np.dot(self.B,
-                                                   self.v0) + np.dot(self.K, self.u0)
-        self.f1 = np.dot(self.M, self.a1) + np.dot(self.B,
-                                                   self.v1) + np.dot(self.K, self.u1)
+        self.f0 = self.M.dot(self.a0) + self.B.dot(self.v0) + self.K.dot(self.u0)
+        self.f1 = self.M.dot(self.a1) + self.B.dot(self.v1) + self.K.dot(self.u1)
 
         self._print_time_integration_setup()
 
     def _print_time_integration_setup(self):
-        print("Printing Runge Kutta 4th order approximation integration scheme setup:")
-        print("dt: ", self.dt)
-        print(" ")
+        logger.info("Printing Runge Kutta 4th order approximation integration scheme setup:")
+        logger.info("dt: %s", self.dt)
+        logger.info(" ")
 
     def predict_velocity(self, u1):
         v1 = self.v1 + (self.l0 + 2*(self.l1 + self.l2) + self.l3)/6.0
@@ -40,6 +35,10 @@ class RungeKutta4(TimeIntegrationScheme):
         a1 = (v1 - self.vn1) / self.dt
         return a1
 
+    def get_lhs(self):
+        # the mass matrix is factorized once - replaces the explicit inverse
+        return self.M
+
     def solve_single_step(self, f1):
         # TODO: needs check for system size, LHS, RHS formulation
 
@@ -48,18 +47,18 @@ class RungeKutta4(TimeIntegrationScheme):
 
         self.k0 = self.dt * self.v1
         self.l0 = self.dt * \
-            np.dot(self.InvM, (-np.dot(self.B, self.v1) -
-                               np.dot(self.K, self.u1) + self.f1))
+            self.solve_lhs(-self.B.dot(self.v1) -
+                           self.K.dot(self.u1) + self.f1)
 
         self.k1 = self.dt * (0.5*self.l0 + self.v1)
-        self.l1 = self.dt * np.dot(self.InvM, (-np.dot(self.B, (0.5*self.l0 + self.v1))
-                                               - np.dot(self.K, (0.5*self.k0 + self.u1)) + f_mid))
+        self.l1 = self.dt * self.solve_lhs(-self.B.dot(0.5*self.l0 + self.v1)
+                                           - self.K.dot(0.5*self.k0 + self.u1) + f_mid)
         self.k2 = self.dt * (0.5*self.l1 + self.v1)
-        self.l2 = self.dt * np.dot(self.InvM, (-np.dot(self.B, (0.5*self.l1 + self.v1))
-                                               - np.dot(self.K, (0.5*self.k1 + self.u1)) + f_mid))
+        self.l2 = self.dt * self.solve_lhs(-self.B.dot(0.5*self.l1 + self.v1)
+                                           - self.K.dot(0.5*self.k1 + self.u1) + f_mid)
         self.k3 = self.dt * (self.l2 + self.v1)
-        self.l3 = self.dt * np.dot(self.InvM, (-np.dot(self.B, (self.l2 + self.v1))
-                                               - np.dot(self.K, (self.k2 + self.u1)) + f1))
+        self.l3 = self.dt * self.solve_lhs(-self.B.dot(self.l2 + self.v1)
+                                           - self.K.dot(self.k2 + self.u1) + f1)
 
         # update self.u1,v1,a1
         self.u1 = self.u1 + (self.k0 + 2*(self.k1 + self.k2) + self.k3)/6.0
@@ -70,7 +69,11 @@ class RungeKutta4(TimeIntegrationScheme):
         self.f1 = f1
 
         if np.isnan(np.min(self.u1)):
-            print("NaN found in displacement!")
+            logger.warning("NaN found in displacement!")
+
+    def get_error_estimate(self):
+        # embedded midpoint (2nd order) solution from the second stage
+        return self.u1 - (self.un1 + self.k1)
 
     def update(self):
         # update previous steps
@@ -1,5 +1,10 @@
 import numpy as np
 
+import source.auxiliary.matrix_utilities as matrix_utilities
+from source.auxiliary.logger import get_logger
+
+logger = get_logger(__name__)
+
 
 class TimeIntegrationScheme(object):
     def __init__(self, dt, comp_model, initial_conditions):
@@ -30,6 +35,10 @@ class TimeIntegrationScheme(object):
         self.f0 = None
         self.f1 = None
 
+        # factorization of the effective (LHS) matrix, computed once on the first solve
+        # and only refreshed when the computational model changes
+        self._lhs_solver = None
+
     def _print_time_integration_setup(self):
         pass
 
@@ -42,9 +51,53 @@ class TimeIntegrationScheme(object):
     def predict_acceleration(self, v1):
         pass
 
+    def get_lhs(self):
+        '''
+        Effective matrix of the scheme - constant for a given computational model and time step
+        '''
+        pass
+
+    def solve_lhs(self, rhs):
+        '''
+        Solve LHS * u = rhs with the cached factorization of the LHS,
+        each step is a forward and backward substitution
+        '''
+        if self._lhs_solver is None:
+            self._lhs_solver = matrix_utilities.factorized(self.get_lhs())
+        return self._lhs_solver(rhs)
+
     def solve_single_step(self, f1):
         pass
 
+    def set_time_step(self, dt):
+        '''
+        Change the time step - e.g. for the adaptive time stepping,
+        the coefficients and the LHS follow
+        '''
+        if dt == self.dt:
+            return
+        self.dt = dt
+        self._init_coefficients()
+        self._lhs_solver = None
+
+    def _init_coefficients(self):
+        pass
+
+    def get_error_estimate(self):
+        '''
+        Estimate of the local error of the displacement of the last solved step
+        '''
+        err_msg = "No local error estimate available for " + type(self).__name__
+        raise Exception(err_msg)
+
+    def get_state(self):
+        # the arrays are replaced, not modified in place, by the steps
+        return dict(self.__dict__)
+
+    def set_state(self, state):
+        # back to a saved state - e.g. for a rejected step
+        self.__dict__.update(state)
+
     def update(self):
         pass
 
@@ -57,14 +110,16 @@ class TimeIntegrationScheme(object):
         self.M = new_comp_model[0]
         self.B = new_comp_model[1]
         self.K = new_comp_model[2]
+        # LHS has changed - e.g. nonlinear elements
+        self._lhs_solver = None
 
     def print_values_at_current_step(self, n):
-        print("Printing values at step no: ", n, " (+1)")
-        print("u0: ", self.u1)
-        print("v0: ", self.v1)
-        print("a0: ", self.a1)
-        print("f0: ", self.f1)
-        print(" ")
+        logger.debug("Printing values at step no: %s (+1)", n)
+        logger.debug("u0: %s", self.u1)
+        logger.debug("v0: %s", self.v1)
+        logger.debug("a0: %s", self.a1)
+        logger.debug("f0: %s", self.f1)
+        logger.debug(" ")
 
     def get_displacement(self):
         return self.u1
@@ -0,0 +1,148 @@
+import numpy as np
+
+from source.solving_strategies.strategies.linear_solver import LinearSolver
+from source.solving_strategies.strategies.solver import logger
+
+ADAPTIVE_SCHEMES = ["GenAlpha", "BDF2", "RungeKutta4"]
+
+# default settings of the step size control
+DEFAULT_ADAPTIVE_SETTINGS = {
+    "relative_tolerance": 1e-4,
+    "absolute_tolerance": 1e-10,
+    "min_step": 0.0,
+    "max_step": np.inf,
+    "safety_factor": 0.9,
+    "max_increase": 2.0,
+    "min_decrease": 0.2,
+    # the step is kept for smaller increases, avoids refactorizing the LHS
+    "keep_step_below": 1.5}
+
+
+class AdaptiveLinearSolver(LinearSolver):
+    '''
+    Linear solver with adaptive time steps controlled by the local error estimate of the scheme
+
+    The force is linearly interpolated between its samples on the output grid,
+    the results are resampled to the output grid: cubic Hermite interpolation
+    of the displacement and velocity between the accepted steps, linear for the acceleration
+    NOTE: as for the fixed step, index 0 of the output grid is one (output) step
+    after the initial conditions
+    '''
+
+    def __init__(self,
+                 array_time, time_integration_scheme, dt,
+                 comp_model,
+                 initial_conditions,
+                 force,
+                 structure_model,
+                 adaptive_settings=None,
+                 result_store=None,
+                 recorder=None):
+        if time_integration_scheme not in ADAPTIVE_SCHEMES:
+            err_msg = "The adaptive time stepping is not available for the time integration scheme \""
+            err_msg += time_integration_scheme + "\"\n"
+            err_msg += "Choose one of: \"" + "\", \"".join(ADAPTIVE_SCHEMES) + "\""
+            raise Exception(err_msg)
+
+        self.adaptive_settings = dict(DEFAULT_ADAPTIVE_SETTINGS)
+        if adaptive_settings is not None:
+            for key, val in adaptive_settings.items():
+                if key not in DEFAULT_ADAPTIVE_SETTINGS:
+                    err_msg = "The adaptive setting \"" + key + "\" is not available\n"
+                    err_msg += "Choose one of: \"" + "\", \"".join(DEFAULT_ADAPTIVE_SETTINGS.keys()) + "\""
+                    raise Exception(err_msg)
+                self.adaptive_settings[key] = val
+
+        super().__init__(array_time, time_integration_scheme, dt,
+                         comp_model, initial_conditions, force, structure_model,
+                         result_store=result_store, recorder=recorder)
+
+        # the initial state is one output step before the output grid
+        u0, v0, a0 = initial_conditions[0], initial_conditions[1], initial_conditions[2]
+        f0 = self.M.dot(a0) + self.B.dot(v0) + self.K.dot(u0) if self.M.ndim == 2 \
+            else self.M * a0 + self.B * v0 + self.K * u0
+        self.force_times = np.concatenate(([self.array_time[0] - self.dt], self.array_time))
+        self.initial_force = f0
+
+        self.n_accepted = 0
+        self.n_rejected = 0
+        self.accepted_steps = []
+
+    def _print_solver_info(self):
+        logger.info("Adaptive Linear Solver")
+
+    def get_force(self, time):
+        # linear interpolation between the samples
+        idx = min(max(np.searchsorted(self.force_times, time) - 1, 0), len(self.force_times) - 2)
+        theta = (time - self.force_times[idx]) / (self.force_times[idx + 1] - self.force_times[idx])
+        f_start = self.initial_force if idx == 0 else self.force[..., idx - 1]
+        f_end = self.force[..., idx]
+        return (1.0 - theta) * f_start + theta * f_end
+
+    def _get_error_norm(self):
+        # maximum norm of the error relative to the magnitude of the displacement
+        scale = self.adaptive_settings["absolute_tolerance"] + \
+            self.adaptive_settings["relative_tolerance"] * \
+            max(np.max(abs(self.scheme.get_displacement())), np.max(abs(self.scheme.get_old_displacement())))
+        return np.max(abs(self.scheme.get_error_estimate())) / scale
+
+    def _record_output(self, output_idx, t0, t1, state0, state1):
+        # resampling the accepted step to the output times in (t0, t1]
+        u0, v0, a0 = state0
+        u1, v1, a1 = state1
+        h = t1 - t0
+        while output_idx < len(self.array_time) and self.array_time[output_idx] <= t1 + 1e-9 * self.dt:
+            theta = min((self.array_time[output_idx] - t0) / h, 1.0)
+            # cubic Hermite basis
+            h00 = 2 * theta**3 - 3 * theta**2 + 1
+            h10 = theta**3 - 2 * theta**2 + theta
+            h01 = -2 * theta**3 + 3 * theta**2
+            h11 = theta**3 - theta**2
+            self.step = output_idx
+            self.progress_logger.log(output_idx, self.array_time[output_idx])
+            self.record_step(output_idx,
+                             h00 * u0 + h10 * h * v0 + h01 * u1 + h11 * h * v1,
+                             h00 * v0 + h10 * h * a0 + h01 * v1 + h11 * h * a1,
+                             (1.0 - theta) * a0 + theta * a1)
+            output_idx += 1
+        return output_idx
+
+    def solve(self):
+        settings = self.adaptive_settings
+        time = self.force_times[0]
+        end_time = self.array_time[-1]
+        h = min(self.dt, settings["max_step"])
+        output_idx = 0
+
+        state = (self.scheme.get_displacement(), self.scheme.get_velocity(), self.scheme.get_acceleration())
+        while output_idx < len(self.array_time):
+            # not stepping over the end time
+            h = min(h, end_time - time)
+            saved_state = self.scheme.get_state()
+            self.scheme.set_time_step(h)
+            self.scheme.solve_single_step(self.get_force(time + h))
+
+            error_norm = self._get_error_norm()
+            accepted = error_norm <= 1.0 or h <= settings["min_step"]
+            if accepted:
+                new_state = (self.scheme.get_displacement(), self.scheme.get_velocity(),
+                             self.scheme.get_acceleration())
+                output_idx = self._record_output(output_idx, time, time + h, state, new_state)
+                self.scheme.update()
+                state = new_state
+                time += h
+                self.n_accepted += 1
+                self.accepted_steps.append(h)
+            else:
+                self.scheme.set_state(saved_state)
+                self.n_rejected += 1
+
+            # step size control for a local error of the order h^3
+            factor = settings["safety_factor"] * (error_norm + 1e-16) ** (-1.0 / 3.0)
+            factor = min(settings["max_increase"], max(settings["min_decrease"], factor))
+            if not accepted or factor > settings["keep_step_below"] or factor < 1.0:
+                h = min(max(h * factor, settings["min_step"]), settings["max_step"])
+
+        logger.info("Adaptive time stepping: %d accepted and %d rejected steps", self.n_accepted, self.n_rejected)
+        if self.n_accepted > 0:
+            logger.info("step size: min %s, max %s", min(self.accepted_steps), max(self.accepted_steps))
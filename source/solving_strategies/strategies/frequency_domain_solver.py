@@ -0,0 +1,93 @@
+import numpy as np
+from scipy import fft
+
+import source.auxiliary.matrix_utilities as matrix_utilities
+from source.solving_strategies.strategies.solver import Solver, logger
+
+# NOTE: upper limit for the number of entries of the dense system matrices
+# solved together in one batch of frequencies
+MAX_BATCH_ENTRIES = 2 ** 22
+
+
+class FrequencyDomainSolver(Solver):
+    '''
+    Linear solver in the frequency domain
+
+    The force history is transformed by an FFT, multiplied with the receptance
+    H(w) = (K - w^2 * M + i * w * B)^-1 and transformed back.
+    In vector (from diagonal matrix) form - in modal coordinates - this is
+    an elementwise division for all modes and frequencies at once
+
+    NOTE: the FFT assumes a periodic load, zero padding of the history by
+    zero_padding_factor times its length reduces the wrap-around of the transient
+    response, the system starts at rest
+    '''
+
+    def __init__(self,
+                 array_time, time_integration_scheme, dt,
+                 comp_model,
+                 initial_conditions,
+                 force,
+                 structure_model,
+                 zero_padding_factor=1.0,
+                 result_store=None,
+                 recorder=None):
+        if zero_padding_factor < 0.0:
+            err_msg = "The zero padding factor has to be >= 0.0, provided: " + str(zero_padding_factor)
+            raise Exception(err_msg)
+        self.zero_padding_factor = zero_padding_factor
+
+        super().__init__(array_time, time_integration_scheme, dt,
+                         comp_model, initial_conditions, force, structure_model,
+                         result_store=result_store, recorder=recorder)
+
+    def _init_scheme(self, time_integration_scheme, comp_model, initial_conditions):
+        if np.any(initial_conditions[0]) or np.any(initial_conditions[1]):
+            err_msg = "The FrequencyDomainSolver requires zero initial displacement and velocity"
+            raise Exception(err_msg)
+        self.scheme = None
+
+    def _print_solver_info(self):
+        logger.info("Frequency Domain Solver")
+
+    def get_receptance(self, omega):
+        '''
+        H(w) for the given circular frequencies, only in vector form
+        with shape (n_dofs, n_frequencies)
+        '''
+        return 1.0 / (self.K[:, None] - omega ** 2 * self.M[:, None] + 1j * omega * self.B[:, None])
+
+    def _solve_frequencies(self, omega, force_spectrum):
+        if self.M.ndim == 1:
+            return self.get_receptance(omega) * force_spectrum
+
+        displacement_spectrum = np.empty_like(force_spectrum)
+        if matrix_utilities.is_sparse(self.M):
+            for idx, w in enumerate(omega):
+                lhs = self.K - w ** 2 * self.M + 1j * w * self.B
+                displacement_spectrum[:, idx] = matrix_utilities.solve(
+                    lhs.tocsc(), force_spectrum[:, idx])
+            return displacement_spectrum
+
+        n_dofs = self.M.shape[0]
+        batch_size = max(1, MAX_BATCH_ENTRIES // n_dofs ** 2)
+        for start in range(0, len(omega), batch_size):
+            w = omega[start:start + batch_size, None, None]
+            lhs = self.K - w ** 2 * self.M + 1j * w * self.B
+            rhs = force_spectrum[:, start:start + batch_size].T[:, :, None]
+            displacement_spectrum[:, start:start + batch_size] = np.linalg.solve(lhs, rhs)[:, :, 0].T
+        return displacement_spectrum
+
+    def solve(self):
+        n_steps = len(self.array_time)
+        n_fft = fft.next_fast_len(int(np.ceil(n_steps * (1.0 + self.zero_padding_factor))), real=True)
+        omega = 2.0 * np.pi * fft.rfftfreq(n_fft, self.dt)
+
+        force_spectrum = fft.rfft(self.force[...], n=n_fft, axis=1)
+        displacement_spectrum = self._solve_frequencies(omega, force_spectrum)
+
+        self.step = n_steps - 1
+        self.record_step(slice(0, n_steps),
+                         fft.irfft(displacement_spectrum, n=n_fft, axis=1)[:, :n_steps],
+                         fft.irfft(1j * omega * displacement_spectrum, n=n_fft, axis=1)[:, :n_steps],
+                         fft.irfft(-omega ** 2 * displacement_spectrum, n=n_fft, axis=1)[:, :n_steps])
@@ -1,4 +1,4 @@
-from source.solving_strategies.strategies.solver import Solver
+from source.solving_strategies.strategies.solver import Solver, logger
 
 
 class LinearSolver(Solver):
@@ -7,36 +7,60 @@ class LinearSolver(Solver):
                  comp_model,
                  initial_conditions,
                  force,
-                 structure_model):
+                 structure_model,
+                 scheme_settings=None,
+                 result_store=None,
+                 recorder=None):
         super().__init__(array_time, time_integration_scheme, dt,
-                         comp_model, initial_conditions, force, structure_model)
+                         comp_model, initial_conditions, force, structure_model,
+                         scheme_settings, result_store, recorder)
 
     def _print_solver_info(self):
-        print("Linear Solver")
+        logger.info("Linear Solver")
 
     def solve(self):
+        if getattr(self.scheme, 'block_size', 1) > 1:
+            self._solve_in_blocks()
+            return
+
         # time loop
-        for i in range(0, len(self.array_time)):
-            self.step = i
-            current_time = self.array_time[i]
-            print("time: {0:.2f}".format(current_time))
-            self.scheme.solve_single_step(self.force[:, i])
-
-            # appending results to the list
-            self.displacement[:, i] = self.scheme.get_displacement()
-            self.velocity[:, i] = self.scheme.get_velocity()
-            self.acceleration[:, i] = self.scheme.get_acceleration()
-            
-            # TODO: only calculate reaction when user wants it
-            # if self.structure_model is not None:
-            #     self.dynamic_reaction[:, i] = self._compute_reaction()
-            # reaction computed in dynamic analysis 
-
-            # TODO: only calculate reaction when user wants it 
-            # moved reaction computation to dynamic analysis level 
-            # AK . this doesnt considers the support reaction check 
-            #if self.structure_model is not None:
-            #    self.dynamic_reaction[:, i] = self._compute_reaction()
-
-            # update results
-            self.scheme.update()
+        # the force is read chunk by chunk, e.g. from a memory-mapped load history
+        for chunk in self.result_store.get_chunks(len(self.array_time)):
+            force_chunk = self.force[..., chunk]
+            for i in range(chunk.start, chunk.stop):
+                self._solve_single_step(i, force_chunk[..., i - chunk.start])
+
+    def _solve_single_step(self, i, force):
+        self.step = i
+        current_time = self.array_time[i]
+        self.progress_logger.log(i, current_time)
+        self.scheme.solve_single_step(force)
+
+        # appending results to the list
+        self.record_step(i, self.scheme.get_displacement(),
+                         self.scheme.get_velocity(),
+                         self.scheme.get_acceleration())
+        
+        # TODO: only calculate reaction when user wants it
+        # if self.structure_model is not None:
+        #     self.dynamic_reaction[:, i] = self._compute_reaction()
+        # reaction computed in dynamic analysis 
+
+        # TODO: only calculate reaction when user wants it 
+        # moved reaction computation to dynamic analysis level 
+        # AK . this doesnt considers the support reaction check 
+        #if self.structure_model is not None:
+        #    self.dynamic_reaction[:, i] = self._compute_reaction()
+
+        # update results
+        self.scheme.update()
+
+    def _solve_in_blocks(self):
+        # time loop advancing several steps at once
+        block_size = self.scheme.block_size
+        for start in range(0, len(self.array_time), block_size):
+            end = min(start + block_size, len(self.array_time))
+            self.step = end - 1
+            self.progress_logger.log(end - 1, self.array_time[end - 1])
+
+            self.record_step(slice(start, end), *self.scheme.solve_block(self.force[:, start:end]))
@@ -0,0 +1,72 @@
+import numpy as np
+from scipy import signal
+
+from source.solving_strategies.strategies.solver import Solver, logger
+from source.solving_strategies.schemes.exact_state_space_scheme import get_piecewise_exact_operators
+
+
+class ModalSolver(Solver):
+    '''
+    Linear solver for the decoupled system in modal coordinates
+
+    The whole time history of each mode follows from the exact recurrence
+    as a second order recursive filter, no time loop in Python
+    NOTE: requires a constant time step
+    '''
+
+    def __init__(self,
+                 array_time, time_integration_scheme, dt,
+                 comp_model,
+                 initial_conditions,
+                 force,
+                 structure_model,
+                 result_store=None,
+                 recorder=None):
+        super().__init__(array_time, time_integration_scheme, dt,
+                         comp_model, initial_conditions, force, structure_model,
+                         result_store=result_store, recorder=recorder)
+
+    def _init_scheme(self, time_integration_scheme, comp_model, initial_conditions):
+        if np.ndim(comp_model[0]) != 1:
+            err_msg = "The ModalSolver requires the system in vector (from diagonal matrix) form\n"
+            err_msg += "Use \"run_in_modal_coordinates\": true"
+            raise Exception(err_msg)
+
+        self.scheme = None
+        self.initial_conditions = initial_conditions
+        self.A, self.G0, self.G1 = get_piecewise_exact_operators(
+            comp_model[0], comp_model[1], comp_model[2], self.dt)
+
+    def _print_solver_info(self):
+        logger.info("Modal Solver with the piecewise exact integration")
+
+    def solve(self):
+        u0, v0 = self.initial_conditions[0], self.initial_conditions[1]
+        # the modal load history is small, read at once
+        f = self.force[...]
+        # the modal histories are small, recorded at once in the end
+        displacement = np.empty(f.shape)
+        velocity = np.empty(f.shape)
+
+        for mode in range(self.A.shape[0]):
+            a = self.A[mode]
+            # load part of the recurrence x_n+1 = A * x_n + w_n
+            # the initial state enters as the first input sample
+            w = np.empty((2, f.shape[1]))
+            w[:, 0] = [u0[mode], v0[mode]]
+            w[:, 1:] = np.outer(self.G0[mode], f[mode, :-1]) + \
+                np.outer(self.G1[mode], f[mode, 1:])
+
+            # x = (I - A z^-1)^-1 w, common denominator det(I - A z^-1)
+            den = [1.0, -np.trace(a), np.linalg.det(a)]
+            displacement[mode, :] = signal.lfilter([1.0, -a[1, 1]], den, w[0]) + \
+                signal.lfilter([0.0, a[0, 1]], den, w[1])
+            velocity[mode, :] = signal.lfilter([0.0, a[1, 0]], den, w[0]) + \
+                signal.lfilter([1.0, -a[0, 0]], den, w[1])
+
+        # from the equation of motion of each mode
+        acceleration = (f - self.B[:, None] * velocity -
+                        self.K[:, None] * displacement) / self.M[:, None]
+
+        self.step = len(self.array_time) - 1
+        self.record_step(slice(0, len(self.array_time)), displacement, velocity, acceleration)
@@ -7,9 +7,10 @@ from source.auxiliary.global_definitions import *
 class ResidualBasedSolver(Solver):
 
     def __init__(self, array_time, time_integration_scheme, dt,
-                 comp_model, initial_conditions, force, structure_model):
+                 comp_model, initial_conditions, force, structure_model, result_store=None, recorder=None):
         super().__init__(array_time, time_integration_scheme, dt,
-                         comp_model, initial_conditions, force, structure_model)
+                         comp_model, initial_conditions, force, structure_model,
+                         result_store=result_store, recorder=recorder)
 
     def calculate_residual(self, q):
         pass
@@ -23,10 +24,15 @@ class ResidualBasedSolver(Solver):
     def get_displacement_from_element(self):
         u = np.zeros(self.structure_model.n_nodes * DOFS_PER_NODE[self.structure_model.domain_size])
 
-        for e in self.structure_model.elements:
-            i_start = DOFS_PER_NODE[e.domain_size] * e.index
-            i_end = DOFS_PER_NODE[e.domain_size] * e.index + DOFS_PER_NODE[e.domain_size] * NODES_PER_LEVEL
-            u[i_start:i_end] += e.current_deformation
+        # NOTE: the elements sharing a node carry the same nodal deformation, assigned not summed
+        element_set = self.structure_model.cr_element_set
+        if element_set is not None:
+            u[self.structure_model.element_dofs] = element_set.current_deformation
+        else:
+            for e in self.structure_model.elements:
+                i_start = DOFS_PER_NODE[e.domain_size] * e.index
+                i_end = DOFS_PER_NODE[e.domain_size] * e.index + DOFS_PER_NODE[e.domain_size] * NODES_PER_LEVEL
+                u[i_start:i_end] = e.current_deformation
 
         u = self.structure_model.apply_bc_by_reduction(u, 'column_vector')
         return u
@@ -34,17 +40,26 @@ class ResidualBasedSolver(Solver):
     def get_internal_force_from_element(self):
         q = np.zeros(self.structure_model.n_nodes * DOFS_PER_NODE[self.structure_model.domain_size])
 
-        for e in self.structure_model.elements:
-            start_index = DOFS_PER_NODE[e.domain_size] * e.index
-            end_index = DOFS_PER_NODE[e.domain_size] * e.index + DOFS_PER_NODE[e.domain_size] * NODES_PER_LEVEL
+        element_set = self.structure_model.cr_element_set
+        if element_set is not None:
+            # summing the contributions of the elements sharing a node
+            np.add.at(q, self.structure_model.element_dofs, element_set.nodal_force_global)
+        else:
+            for e in self.structure_model.elements:
+                start_index = DOFS_PER_NODE[e.domain_size] * e.index
+                end_index = DOFS_PER_NODE[e.domain_size] * e.index + DOFS_PER_NODE[e.domain_size] * NODES_PER_LEVEL
 
-            q[start_index:end_index] += e.nodal_force_global
+                q[start_index:end_index] += e.nodal_force_global
 
         q = self.structure_model.apply_bc_by_reduction(q, 'column_vector')
         return q
 
     def update_total(self, new_displacement):
         # updating displacement in the element
+        element_set = self.structure_model.cr_element_set
+        if element_set is not None:
+            element_set.update_total(new_displacement[self.structure_model.element_dofs])
+            return
         for e in self.structure_model.elements:
             i_start = DOFS_PER_NODE[e.domain_size] * e.index
             i_end = DOFS_PER_NODE[e.domain_size] * e.index + DOFS_PER_NODE[e.domain_size] * NODES_PER_LEVEL
@@ -63,14 +78,14 @@ class ResidualBasedSolver(Solver):
         for i in range(0, len(self.array_time)):
             self.step = i
             current_time = self.array_time[i]
-            print("time: {0:.2f}".format(current_time))
+            self.progress_logger.log(i, current_time)
 
             self.solve_single_step()
 
             # appending results to the list
-            self.displacement[:, i] = self.scheme.get_displacement()
-            self.velocity[:, i] = self.scheme.get_velocity()
-            self.acceleration[:, i] = self.scheme.get_acceleration()
+            self.record_step(i, self.scheme.get_displacement(),
+                             self.scheme.get_velocity(),
+                             self.scheme.get_acceleration())
             #self.dynamic_reaction[:, i] = self._compute_reaction()
             # reaction computed in dynamic analysis 
 
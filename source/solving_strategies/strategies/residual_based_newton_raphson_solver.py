@@ -2,62 +2,178 @@ import numpy as np
 
 from source.solving_strategies.strategies.rasidual_based_solver import ResidualBasedSolver
 import source.auxiliary.global_definitions as GD
+import source.auxiliary.matrix_utilities as matrix_utilities
+from source.solving_strategies.strategies.solver import logger
 
-# TODO: take these values as user input
 # stopping criteria
 TOL = 1e-4
 # maximum iteration
 MAX_IT = 10
 
+# default settings of the nonlinear iterations
+# a tolerance of None is not checked, the converged state fulfills all others
+DEFAULT_NONLINEAR_SETTINGS = {
+    # absolute, norm of the residual force
+    "residual_tolerance": TOL,
+    # relative, norm of the increment to the norm of the displacement
+    "displacement_tolerance": None,
+    # relative, work of the residual on the increment to the one of the first iteration
+    "energy_tolerance": None,
+    "max_iterations": MAX_IT,
+    # 1: full Newton, k > 1: the factorized tangent is reused for k iterations (modified Newton)
+    # also over the time steps
+    "tangent_update_interval": 1,
+    # the tangent is refactorized earlier if the residual norm decreases by less than this ratio
+    "stall_ratio": 0.5}
+
 
 class ResidualBasedNewtonRaphsonSolver(ResidualBasedSolver):
     def __init__(self, array_time, time_integration_scheme, dt,
-                 comp_model, initial_conditions, force, structure_model):
+                 comp_model, initial_conditions, force, structure_model,
+                 nonlinear_settings=None, result_store=None, recorder=None):
+        self.nonlinear_settings = dict(DEFAULT_NONLINEAR_SETTINGS)
+        if nonlinear_settings is not None:
+            for key, val in nonlinear_settings.items():
+                if key not in DEFAULT_NONLINEAR_SETTINGS:
+                    err_msg = "The nonlinear setting \"" + key + "\" is not available\n"
+                    err_msg += "Choose one of: \"" + "\", \"".join(DEFAULT_NONLINEAR_SETTINGS.keys()) + "\""
+                    raise Exception(err_msg)
+                self.nonlinear_settings[key] = val
+        if all(self.nonlinear_settings[key] is None
+               for key in ["residual_tolerance", "displacement_tolerance", "energy_tolerance"]):
+            err_msg = "At least one of the residual, displacement or energy tolerances is required"
+            raise Exception(err_msg)
+        if self.nonlinear_settings["tangent_update_interval"] < 1:
+            err_msg = "The tangent update interval has to be >= 1, provided: " + \
+                str(self.nonlinear_settings["tangent_update_interval"])
+            raise Exception(err_msg)
+
         super().__init__(array_time, time_integration_scheme, dt,
-                         comp_model, initial_conditions, force, structure_model)
+                         comp_model, initial_conditions, force, structure_model,
+                         result_store=result_store, recorder=recorder)
+
+        # preallocated full size buffers to scatter the reduced results into
+        n_dofs = len(self.structure_model.all_dofs_global)
+        self.full_displacement = np.zeros(n_dofs)
+        self.full_increment = np.zeros(n_dofs)
+
+        # factorized tangent and the number of iterations it has been used for
+        self._tangent_solver = None
+        self._tangent_age = 0
+
+        # statistics of the nonlinear iterations
+        self.iteration_counts = np.zeros(len(self.array_time), dtype=int)
+        self.n_factorizations = 0
+        self.n_unconverged_steps = 0
+
+    def _print_solver_info(self):
+        logger.info("Newton Raphson Solver")
+        logger.info("nonlinear settings: %s", self.nonlinear_settings)
 
     def update_incremental(self, dp):
         # updating displacement in the element
+        element_set = self.structure_model.cr_element_set
+        if element_set is not None:
+            element_set.update_incremental(dp[self.structure_model.element_dofs])
+            return
         for e in self.structure_model.elements:
             i_start = GD.DOFS_PER_NODE[e.domain_size] * e.index
             i_end = GD.DOFS_PER_NODE[e.domain_size] * e.index + GD.DOFS_PER_NODE[e.domain_size] * GD.NODES_PER_LEVEL
             dp_e = dp[i_start: i_end]
             e.update_incremental(dp_e)
 
+    def _update_tangent(self):
+        # reassembled at the current state
+        self.K = self.structure_model.update_stiffness_matrix()
+        self._tangent_solver = matrix_utilities.factorized(self.K)
+        self._tangent_age = 0
+        self.n_factorizations += 1
+
+    def _is_converged(self, residual_norm, increment_norm=None, displacement_norm=None,
+                      energy=None, initial_energy=None):
+        settings = self.nonlinear_settings
+        if residual_norm == 0.0:
+            # e.g. no load
+            return True
+        if settings["residual_tolerance"] is not None and residual_norm > settings["residual_tolerance"]:
+            return False
+        if increment_norm is None:
+            # no increment yet: only the residual can be checked
+            return settings["residual_tolerance"] is not None
+        if settings["displacement_tolerance"] is not None and \
+                increment_norm > settings["displacement_tolerance"] * displacement_norm:
+            return False
+        if settings["energy_tolerance"] is not None and \
+                energy > settings["energy_tolerance"] * initial_energy:
+            return False
+        return True
+
     def solve_single_step(self):
+        settings = self.nonlinear_settings
         f_ext = self.force[:, self.step]
         # predict displacement at time step n with external force f_ext
         self.scheme.solve_single_step(f_ext)
 
         nr_it = 0
         # update displacement in element
-        new_displacement = self.scheme.get_displacement()
-        new_displacement = self.structure_model.recuperate_bc_by_extension(new_displacement, 'column_vector')
+        displacement = np.array(self.scheme.get_displacement(), dtype=float)
+        new_displacement = self.structure_model.recuperate_bc_by_extension(
+            displacement, 'column_vector', out=self.full_displacement)
         self.update_total(new_displacement)
-        # update stiffness matrix before updating residual
-        self.K = self.structure_model.update_stiffness_matrix()
         # update residual
         r = self.calculate_residual(f_ext)
+        residual_norm = np.linalg.norm(r)
+        initial_energy = None
+        converged = self._is_converged(residual_norm)
 
-        while abs(np.linalg.norm(r)) > TOL and nr_it < MAX_IT:
+        while not converged and nr_it < settings["max_iterations"]:
             nr_it += 1
-            print("Nonlinear iteration: ", str(nr_it))
-            print("r = {:.2e}".format(abs(np.linalg.norm(r))))
+            logger.debug("Nonlinear iteration: %d, r = %.2e", nr_it, residual_norm)
+            if self._tangent_solver is None or self._tangent_age >= settings["tangent_update_interval"]:
+                self._update_tangent()
             dp = self.calculate_increment(r)
-            dp = self.structure_model.recuperate_bc_by_extension(dp, 'column_vector')
+            self._tangent_age += 1
+
+            energy = abs(np.dot(dp, r))
+            if initial_energy is None:
+                initial_energy = energy
+            displacement += dp
 
+            dp = self.structure_model.recuperate_bc_by_extension(
+                dp, 'column_vector', out=self.full_increment)
             # updating displacement in the element
             self.update_incremental(dp)
-            self.K = self.structure_model.update_stiffness_matrix()
             r = self.calculate_residual(f_ext)
 
+            previous_residual_norm = residual_norm
+            residual_norm = np.linalg.norm(r)
+            converged = self._is_converged(residual_norm, np.linalg.norm(dp), np.linalg.norm(displacement),
+                                           energy, initial_energy)
+            if residual_norm > settings["stall_ratio"] * previous_residual_norm:
+                # slow or no convergence with the old tangent
+                self._tangent_solver = None
+
+        self.iteration_counts[self.step] = nr_it
+        logger.debug("Step %d: %d nonlinear iterations, r = %.2e", self.step, nr_it, residual_norm)
+        if not converged:
+            self.n_unconverged_steps += 1
+            logger.warning("Nonlinear iterations not converged in step %d after %d iterations, r = %.2e",
+                           self.step, nr_it, residual_norm)
+
         u_new = self.get_displacement_from_element()
         self.scheme.update_displacement(u_new)
         # updating K, B, M in the scheme
         self.update_comp_model()
 
+    def solve(self):
+        super().solve()
+        logger.info("Nonlinear iterations: %d in total, max %d per step, %d factorizations of the tangent",
+                    np.sum(self.iteration_counts), np.max(self.iteration_counts), self.n_factorizations)
+        if self.n_unconverged_steps > 0:
+            logger.warning("%d steps not converged", self.n_unconverged_steps)
+
     def calculate_increment(self, r):
-        dp = np.linalg.solve(self.K, r)
+        dp = self._tangent_solver(r)
         return dp
 
     def _compute_reaction(self):
@@ -1,4 +1,8 @@
+import time
+
 from source.solving_strategies.strategies.residual_based_solver import ResidualBasedSolver
+import source.auxiliary.matrix_utilities as matrix_utilities
+from source.solving_strategies.strategies.solver import logger
 import numpy as np
 
 
@@ -8,57 +12,150 @@ TOL = 1.e-5
 # maximum iteration
 MAX_IT = 10
 
+# schemes with an iteration matrix, the explicit CentralDifference does not iterate
+PICARD_SCHEMES = ["ForwardEuler1", "BackwardEuler1", "GenAlpha", "BDF2", "CentralDifference"]
+
 
 class ResidualBasedPicardSolver(ResidualBasedSolver):
+    '''
+    Fixed point iterations on the residual of the time step
+    with the iteration matrix c_m * M + c_b * B + c_k * K of the scheme
+
+    The iteration matrix is factorized once and reused as long as
+    the matrices (e.g. a constant mass for ForwardEuler1) and the time step do not change,
+    otherwise once per step
+    '''
+
     def __init__(self, array_time, time_integration_scheme, dt,
-                 comp_model, initial_conditions, force, structure_model):
+                 comp_model, initial_conditions, force, structure_model, result_store=None, recorder=None):
+        if time_integration_scheme not in PICARD_SCHEMES:
+            err_msg = "The Picard solver is not available for the time integration scheme \""
+            err_msg += time_integration_scheme + "\"\n"
+            err_msg += "Choose one of: \"" + "\", \"".join(PICARD_SCHEMES) + "\""
+            raise Exception(err_msg)
+
         super().__init__(array_time, time_integration_scheme, dt,
-                         comp_model, initial_conditions, force, structure_model)
+                         comp_model, initial_conditions, force, structure_model,
+                         result_store=result_store, recorder=recorder)
 
         self.time_integration_scheme = time_integration_scheme
 
+        # preallocated full size buffer to scatter the reduced results into
+        self.full_displacement = np.zeros(len(self.structure_model.all_dofs_global))
+
+        # factorized iteration matrix and the fingerprint of the matrices it has been built from
+        self._iteration_solver = None
+        self._iteration_key = None
+
+        # statistics of the iterations
+        self.iteration_counts = np.zeros(len(self.array_time), dtype=int)
+        self.n_factorizations = 0
+        self.n_unconverged_steps = 0
+        self.factorization_time = 0.0
+        self.iteration_time = 0.0
+
+    def _print_solver_info(self):
+        logger.info("Picard Solver")
+
+    def _get_iteration_coefficients(self):
+        '''
+        coefficients (c_m, c_b, c_k) of the iteration matrix:
+        the derivative of the residual w.r.t. the displacement
+        with the velocity and acceleration predicted by the scheme
+        '''
+        if self.time_integration_scheme == "ForwardEuler1":
+            # explicit in the stiffness and damping
+            return 1.0 / self.dt ** 2, 0.0, 0.0
+        elif self.time_integration_scheme == "BackwardEuler1":
+            return 1.0 / self.dt ** 2, 1.0 / self.dt, 1.0
+        elif self.time_integration_scheme == "GenAlpha":
+            # the effective matrix of the balance at the intermediate time
+            return self.scheme.a1h, self.scheme.a2h, self.scheme.a3h
+        elif self.time_integration_scheme == "BDF2":
+            return self.scheme.bdf0 ** 2, self.scheme.bdf0, 1.0
+
+    def _update_iteration_matrix(self):
+        c_m, c_b, c_k = self._get_iteration_coefficients()
+        matrices = [(c, matrix) for c, matrix in [(c_m, self.M), (c_b, self.B), (c_k, self.K)] if c != 0.0]
+
+        # refactorized only if one of the matrices or the coefficients changed
+        key = tuple((c, matrix_utilities.get_fingerprint(matrix)) for c, matrix in matrices)
+        if self._iteration_solver is not None and key == self._iteration_key:
+            return
+
+        start_time = time.perf_counter()
+        lhs = matrices[0][0] * matrices[0][1]
+        for c, matrix in matrices[1:]:
+            lhs = lhs + c * matrix
+        self._iteration_solver = matrix_utilities.factorized(lhs)
+        self._iteration_key = key
+        self.n_factorizations += 1
+        self.factorization_time += time.perf_counter() - start_time
+
     def solve_single_step(self):
         # predict displacement at time step n with external force f_ext
         f_ext = self.force[:, self.step]
         self.scheme.solve_single_step(f_ext)
         u1 = self.scheme.get_displacement()
 
+        start_time = time.perf_counter()
         nr_it = 0
         ru = self.calculate_residual(u1, f_ext)
 
-        while abs(np.linalg.norm(ru)) > TOL and nr_it < MAX_IT:
-            print("Nonlinear iteration: ", str(nr_it))
-            print("ru = {:.2e}".format(abs(np.linalg.norm(ru))))
-            u1 = self.scheme.get_displacement()
-            ru = self.calculate_residual(u1, f_ext)
+        # the explicit step does not depend on the new state - no iterations
+        max_it = 0 if self.time_integration_scheme == "CentralDifference" else MAX_IT
+        while abs(np.linalg.norm(ru)) > TOL and nr_it < max_it:
+            logger.debug("Nonlinear iteration: %d, ru = %.2e", nr_it, abs(np.linalg.norm(ru)))
+            if nr_it == 0:
+                # factorized once per step, or once per run for unchanged matrices
+                self._update_iteration_matrix()
             du = self.calculate_increment(ru)
             self.scheme.u1 += du
             nr_it += 1
+            ru = self.calculate_residual(self.scheme.get_displacement(), f_ext)
+
+        if nr_it > 0:
+            # velocity and acceleration of the iterated displacement
+            self.scheme.update_displacement(self.scheme.get_displacement())
+        self.iteration_counts[self.step] = nr_it
+        if max_it > 0 and abs(np.linalg.norm(ru)) > TOL:
+            self.n_unconverged_steps += 1
+            logger.debug("Picard iterations not converged in step %d, ru = %.2e",
+                         self.step, abs(np.linalg.norm(ru)))
+        self.iteration_time += time.perf_counter() - start_time
 
         u_new = self.scheme.get_displacement()
-        u_new = self.structure_model.recuperate_bc_by_extension(u_new, 'column_vector')
+        u_new = self.structure_model.recuperate_bc_by_extension(
+            u_new, 'column_vector', out=self.full_displacement)
         self.update_total(u_new)
         # updating K, B, M in the scheme
         self.update_comp_model()
 
-    def calculate_increment(self, ru):
-        du = np.zeros(ru.shape)
+    def solve(self):
+        super().solve()
+        logger.info("Picard iterations: %d in total, max %d per step, %d factorizations of the iteration matrix",
+                    np.sum(self.iteration_counts), np.max(self.iteration_counts), self.n_factorizations)
+        logger.info("time in the iterations: %.3f s, of these factorizing: %.3f s",
+                    self.iteration_time, self.factorization_time)
+        if self.n_unconverged_steps > 0:
+            logger.warning("%d steps not converged", self.n_unconverged_steps)
 
-        # TODO increment for other schemes need to be tested and added
-        if self.time_integration_scheme == "ForwardEuler1":
-            LHS = self.M
-            RHS = ru * self.dt ** 2
-            du = np.linalg.solve(LHS, RHS)
-        elif self.time_integration_scheme == "BackwardEuler1":
-            LHS = (self.B * self.dt + self.K * self.dt ** 2 + self.M)
-            RHS = ru * self.dt ** 2
-            du = np.linalg.solve(LHS, RHS)
+    def calculate_increment(self, ru):
+        du = self._iteration_solver(ru)
         return du
 
     def calculate_residual(self, u1, f_ext):
         v1 = self.scheme.predict_velocity(u1)
         a1 = self.scheme.predict_acceleration(v1)
 
-        ru = f_ext - (np.dot(self.M, a1) + np.dot(self.B, v1) + np.dot(self.K, u1))
-        return ru
+        if self.time_integration_scheme == "GenAlpha":
+            # balance at the intermediate time of the scheme
+            scheme = self.scheme
+            f_alpha = (1.0 - scheme.alphaF) * f_ext + scheme.alphaF * scheme.f0
+            ru = f_alpha - (self.M.dot((1.0 - scheme.alphaM) * a1 + scheme.alphaM * scheme.an1) +
+                            self.B.dot((1.0 - scheme.alphaF) * v1 + scheme.alphaF * scheme.vn1) +
+                            self.K.dot((1.0 - scheme.alphaF) * u1 + scheme.alphaF * scheme.un1))
+            return ru
 
+        ru = f_ext - (self.M.dot(a1) + self.B.dot(v1) + self.K.dot(u1))
+        return ru
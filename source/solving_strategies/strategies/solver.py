@@ -1,5 +1,10 @@
 import numpy as np
 
+from source.auxiliary.logger import get_logger, ProgressLogger
+from source.auxiliary.result_store import ResultStore
+
+logger = get_logger(__name__)
+
 
 class Solver(object):
     def __init__(self,
@@ -7,7 +12,10 @@ class Solver(object):
                  comp_model,
                  initial_conditions,
                  force,
-                 structure_model):
+                 structure_model,
+                 scheme_settings=None,
+                 result_store=None,
+                 recorder=None):
         # vector of time
         self.array_time = array_time
 
@@ -16,6 +24,8 @@ class Solver(object):
 
         # iteration
         self.step = 0
+        # rate limited progress output of the time loop
+        self.progress_logger = ProgressLogger(logger, len(self.array_time))
 
         # mass, damping and spring stiffness
         self.M = comp_model[0]
@@ -31,12 +41,30 @@ class Solver(object):
         # placeholders for the solution
         rows = len(initial_conditions[0])
         cols = len(self.array_time)
+        # several load cases are advanced together as columns of the state
+        self.n_cases = initial_conditions[0].shape[1] if np.ndim(initial_conditions[0]) == 2 else None
+
+        # in memory or out-of-core histories
+        self.result_store = ResultStore() if result_store is None else result_store
+
+        # optionally only selected results are recorded
+        self.recorder = recorder
 
         # adding additional attributes to the derived class
-        self.displacement = np.zeros((rows, cols))
-        self.velocity = np.zeros((rows, cols))
-        self.acceleration = np.zeros((rows, cols))
-        self.dynamic_reaction = np.zeros((rows, cols))
+        if self.recorder is None:
+            self.displacement = self.result_store.allocate('displacement', rows, cols, self.n_cases)
+            self.velocity = self.result_store.allocate('velocity', rows, cols, self.n_cases)
+            self.acceleration = self.result_store.allocate('acceleration', rows, cols, self.n_cases)
+        else:
+            # histories of the selected dofs, None if not requested
+            self.displacement = self.recorder.histories.get('displacement')
+            self.velocity = self.recorder.histories.get('velocity')
+            self.acceleration = self.recorder.histories.get('acceleration')
+        # NOTE: the reaction is computed in the dynamic analysis
+        self.dynamic_reaction = None
+
+        # additional scheme specific settings, e.g. the block size
+        self.scheme_settings = {} if scheme_settings is None else scheme_settings
 
         # initializing scheme
         self._init_scheme(time_integration_scheme,
@@ -67,26 +95,47 @@ class Solver(object):
         elif time_integration_scheme == "BDF2":
             from source.solving_strategies.schemes.bdf2_scheme import BDF2
             self.scheme = BDF2(self.dt, comp_model, initial_conditions)
+        elif time_integration_scheme == "ExactStateSpace":
+            from source.solving_strategies.schemes.exact_state_space_scheme import ExactStateSpace
+            self.scheme = ExactStateSpace(
+                self.dt, comp_model, initial_conditions, **self.scheme_settings)
+        elif time_integration_scheme == "CentralDifference":
+            from source.solving_strategies.schemes.central_difference_scheme import CentralDifference
+            self.scheme = CentralDifference(
+                self.dt, comp_model, initial_conditions, **self.scheme_settings)
         else:
             err_msg = "The requested time integration scheme \"" + time_integration_scheme
             err_msg += "\" is not available \n"
             err_msg += "Choose one of: \"GenAlpha\", \"Euler12\", \"ForwardEuler1\", \"BackwardEuler1\", " \
-                       "\"RungeKutta4\", \"BDF2\""
+                       "\"RungeKutta4\", \"BDF2\", \"ExactStateSpace\", \"CentralDifference\""
             raise Exception(err_msg)
 
     def _print_solver_info(self):
         pass
 
     def _print_structural_setup(self):
-        print("Printing structural setup in the solver base class:")
-        print("mass: ", self.M)
-        print("damping: ", self.B)
-        print("stiffness: ", self.K)
-        print(" ")
+        # full matrices only on request, these are large for realistic models
+        logger.debug("Printing structural setup in the solver base class:")
+        logger.debug("mass: %s", self.M)
+        logger.debug("damping: %s", self.B)
+        logger.debug("stiffness: %s", self.K)
+        logger.debug(" ")
 
     def solve(self):
         pass
 
+    def record_step(self, steps, displacement, velocity, acceleration):
+        '''
+        steps is either a single step with state vectors
+        or a slice of steps with the states as columns
+        '''
+        if self.recorder is None:
+            self.displacement[..., steps] = displacement
+            self.velocity[..., steps] = velocity
+            self.acceleration[..., steps] = acceleration
+        else:
+            self.recorder.record(steps, displacement, velocity, acceleration)
+
     # def _compute_reaction(self):
 
     #     # TODO: check if this still correct in modal coordinates
@@ -0,0 +1,117 @@
+import copy
+
+import pytest
+
+from source.model.structure_model import StraightBeam
+
+# a 3D Timoshenko beam with two sections and an outrigger
+BEAM_PARAMS = {
+    "name": "MatrixFormatTest",
+    "domain_size": "3D",
+    "system_parameters": {
+        "element_params": {
+            "type": "Timoshenko",
+            "is_nonlinear": False
+        },
+        "material": {
+            "density": 160.0,
+            "youngs_modulus": 2.861e8,
+            "poisson_ratio": 0.1,
+            "damping_ratio": 0.02
+        },
+        "geometry": {
+            "length_x": 180,
+            "number_of_elements": 12,
+            "defined_on_intervals": [{
+                "interval_bounds": [0.0, 60.0],
+                "length_y": [55.0],
+                "length_z": [35.0],
+                "area": [1925.0],
+                "shear_area_y": [1605.0],
+                "shear_area_z": [1605.0],
+                "moment_of_inertia_y": [196510.0],
+                "moment_of_inertia_z": [458260.0],
+                "torsional_moment_of_inertia": [691771.0],
+                "outrigger": {
+                    "mass": 947000.0,
+                    "stiffness_ratio_y": 5,
+                    "stiffness_ratio_z": 5}},
+                {
+                "interval_bounds": [60.0, "End"],
+                "length_y": [45.0],
+                "length_z": [30.0],
+                "area": [1350.0],
+                "shear_area_y": [1125.0],
+                "shear_area_z": [1125.0],
+                "moment_of_inertia_y": [101250.0],
+                "moment_of_inertia_z": [227813.0],
+                "torsional_moment_of_inertia": [329063.0]}]
+        }
+    },
+    "boundary_conditions": "fixed-free"
+}
+
+
+@pytest.fixture
+def get_beam():
+    '''
+    factory for the test beam in the requested matrix format,
+    settings overwrite the defaults of the model, e.g. mass_formulation="lumped"
+    '''
+    def _get_beam(matrix_format, **settings):
+        beam_params = copy.deepcopy(BEAM_PARAMS)
+        beam_params["matrix_format"] = matrix_format
+        beam_params.update(settings)
+        return StraightBeam(beam_params)
+    return _get_beam
+
+# a 3D corotational beam with a single section, fixed-free
+# NOTE: Iz differs from Iy, for equal bending stiffnesses the two lowest modes coincide
+# and the 2x2 system for the Rayleigh coefficients is singular
+CR_BEAM_PARAMS = {
+    "name": "CRBeamTest",
+    "domain_size": "3D",
+    "system_parameters": {
+        "element_params": {
+            "type": "CRBeam",
+            "is_nonlinear": True
+        },
+        "material": {
+            "density": 7850.0,
+            "youngs_modulus": 2.1e11,
+            "poisson_ratio": 0.3,
+            "damping_ratio": 0.05
+        },
+        "geometry": {
+            "length_x": 1.2,
+            "number_of_elements": 4,
+            "defined_on_intervals": [{
+                "interval_bounds": [0.0, "End"],
+                "length_y": [0.1],
+                "length_z": [0.1],
+                "area": [1e-4],
+                "shear_area_y": [8e-5],
+                "shear_area_z": [8e-5],
+                "moment_of_inertia_y": [1e-8],
+                "moment_of_inertia_z": [1.5e-8],
+                "torsional_moment_of_inertia": [2e-8]}]
+        }
+    },
+    "boundary_conditions": "fixed-free"
+}
+
+
+@pytest.fixture
+def get_cr_beam():
+    '''
+    factory for the corotational test beam,
+    element_params overwrite the CRBeam element, e.g. for a linear Timoshenko reference
+    '''
+    def _get_cr_beam(matrix_format="dense", number_of_elements=4, element_params=None):
+        beam_params = copy.deepcopy(CR_BEAM_PARAMS)
+        beam_params["matrix_format"] = matrix_format
+        beam_params["system_parameters"]["geometry"]["number_of_elements"] = number_of_elements
+        if element_params is not None:
+            beam_params["system_parameters"]["element_params"] = element_params
+        return StraightBeam(beam_params)
+    return _get_cr_beam
@@ -0,0 +1,124 @@
+import copy
+
+import numpy as np
+
+from source.element.cr_beam_element_set import STATE_ATTRIBUTES
+
+
+def random_displacement(rng, n_dofs, scale):
+    u = scale * rng.standard_normal(n_dofs)
+    # rotations with a moderate magnitude
+    u[3::6] *= 10.0
+    u[4::6] *= 10.0
+    u[5::6] *= 10.0
+    return u
+
+
+def assert_same_state(element_set, elements):
+    for idx, e in enumerate(elements):
+        for label in ['current_deformation', 'LocalRotationMatrix', 'TransformationMatrix',
+                      'phi_s', 'phi_a', 'v', 'nodal_force_local', 'nodal_force_global']:
+            assert np.allclose(getattr(element_set, label)[idx], getattr(e, label), rtol=1e-9, atol=1e-9), label
+        # the elements of the model see the state of the set
+        assert np.allclose(element_set.elements[idx].nodal_force_global, e.nodal_force_global, rtol=1e-9, atol=1e-9)
+
+
+def test_cr_element_set_matches_elements(get_cr_beam):
+    beam = get_cr_beam(number_of_elements=5)
+    element_set = beam.cr_element_set
+    assert element_set is not None
+    reference = copy.deepcopy(beam.elements)
+
+    rng = np.random.default_rng(0)
+    n_dofs = beam.element_dofs.max() + 1
+
+    u = np.zeros(n_dofs)
+    for _ in range(3):
+        u = u + random_displacement(rng, n_dofs, 1e-3)
+        element_set.update_total(u[beam.element_dofs])
+        for idx, e in enumerate(reference):
+            e.update_total(u[beam.element_dofs[idx]])
+        assert_same_state(element_set, reference)
+
+    for _ in range(3):
+        dp = random_displacement(rng, n_dofs, 1e-4)
+        element_set.update_incremental(dp[beam.element_dofs])
+        for idx, e in enumerate(reference):
+            e.update_incremental(dp[beam.element_dofs[idx]])
+        assert_same_state(element_set, reference)
+
+    # the element stiffness uses the state bound from the set
+    for e_set, e in zip(element_set.elements, reference):
+        assert np.allclose(e_set.get_element_stiffness_matrix(), e.get_element_stiffness_matrix(), rtol=1e-9)
+
+    # the matrices of all elements at once
+    stiffness = element_set.get_element_stiffness_matrices()
+    mass = element_set.get_element_mass_matrices()
+    for idx, e in enumerate(reference):
+        assert np.allclose(stiffness[idx], e.get_element_stiffness_matrix(), rtol=1e-9)
+        assert np.allclose(mass[idx], e.get_element_mass_matrix(), rtol=1e-9)
+    assert np.allclose(element_set.get_element_stiffness_matrices([1, 3]), stiffness[[1, 3]], rtol=1e-9)
+
+
+def test_cr_element_set_state_bound_once(get_cr_beam):
+    beam = get_cr_beam(number_of_elements=5)
+    element_set = beam.cr_element_set
+    state = {label: getattr(element_set, label) for label in STATE_ATTRIBUTES}
+    bound = [{label: getattr(e, label) for label in STATE_ATTRIBUTES} for e in beam.elements]
+
+    rng = np.random.default_rng(3)
+    n_dofs = beam.element_dofs.max() + 1
+    element_set.update_total(random_displacement(rng, n_dofs, 1e-3)[beam.element_dofs])
+    element_set.update_incremental(random_displacement(rng, n_dofs, 1e-4)[beam.element_dofs])
+
+    # updated in place, the elements keep their views of the rows
+    for label in STATE_ATTRIBUTES:
+        assert getattr(element_set, label) is state[label]
+    for idx, e in enumerate(beam.elements):
+        for label in STATE_ATTRIBUTES:
+            assert getattr(e, label) is bound[idx][label]
+            assert np.shares_memory(getattr(e, label), state[label])
+            assert np.array_equal(getattr(e, label), state[label][idx])
+
+    # a copied model has its own state
+    copied = copy.deepcopy(beam)
+    copied.cr_element_set.update_incremental(random_displacement(rng, n_dofs, 1e-4)[beam.element_dofs])
+    assert np.array_equal(copied.elements[2].v, copied.cr_element_set.v[2])
+    assert not np.array_equal(copied.elements[2].v, beam.elements[2].v)
+
+
+def test_cr_element_material_stiffness_is_constant(get_cr_beam):
+    beam = get_cr_beam(number_of_elements=5)
+    element = beam.elements[0]
+    material_stiffness = np.array(element.Ke_mat)
+    deformation_stiffness = np.array(element.Kd_mat)
+
+    element_set = beam.cr_element_set
+    rng = np.random.default_rng(1)
+    element_set.update_total(1e-3 * rng.standard_normal(element_set.current_deformation.shape))
+    first = element.get_element_stiffness_matrix()
+    # repeated tangent evaluations at the same state
+    assert np.allclose(element.get_element_stiffness_matrix(), first, rtol=1e-12)
+    assert np.array_equal(element.Ke_mat, material_stiffness)
+    assert np.array_equal(element.Kd_mat, deformation_stiffness)
+    # symmetric geometric stiffness from the template
+    geometric_stiffness = element._get_element_stiffness_matrix_geometry()
+    assert np.allclose(geometric_stiffness, geometric_stiffness.T)
+
+
+def test_cr_tangent_assembly(get_cr_beam):
+    for matrix_format in ["dense", "sparse", "banded"]:
+        beam = get_cr_beam(matrix_format, number_of_elements=5)
+        tangent = beam.update_stiffness_matrix()
+
+        rng = np.random.default_rng(2)
+        n_dofs = beam.element_dofs.max() + 1
+        beam.cr_element_set.update_total(random_displacement(rng, n_dofs, 1e-3)[beam.element_dofs])
+
+        updated = beam.update_stiffness_matrix()
+        assert updated is tangent
+        reference = beam._get_stiffness(reduced=True)
+        if matrix_format != "dense":
+            updated = updated.toarray()
+            reference = reference.toarray()
+        assert np.allclose(updated, reference, rtol=1e-9, atol=1e-9 * abs(reference).max())
@@ -1,5 +1,8 @@
 from source.element.cr_beam_element import CRBeamElement
 from source.element.timoshenko_beam_element import TimoshenkoBeamElement
+from source.element.bernouli_beam_element import BernoulliBeamElement
+import source.element.beam_element_set as beam_element_set
+from source.element.element_matrix_cache import ElementMatrixCache
 
 import numpy as np
 
@@ -187,3 +190,56 @@ def test_crbeam_element_update_total():
         print(msg)
 
     np.set_printoptions(precision=1)
+
+
+def test_element_set_matrices():
+    material_params = {'rho': 10.0, 'e': 100., 'nu': 0.1, 'zeta': 0.05, 'lx_i': 10., 'is_nonlinear': False}
+    element_params = [{'a': 5., 'asy': 2., 'asz': 2., 'iy': 10, 'iz': 20, 'it': 20},
+                      {'a': 4., 'asy': 0., 'asz': 1.5, 'iy': 8, 'iz': 15, 'it': 12},
+                      {'a': 3., 'asy': 1., 'asz': 0., 'iy': 6, 'iz': 12, 'it': 9}]
+    coords = [np.array([[0., 0., 0.], [1., 0., 0.]]),
+              np.array([[1., 0., 0.], [2.5, 0., 0.]]),
+              np.array([[2.5, 0., 0.], [3., 0., 0.]])]
+
+    for element_type, domain_size in [(TimoshenkoBeamElement, '3D'), (TimoshenkoBeamElement, '2D'),
+                                      (BernoulliBeamElement, '3D'), (BernoulliBeamElement, '2D')]:
+        elements = [element_type(material_params, params, coord, idx, domain_size)
+                    for idx, (params, coord) in enumerate(zip(element_params, coords))]
+
+        properties = {'rho': [e.rho for e in elements], 'A': [e.A for e in elements],
+                      'Asy': [e.Asy for e in elements], 'Asz': [e.Asz for e in elements],
+                      'Iy': [e.Iy for e in elements], 'Iz': [e.Iz for e in elements],
+                      'It': [e.It for e in elements], 'L': [e.L for e in elements],
+                      'E': [e.E for e in elements], 'nu': [e.nu for e in elements],
+                      'domain_size': domain_size,
+                      'shear_deformation': element_type is TimoshenkoBeamElement}
+
+        M = beam_element_set.get_element_mass_matrices(**properties)
+        K = beam_element_set.get_element_stiffness_matrices(**properties)
+
+        for idx, element in enumerate(elements):
+            assert np.allclose(M[idx], element.get_element_mass_matrix(), rtol=TOL, atol=0.0)
+            assert np.allclose(K[idx], element.get_element_stiffness_matrix(), rtol=TOL, atol=0.0)
+
+
+def test_element_matrix_cache():
+    # two sections on a uniform mesh
+    n_el = 10
+    properties = {'rho': np.full(n_el, 10.0), 'A': np.array([5.] * 6 + [4.] * 4),
+                  'Asy': np.full(n_el, 2.), 'Asz': np.full(n_el, 2.),
+                  'Iy': np.full(n_el, 10.), 'Iz': np.full(n_el, 20.), 'It': np.full(n_el, 20.),
+                  'L': np.full(n_el, 1.5), 'E': np.full(n_el, 100.), 'nu': np.full(n_el, 0.1),
+                  'Ip': np.full(n_el, 30.), 'domain_size': '3D', 'shear_deformation': True}
+
+    cache = ElementMatrixCache()
+    M = cache.get_element_matrices('mass', 'Timoshenko', properties,
+                                   beam_element_set.get_element_mass_matrices)
+    assert cache.cache_info() == {'hits': 8, 'misses': 2, 'size': 2}
+    assert np.allclose(M, beam_element_set.get_element_mass_matrices(**properties), rtol=TOL, atol=0.0)
+
+    # a repeated evaluation is served from the cache, other matrix types are separate entries
+    cache.get_element_matrices('mass', 'Timoshenko', properties,
+                               beam_element_set.get_element_mass_matrices)
+    cache.get_element_matrices('stiffness', 'Timoshenko', properties,
+                               beam_element_set.get_element_stiffness_matrices)
+    assert cache.cache_info() == {'hits': 26, 'misses': 4, 'size': 4}
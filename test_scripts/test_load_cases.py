@@ -0,0 +1,80 @@
+from source.analysis.dynamic_analysis import DynamicAnalysis
+
+import numpy as np
+import copy
+
+n_cases = 3
+n_steps = 51
+
+
+def get_parameters(force_file, matrix_format, run_in_modal_coordinates, scheme):
+    return {
+        "type": "dynamic_analysis",
+        "settings": {
+            "solver_type": "Linear",
+            "run_in_modal_coordinates": run_in_modal_coordinates,
+            "number_of_modes_considered": 6,
+            "time": {
+                "integration_scheme": scheme,
+                "start": 0.0,
+                "end": 0.5,
+                "step": 0.01}},
+        "input": {"file_path": force_file},
+        "output": {
+            "selected_dof": {
+                "dof_list": [1, 75],
+                "result_type": [["reaction"], ["displacement", "acceleration"]]}}}
+
+
+def test_load_cases(tmp_path, get_beam):
+    forces = np.random.RandomState(0).rand(n_cases, 78, n_steps)
+    force_file = str(tmp_path / "forces.npy")
+    np.save(force_file, forces)
+
+    for matrix_format, run_in_modal_coordinates, scheme in [("dense", False, "GenAlpha"),
+                                                             ("banded", False, "BackwardEuler1"),
+                                                             ("dense", True, "GenAlpha")]:
+        parameters = get_parameters(force_file, matrix_format, run_in_modal_coordinates, scheme)
+        batched = DynamicAnalysis(get_beam(matrix_format), copy.deepcopy(parameters))
+        batched.solve()
+        assert batched.solver.displacement.shape == (78, n_cases, n_steps)
+
+        parameters["settings"]["recording"] = {"selected_dofs_only": True}
+        recorded = DynamicAnalysis(get_beam(matrix_format), copy.deepcopy(parameters))
+        recorded.solve()
+
+        for case in range(n_cases):
+            case_file = str(tmp_path / ("force_" + str(case) + ".npy"))
+            np.save(case_file, forces[case])
+            single = DynamicAnalysis(get_beam(matrix_format),
+                                     get_parameters(case_file, matrix_format, run_in_modal_coordinates, scheme))
+            single.solve()
+
+            for label, history in [('displacement', single.solver.displacement),
+                                   ('velocity', single.solver.velocity),
+                                   ('acceleration', single.solver.acceleration),
+                                   ('reaction', single.solver.dynamic_reaction)]:
+                tol = 1e-8 * abs(history).max()
+                assert np.allclose(getattr(batched.solver, label if label != 'reaction' else 'dynamic_reaction')[:, case],
+                                   history, rtol=1e-8, atol=tol)
+
+            for dof, label, history in [(1, 'reaction', single.solver.dynamic_reaction),
+                                        (75, 'displacement', single.solver.displacement)]:
+                tol = 1e-8 * abs(history[dof]).max()
+                assert np.allclose(recorded._get_result_at_dof(dof, label)[case], history[dof], rtol=1e-8, atol=tol)
+                statistics = batched.get_load_case_statistics(dof, label)
+                assert np.isclose(statistics['max'][case], history[dof].max(), rtol=1e-8, atol=tol)
+                assert np.isclose(statistics['std'][case], history[dof].std(), rtol=1e-8, atol=tol)
+
+
+def test_load_cases_output(tmp_path, get_beam):
+    force_file = str(tmp_path / "forces.npy")
+    np.save(force_file, np.random.RandomState(0).rand(n_cases, 78, n_steps))
+
+    analysis = DynamicAnalysis(get_beam("dense"), get_parameters(force_file, "dense", False, "GenAlpha"))
+    analysis.solve()
+    analysis.write_result_at_dof(str(tmp_path), 75, 'displacement')
+
+    table = np.loadtxt(str(tmp_path / "dynamic_analysis_load_case_statistics_displacement_for_dof_75.dat"))
+    assert table.shape == (n_cases, 5)
+    assert np.allclose(table[:, 1], analysis.solver.displacement[75].max(axis=-1), atol=1e-8)
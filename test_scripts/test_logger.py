@@ -0,0 +1,74 @@
+import logging
+
+from source.auxiliary.logger import get_logger, configure_logging, set_quiet_mode, ProgressLogger, LOGGER_NAME
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def get_recorded_logger():
+    logger = get_logger('test_logger')
+    handler = RecordingHandler()
+    logger.addHandler(handler)
+    return logger, handler
+
+
+def test_progress_rate_limit():
+    configure_logging('info')
+    logger, handler = get_recorded_logger()
+
+    # only the first and the last step within the interval
+    progress = ProgressLogger(logger, 1000, progress_interval=3600.0)
+    for step in range(1000):
+        progress.log(step, step * 0.01)
+    assert len(handler.messages) == 2
+    assert handler.messages[-1].startswith("time: 9.99")
+
+    # every step
+    handler.messages = []
+    progress = ProgressLogger(logger, 10, progress_interval=0.0)
+    for step in range(10):
+        progress.log(step, step * 0.01)
+    assert len(handler.messages) == 10
+
+
+def test_quiet_mode():
+    logger, handler = get_recorded_logger()
+
+    set_quiet_mode()
+    progress = ProgressLogger(logger, 10, progress_interval=0.0)
+    for step in range(10):
+        progress.log(step, step * 0.01)
+    logger.warning("not shown")
+    assert handler.messages == []
+
+    configure_logging('debug')
+    logger.debug("shown")
+    assert handler.messages == ["shown"]
+
+    configure_logging('info')
+
+
+def test_log_file_replaced(tmp_path):
+    logger = get_logger('test_logger')
+    root_logger = logging.getLogger(LOGGER_NAME)
+
+    configure_logging('info', log_file=str(tmp_path / 'first.log'))
+    configure_logging('info', log_file=str(tmp_path / 'second.log'))
+    file_handlers = [h for h in root_logger.handlers
+                     if isinstance(h, logging.FileHandler) and h.baseFilename.startswith(str(tmp_path))]
+    assert len(file_handlers) == 1
+
+    logger.info("only in the second file")
+    file_handlers[0].flush()
+    assert "only in the second file" not in (tmp_path / 'first.log').read_text()
+    assert "only in the second file" in (tmp_path / 'second.log').read_text()
+
+    root_logger.removeHandler(file_handlers[0])
+    file_handlers[0].close()
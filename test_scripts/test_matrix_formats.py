@@ -0,0 +1,120 @@
+import source.auxiliary.matrix_utilities as matrix_utilities
+
+import numpy as np
+import copy
+import scipy.sparse
+
+TOL = 1e-8
+
+
+def test_sparse_assembly(get_beam):
+    dense_beam = get_beam("dense")
+    sparse_beam = get_beam("sparse")
+
+    assert matrix_utilities.is_sparse(sparse_beam.comp_k)
+
+    for dense, sparse in [(dense_beam.m, sparse_beam.m),
+                          (dense_beam.k, sparse_beam.k),
+                          (dense_beam.comp_m, sparse_beam.comp_m),
+                          (dense_beam.comp_k, sparse_beam.comp_k),
+                          (dense_beam.comp_b, sparse_beam.comp_b)]:
+        assert np.allclose(dense, sparse.toarray(), rtol=TOL, atol=TOL * abs(dense).max())
+
+    n_modes = len(sparse_beam.eig_freqs)
+    assert np.allclose(dense_beam.eig_freqs[:n_modes], sparse_beam.eig_freqs, rtol=TOL)
+
+    force = np.ones(dense_beam.comp_k.shape[0])
+    assert np.allclose(matrix_utilities.solve(dense_beam.comp_k, force),
+                       matrix_utilities.solve(sparse_beam.comp_k, force), rtol=TOL)
+
+
+def test_banded_solve(get_beam):
+    dense_beam = get_beam("dense")
+    banded_beam = get_beam("banded")
+
+    assert matrix_utilities.is_banded(banded_beam.comp_k)
+    # two noded elements couple 2 * 6 dofs -> half bandwidth of at most 11
+    lower, upper = matrix_utilities.get_bandwidth(banded_beam.comp_k)
+    assert lower == upper and upper <= 11
+    assert np.allclose(dense_beam.comp_k, banded_beam.comp_k.toarray(),
+                       rtol=TOL, atol=TOL * abs(dense_beam.comp_k).max())
+
+    force = np.ones(dense_beam.comp_k.shape[0])
+    # symmetric positive definite -> banded Cholesky
+    assert np.allclose(matrix_utilities.solve(dense_beam.comp_k, force),
+                       matrix_utilities.solve(banded_beam.comp_k, force), rtol=TOL)
+
+    # non-symmetric -> banded LU
+    lhs = dense_beam.comp_k + np.triu(dense_beam.comp_k, 1)
+    banded_lhs = banded_beam.comp_k + scipy.sparse.triu(banded_beam.comp_k, 1).todia()
+    assert np.allclose(matrix_utilities.solve(lhs, force),
+                       matrix_utilities.solve(banded_lhs, force), rtol=TOL)
+
+
+def test_reduced_assembly(get_beam):
+    dense_beam = get_beam("dense")
+
+    # assembled directly into the reduced system, compared to the reduction of the global matrices
+    for matrix_format in ["dense", "sparse", "banded"]:
+        beam = get_beam(matrix_format)
+        for reduced, comp in [(beam.comp_k, dense_beam.apply_bc_by_reduction(dense_beam.k)),
+                              (beam.comp_m, dense_beam.apply_bc_by_reduction(dense_beam.m)),
+                              (beam.comp_b, dense_beam.apply_bc_by_reduction(dense_beam.b)),
+                              (beam._get_stiffness(reduced=True), dense_beam.comp_k),
+                              (beam._get_mass(reduced=True), dense_beam.comp_m)]:
+            if matrix_utilities.is_sparse(reduced):
+                reduced = reduced.toarray()
+            assert np.allclose(reduced, comp, rtol=TOL, atol=TOL * abs(comp).max())
+
+    # scatter back into a preallocated buffer
+    buffer = np.zeros(len(dense_beam.all_dofs_global))
+    reduced = np.arange(1, len(dense_beam.dofs_to_keep) + 1, dtype=float)
+    extended = dense_beam.recuperate_bc_by_extension(reduced, 'column_vector', out=buffer)
+    assert extended is buffer
+    assert np.array_equal(extended, dense_beam.recuperate_bc_by_extension(reduced, 'column_vector'))
+    assert np.array_equal(dense_beam.apply_bc_by_reduction(extended, 'column_vector'), reduced)
+
+
+def test_partial_eigenvalue_solve(get_beam):
+    full_beam = get_beam("dense")
+
+    for matrix_format in ["dense", "sparse", "banded"]:
+        beam = get_beam(matrix_format, number_of_modes=6)
+
+        assert len(beam.eig_freqs) == 6
+        assert np.allclose(beam.eig_freqs, full_beam.eig_freqs[:6], rtol=TOL)
+        assert np.allclose(beam.rayleigh_coefficients, full_beam.rayleigh_coefficients, rtol=TOL)
+
+
+def test_incremental_update(get_beam):
+    for matrix_format in ["dense", "sparse", "banded"]:
+        beam = get_beam(matrix_format)
+        # modify one element and the point stiffness of the outrigger
+        beam.elements[3].Iz *= 1.5
+        beam.elements[3].evaluate_relative_importance_of_shear()
+        beam.parameters['e'] *= 1.1
+
+        reference = copy.deepcopy(beam)
+        reference.calculate_global_matrices(update_rayleigh_coefficients=True)
+        beam.update_global_matrices(update_rayleigh_coefficients=True)
+
+        for updated, full in [(beam.comp_m, reference.comp_m),
+                              (beam.k, reference.k),
+                              (beam.comp_k, reference.comp_k),
+                              (beam.comp_b, reference.comp_b)]:
+            assert type(updated) is type(full)
+            if matrix_utilities.is_sparse(updated):
+                updated = updated.toarray()
+                full = full.toarray()
+            assert np.allclose(updated, full, rtol=TOL, atol=TOL * abs(full).max())
+
+
+def test_element_matrix_cache_setting(get_beam):
+    cached = get_beam("dense")
+    beam = get_beam("dense", element_matrix_cache=False)
+    assert beam.element_matrix_cache is None
+
+    # same matrices with and without the memoized element blocks
+    assert cached.element_matrix_cache.cache_info()['size'] > 0
+    for uncached, full in [(beam.m, cached.m), (beam.k, cached.k)]:
+        assert np.allclose(uncached, full, rtol=TOL, atol=TOL * abs(full).max())
@@ -0,0 +1,72 @@
+from source.analysis.monte_carlo_analysis import MonteCarloAnalysis
+from source.analysis.dynamic_analysis import DynamicAnalysis
+
+import numpy as np
+import copy
+
+
+def white_noise_load(rng, structure_model, array_time):
+    return rng.normal(0.0, 1e3, (len(structure_model.all_dofs_global), len(array_time)))
+
+
+def youngs_modulus_sampler(rng, structure_model):
+    factor = rng.lognormal(0.0, 0.1)
+    for e in structure_model.elements:
+        e.E *= factor
+
+
+def get_parameters(number_of_workers):
+    return {
+        "type": "monte_carlo_analysis",
+        "settings": {
+            "number_of_realizations": 4,
+            "seed": 2020,
+            "number_of_workers": number_of_workers},
+        "dynamic_analysis": {
+            "type": "dynamic_analysis",
+            "settings": {
+                "solver_type": "Linear",
+                "run_in_modal_coordinates": False,
+                "time": {
+                    "integration_scheme": "GenAlpha",
+                    "start": 0.0,
+                    "end": 0.2,
+                    "step": 0.01}},
+            "input": {},
+            "output": {
+                "selected_dof": {
+                    "dof_list": [1, 74],
+                    "result_type": [["reaction"], ["displacement"]]}}}}
+
+
+def test_monte_carlo_analysis(tmp_path, get_beam):
+    beam = get_beam("dense")
+
+    serial = MonteCarloAnalysis(beam, get_parameters(1), white_noise_load, youngs_modulus_sampler)
+    serial.solve()
+    pool = MonteCarloAnalysis(beam, get_parameters(2), white_noise_load, youngs_modulus_sampler)
+    pool.solve()
+
+    # reproducible and independent of the workers
+    for key, values in serial.statistics.items():
+        assert values.shape == (4, 4)
+        assert np.array_equal(values, pool.statistics[key])
+    # the shipped model is not modified by the sampler
+    assert np.array_equal(beam.k, get_beam("dense").k)
+
+    # against a single analysis with the realization seed
+    realization = 2
+    rng = np.random.default_rng(serial.get_seed_sequences()[realization])
+    model = copy.deepcopy(beam)
+    youngs_modulus_sampler(rng, model)
+    model.update_global_matrices(update_rayleigh_coefficients=True)
+    analysis = DynamicAnalysis(model, get_parameters(1)["dynamic_analysis"],
+                               white_noise_load(rng, model, serial.array_time))
+    analysis.solve()
+    reference = analysis.solver.displacement[74]
+    assert np.allclose(serial.statistics[(74, 'displacement')][realization],
+                       [reference.max(), reference.min(), reference.mean(), reference.std()])
+
+    serial.postprocess(str(tmp_path))
+    table = np.loadtxt(str(tmp_path / "monte_carlo_analysis_statistics_reaction_for_dof_1.dat"))
+    assert np.allclose(table[:, 1:], serial.statistics[(1, 'reaction')])
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+import source.auxiliary.matrix_utilities as matrix_utilities
+from source.solving_strategies.strategies.residual_based_newton_raphson_solver import ResidualBasedNewtonRaphsonSolver
+
+
+def solve(beam, nonlinear_settings):
+    n_dofs = beam.comp_m.shape[0]
+    array_time = np.linspace(0.0, 1.0, 6)
+    # increasing tip load in z
+    force = np.zeros((n_dofs + 6, len(array_time)))
+    force[-4, :] = np.linspace(0.0, 10.0, len(array_time))
+    force = beam.apply_bc_by_reduction(force, 'row')
+    zeros = np.zeros(n_dofs)
+    solver = ResidualBasedNewtonRaphsonSolver(array_time, "BackwardEuler1", array_time[1] - array_time[0],
+                                              [beam.comp_m, beam.comp_b, beam.comp_k],
+                                              [zeros, zeros, zeros], force, beam,
+                                              nonlinear_settings)
+    solver.solve()
+    return solver
+
+
+def test_modified_newton(get_cr_beam):
+    full = solve(get_cr_beam(), None)
+    modified = solve(get_cr_beam(), {"tangent_update_interval": 100})
+
+    for solver in [full, modified]:
+        assert solver.n_unconverged_steps == 0
+        assert len(solver.iteration_counts) == 6
+        assert np.sum(solver.iteration_counts) > 0
+    # full Newton: one factorization per iteration
+    assert full.n_factorizations == np.sum(full.iteration_counts)
+    # the tangent is reused over iterations and steps
+    assert modified.n_factorizations < full.n_factorizations
+    assert np.allclose(modified.displacement, full.displacement, rtol=1e-4, atol=1e-8)
+
+
+def test_convergence_criteria(get_cr_beam):
+    reference = solve(get_cr_beam(), None)
+    relative = solve(get_cr_beam(), {"residual_tolerance": None,
+                                     "displacement_tolerance": 1e-6,
+                                     "energy_tolerance": 1e-12})
+    assert relative.n_unconverged_steps == 0
+    assert np.allclose(relative.displacement, reference.displacement, rtol=1e-4, atol=1e-8)
+
+    # not converged within a single iteration, the steps are counted
+    limited = solve(get_cr_beam(), {"max_iterations": 1})
+    assert limited.n_unconverged_steps > 0
+    assert np.max(limited.iteration_counts) == 1
+
+    with pytest.raises(Exception):
+        solve(get_cr_beam(), {"residual_tolerance": None})
+    with pytest.raises(Exception):
+        solve(get_cr_beam(), {"tolerance": 1e-6})
+
+
+def get_stored_arrays(matrix):
+    # the arrays holding the values and the pattern of the matrix
+    if matrix.format == 'csr':
+        return [matrix.data, matrix.indices, matrix.indptr]
+    return [matrix.data, matrix.offsets]
+
+
+def test_frozen_topology_assembly(get_cr_beam):
+    for element_type, is_nonlinear in [("CRBeam", True), ("Timoshenko", False)]:
+        for matrix_format in ["dense", "sparse", "banded"]:
+            beam = get_cr_beam(matrix_format, element_params={"type": element_type,
+                                                              "is_nonlinear": is_nonlinear})
+            reference = beam._get_stiffness(reduced=True)
+            tangent = beam.update_stiffness_matrix()
+            assert type(tangent) is type(reference)
+            if matrix_utilities.is_sparse(tangent):
+                assert tangent.format == reference.format
+                stored = get_stored_arrays(tangent)
+            element_matrices = beam.tangent_assembler.element_matrices
+
+            # repeated calls: the same matrix without reallocating its arrays
+            for _ in range(3):
+                assert beam.update_stiffness_matrix() is tangent
+            if is_nonlinear:
+                rng = np.random.default_rng(0)
+                n_dofs = beam.element_dofs.max() + 1
+                beam.cr_element_set.update_total(1e-3 * rng.standard_normal(n_dofs)[beam.element_dofs])
+            else:
+                for e in beam.elements:
+                    e.E *= 2.0
+            updated = beam.update_stiffness_matrix()
+            assert updated is tangent
+            assert beam.tangent_assembler.element_matrices is element_matrices
+            if matrix_utilities.is_sparse(updated):
+                for array, stored_array in zip(get_stored_arrays(updated), stored):
+                    assert array is stored_array
+
+            # new values overwrite the same matrix
+            reference = beam._get_stiffness(reduced=True)
+            if matrix_utilities.is_sparse(updated):
+                updated = updated.toarray()
+                reference = reference.toarray()
+            assert np.allclose(updated, reference, rtol=1e-9, atol=1e-9 * abs(reference).max())
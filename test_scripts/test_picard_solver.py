@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from source.solving_strategies.strategies.residual_based_picard_solver import ResidualBasedPicardSolver
+
+
+def get_solver(beam, scheme):
+    n_dofs = beam.comp_m.shape[0]
+    array_time = np.linspace(0.0, 0.01, 11)
+    # increasing tip load in z
+    force = np.zeros((n_dofs + 6, len(array_time)))
+    force[-4, :] = np.linspace(0.0, 100.0, len(array_time))
+    force = beam.apply_bc_by_reduction(force, 'row')
+    zeros = np.zeros(n_dofs)
+    return ResidualBasedPicardSolver(array_time, scheme, array_time[1] - array_time[0],
+                                     [beam.comp_m, beam.comp_b, beam.comp_k],
+                                     [zeros, zeros, zeros], force, beam)
+
+
+@pytest.mark.parametrize("scheme", ["BackwardEuler1", "GenAlpha", "BDF2"])
+def test_iteration_matrix(get_cr_beam, scheme):
+    solver = get_solver(get_cr_beam(), scheme)
+    f_ext = solver.force[:, 1]
+    solver.scheme.solve_single_step(f_ext)
+    u_ref = np.array(solver.scheme.get_displacement())
+    # the step of the scheme fulfills the residual
+    assert np.linalg.norm(solver.calculate_residual(u_ref, f_ext)) < 1e-8 * np.linalg.norm(f_ext)
+
+    # linear residual: one iteration with the exact iteration matrix from a perturbed state
+    solver.scheme.u1 = u_ref + 1e-6 * np.random.default_rng(0).standard_normal(len(u_ref))
+    ru = solver.calculate_residual(solver.scheme.get_displacement(), f_ext)
+    solver._update_iteration_matrix()
+    u_new = solver.scheme.get_displacement() + solver.calculate_increment(ru)
+    assert np.allclose(u_new, u_ref, rtol=0.0, atol=1e-9 * np.max(abs(u_ref)))
+
+    # unchanged matrices: the factorization is reused
+    solver._update_iteration_matrix()
+    assert solver.n_factorizations == 1
+    solver.update_comp_model()
+    solver._update_iteration_matrix()
+    assert solver.n_factorizations == 1
+
+
+@pytest.mark.parametrize("scheme", ["GenAlpha", "BDF2"])
+def test_picard_solve(get_cr_beam, scheme):
+    solver = get_solver(get_cr_beam(), scheme)
+    solver.solve()
+    assert len(solver.iteration_counts) == len(solver.array_time)
+    assert solver.n_unconverged_steps == 0
+    assert solver.iteration_time > 0.0
+    assert np.all(np.isfinite(solver.displacement))
+    assert np.max(abs(solver.displacement)) > 0.0
+
+
+def test_unavailable_scheme(get_cr_beam):
+    with pytest.raises(Exception):
+        get_solver(get_cr_beam(), "RungeKutta4")
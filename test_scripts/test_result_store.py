@@ -0,0 +1,126 @@
+from source.analysis.dynamic_analysis import DynamicAnalysis
+from source.auxiliary.result_store import ResultStore, ReducedLoadHistory
+
+import numpy as np
+import copy
+
+
+def test_result_store(tmp_path):
+    store = ResultStore(str(tmp_path / "results"), chunk_size=4)
+    history = store.allocate('displacement', 3, 10)
+    assert history.shape == (3, 10)
+    history[:, 2] = [1.0, 2.0, 3.0]
+    store.flush(history)
+
+    # time-major on disk
+    assert np.array_equal(np.load(store.files['displacement'])[2], [1.0, 2.0, 3.0])
+    assert [(chunk.start, chunk.stop) for chunk in store.get_chunks(10)] == [(0, 4), (4, 8), (8, 10)]
+    assert len(ResultStore().get_chunks(10)) == 1
+
+
+def test_out_of_core_dynamic_analysis(tmp_path, get_beam):
+    beam = get_beam("dense")
+    n_steps = 51
+    force_file = str(tmp_path / "force.npy")
+    np.save(force_file, np.random.RandomState(0).rand(len(beam.all_dofs_global), n_steps))
+
+    parameters = {
+        "type": "dynamic_analysis",
+        "settings": {
+            "solver_type": "Linear",
+            "run_in_modal_coordinates": False,
+            "time": {
+                "integration_scheme": "GenAlpha",
+                "start": 0.0,
+                "end": 0.5,
+                "step": 0.01}},
+        "input": {"file_path": force_file},
+        "output": {}}
+
+    for run_in_modal_coordinates in [False, True]:
+        parameters["settings"]["run_in_modal_coordinates"] = run_in_modal_coordinates
+        parameters["settings"]["number_of_modes_considered"] = 6
+        parameters["settings"].pop("result_storage", None)
+        in_memory = DynamicAnalysis(beam, copy.deepcopy(parameters))
+        in_memory.solve()
+
+        parameters["settings"]["result_storage"] = {"folder": str(tmp_path / "results"), "chunk_size": 7}
+        out_of_core = DynamicAnalysis(beam, copy.deepcopy(parameters))
+        # the load history stays memory-mapped, not reduced as a whole
+        assert isinstance(out_of_core.solver.force, ReducedLoadHistory)
+        assert isinstance(out_of_core.solver.force.force, np.memmap)
+        out_of_core.solve()
+
+        assert isinstance(out_of_core.solver.displacement, np.memmap)
+        for label in ['displacement', 'velocity', 'acceleration', 'dynamic_reaction']:
+            reference = getattr(in_memory.solver, label)
+            result = getattr(out_of_core.solver, label)
+            assert np.allclose(result, reference, rtol=1e-10, atol=1e-10 * abs(reference).max())
+
+
+def test_reduced_load_history(get_beam):
+    beam = get_beam("dense")
+    rng = np.random.RandomState(1)
+    modes = beam.eigen_modes_raw[:, :4]
+    for shape in [(len(beam.all_dofs_global), 9), (len(beam.all_dofs_global), 2, 9)]:
+        force = rng.rand(*shape)
+        reduced = beam.apply_bc_by_reduction(force, 'row')
+        for history, reference in [(ReducedLoadHistory(force, beam.dofs_to_keep), reduced),
+                                   (ReducedLoadHistory(force, beam.dofs_to_keep, modes),
+                                    np.tensordot(modes.T, reduced, axes=1))]:
+            assert history.shape == reference.shape
+            for key in [(Ellipsis, 3), (Ellipsis, slice(2, 7)), (slice(None), 1), (2, Ellipsis), Ellipsis]:
+                assert np.allclose(history[key], reference[key], rtol=1e-12)
+
+
+def test_record_selected_dofs(tmp_path, get_beam):
+    n_steps = 51
+    force_file = str(tmp_path / "force.npy")
+    np.save(force_file, np.random.RandomState(0).rand(78, n_steps))
+
+    for matrix_format, run_in_modal_coordinates, scheme in [("dense", False, "GenAlpha"),
+                                                             ("sparse", False, "BackwardEuler1"),
+                                                             ("dense", True, "PiecewiseExact")]:
+        parameters = {
+            "type": "dynamic_analysis",
+            "settings": {
+                "solver_type": "Linear",
+                "run_in_modal_coordinates": run_in_modal_coordinates,
+                "number_of_modes_considered": 6,
+                "time": {
+                    "integration_scheme": scheme,
+                    "start": 0.0,
+                    "end": 0.5,
+                    "step": 0.01}},
+            "input": {"file_path": force_file},
+            "output": {
+                "selected_instance": {
+                    "plot_step": [10],
+                    "write_step": [],
+                    "plot_time": [0.3],
+                    "write_time": []},
+                "selected_dof": {
+                    "dof_list": [1, 2, 75],
+                    "result_type": [["reaction"], ["reaction"], ["displacement", "acceleration"]]}}}
+
+        full = DynamicAnalysis(get_beam(matrix_format), copy.deepcopy(parameters))
+        full.solve()
+
+        parameters["settings"]["recording"] = {"selected_dofs_only": True, "snapshot_interval": 25}
+        recorded = DynamicAnalysis(get_beam(matrix_format), parameters)
+        recorded.solve()
+
+        assert recorded.solver.displacement.shape == (1, n_steps)
+        assert recorded.solver.velocity is None
+        assert recorded.solver.dynamic_reaction.shape == (2, n_steps)
+        for label, history, dof in [('displacement', full.solver.displacement, 75),
+                                    ('acceleration', full.solver.acceleration, 75),
+                                    ('reaction', full.solver.dynamic_reaction, 1),
+                                    ('reaction', full.solver.dynamic_reaction, 2)]:
+            assert np.allclose(recorded._get_result_history(None, label, dof), history[dof],
+                               rtol=1e-8, atol=1e-8 * abs(history[dof]).max())
+
+        assert recorded.recorder.snapshot_steps == [0, 10, 25, 30, 50]
+        for step in recorded.recorder.snapshot_steps:
+            assert np.allclose(recorded._get_displacement_at_step(step), full.solver.displacement[:, step],
+                               rtol=1e-8, atol=1e-8 * abs(full.solver.displacement).max())
@@ -33,3 +33,219 @@ def test_schemes():
         plt.plot(array_time, solver.displacement[1, :], label=scheme)
         plt.legend()
     plt.show()
+
+
+def test_prefactorized_lhs():
+    for scheme in ["BackwardEuler1", "Euler12", "GenAlpha", "BDF2"]:
+        solver = LinearSolver(array_time[:10], scheme, dt, [M, B, K], [u0, v0, a0], f[:, :10], None)
+        solver.solve()
+        # factorized once for the constant LHS
+        lhs_solver = solver.scheme._lhs_solver
+        assert lhs_solver is not None
+        solver.scheme.solve_single_step(f[:, 10])
+        assert solver.scheme._lhs_solver is lhs_solver
+
+        rhs = np.array([1.0, 2.0])
+        assert np.allclose(solver.scheme.solve_lhs(rhs), np.linalg.solve(solver.scheme.get_lhs(), rhs))
+
+        # refreshed for a new computational model
+        solver.scheme.update_comp_model([M, B, 2.0 * K])
+        assert np.allclose(solver.scheme.solve_lhs(rhs), np.linalg.solve(solver.scheme.get_lhs(), rhs))
+        assert solver.scheme._lhs_solver is not lhs_solver
+
+
+def test_piecewise_exact_modal_solver():
+    from source.solving_strategies.strategies.modal_solver import ModalSolver
+
+    # decoupled modes, the second one overdamped
+    m = np.array([1.0, 2.0, 0.5])
+    k = np.array([4.0 * np.pi ** 2, 50.0, 10.0])
+    b = np.array([0.0, 0.5, 2.5 * 2.0 * np.sqrt(10.0 * 0.5)])
+    t = np.linspace(0.0, 5.0, 501)
+    # ramp load - linear within each step, so the solution is exact
+    force = np.outer(np.ones(3), t)
+    initial = [np.array([0.1, 0.0, 0.0]), np.array([0.0, 0.2, 0.0]), np.zeros(3)]
+
+    solver = ModalSolver(t, "PiecewiseExact", t[1] - t[0], [m, b, k], initial, force, None)
+    solver.solve()
+
+    # undamped mode: ramp response plus free vibration
+    omega = np.sqrt(k[0] / m[0])
+    u_exact = (t - np.sin(omega * t) / omega) / k[0] + 0.1 * np.cos(omega * t)
+    assert np.allclose(solver.displacement[0], u_exact, rtol=1e-10, atol=1e-12)
+
+    # same as the step by step recurrence
+    u = np.array([initial[0], initial[1]]).T
+    for i in range(1, len(t)):
+        u = np.einsum('nij,nj->ni', solver.A, u) + solver.G0 * force[:, i - 1, None] + \
+            solver.G1 * force[:, i, None]
+    assert np.allclose(solver.displacement[:, -1], u[:, 0], rtol=1e-10)
+    assert np.allclose(solver.velocity[:, -1], u[:, 1], rtol=1e-10)
+
+    # equation of motion holds
+    residual = m[:, None] * solver.acceleration + b[:, None] * solver.velocity + \
+        k[:, None] * solver.displacement - force
+    assert np.allclose(residual, 0.0, atol=1e-10)
+
+
+def test_frequency_domain_solver():
+    from source.solving_strategies.strategies.modal_solver import ModalSolver
+    from source.solving_strategies.strategies.frequency_domain_solver import FrequencyDomainSolver
+
+    m = np.array([1.0, 2.0])
+    k = np.array([4.0 * np.pi ** 2, 50.0])
+    b = np.array([0.5, 1.0])
+    dt = 0.005
+    t = np.arange(0.0, 40.0 + dt / 2, dt)
+    # load pulse, the response has decayed at the end of the history
+    force = np.outer([1.0, 0.5], np.where(t < 2.0, np.sin(np.pi * t / 2.0) ** 2, 0.0))
+    initial = [np.zeros(2), np.zeros(2), np.zeros(2)]
+
+    exact = ModalSolver(t, "PiecewiseExact", dt, [m, b, k], initial, force, None)
+    exact.solve()
+    modal = FrequencyDomainSolver(t, None, dt, [m, b, k], initial, force, None)
+    modal.solve()
+    for result, reference in [(modal.displacement, exact.displacement),
+                              (modal.velocity, exact.velocity),
+                              (modal.acceleration, exact.acceleration)]:
+        assert np.allclose(result, reference, rtol=0.0, atol=1e-4 * abs(reference).max())
+
+    # same receptance for the system in matrix form
+    full = FrequencyDomainSolver(t, None, dt, [np.diag(m), np.diag(b), np.diag(k)],
+                                 initial, force, None, zero_padding_factor=0.5)
+    full.solve()
+    vector = FrequencyDomainSolver(t, None, dt, [m, b, k], initial, force, None, zero_padding_factor=0.5)
+    vector.solve()
+    assert np.allclose(full.displacement, vector.displacement, rtol=1e-10, atol=1e-14)
+
+
+def test_exact_state_space():
+    from source.solving_strategies.strategies.modal_solver import ModalSolver
+
+    # coupled system, compared in modal coordinates
+    m = np.array([[2.0, 0.0], [0.0, 1.0]])
+    k = np.array([[6.0, -2.0], [-2.0, 4.0]])
+    b = 0.05 * m + 0.02 * k
+    eig_values, modes = np.linalg.eigh(np.linalg.solve(np.sqrt(m), np.linalg.solve(np.sqrt(m), k).T))
+    modes = np.linalg.solve(np.sqrt(m), modes)
+    t = np.linspace(0.0, 10.0, 1001)
+    force = np.array([np.sin(3.0 * t), 0.5 * np.cos(t) * t])
+    initial = [np.zeros(2), np.zeros(2), np.zeros(2)]
+
+    solver = LinearSolver(t, "ExactStateSpace", t[1] - t[0], [m, b, k], initial, force, None)
+    solver.solve()
+
+    modal = ModalSolver(t, "PiecewiseExact", t[1] - t[0],
+                        [np.diag(modes.T @ m @ modes), np.diag(modes.T @ b @ modes), np.diag(modes.T @ k @ modes)],
+                        initial, modes.T @ force, None)
+    modal.solve()
+    assert np.allclose(solver.displacement, modes @ modal.displacement, rtol=1e-8, atol=1e-10)
+    assert np.allclose(solver.velocity, modes @ modal.velocity, rtol=1e-8, atol=1e-10)
+    assert np.allclose(solver.acceleration, modes @ modal.acceleration, rtol=1e-8, atol=1e-10)
+
+    # advancing blocks of steps, also in vector form
+    for comp_model, rhs, reference in [([m, b, k], force, solver),
+                                       ([modal.M, modal.B, modal.K], modes.T @ force, modal)]:
+        blocked = LinearSolver(t, "ExactStateSpace", t[1] - t[0], comp_model, initial, rhs, None,
+                               scheme_settings={"block_size": 64})
+        blocked.solve()
+        assert np.allclose(blocked.displacement, reference.displacement, rtol=1e-8, atol=1e-10)
+        assert np.allclose(blocked.acceleration, reference.acceleration, rtol=1e-8, atol=1e-10)
+
+
+def test_adaptive_time_stepping():
+    from source.solving_strategies.strategies.adaptive_solver import AdaptiveLinearSolver
+
+    # impulse followed by the free decay
+    t = np.linspace(0.0, 20.0, 2001)
+    force = np.zeros((2, len(t)))
+    force[1, 10:20] = 5.0
+    initial = [np.zeros(2), np.zeros(2), np.zeros(2)]
+
+    # exact for the load linearly interpolated between the samples
+    reference = LinearSolver(t, "ExactStateSpace", t[1] - t[0], [M, B, K], initial, force, None)
+    reference.solve()
+
+    for scheme in ["GenAlpha", "BDF2", "RungeKutta4"]:
+        solver = AdaptiveLinearSolver(t, scheme, t[1] - t[0], [M, B, K], initial, force, None,
+                                      {"relative_tolerance": 1e-5})
+        solver.solve()
+        # fewer steps than the output grid
+        assert solver.n_accepted + solver.n_rejected < len(t)
+        assert max(solver.accepted_steps) > 5.0 * (t[1] - t[0])
+        scale = abs(reference.displacement).max()
+        assert abs(solver.displacement - reference.displacement).max() < 1e-2 * scale
+        assert abs(solver.velocity - reference.velocity).max() < 1e-2 * abs(reference.velocity).max()
+
+
+def test_central_difference():
+    import pytest
+
+    reference = LinearSolver(array_time, "ExactStateSpace", dt, [M, B, K], [u0, v0, a0], f, None)
+    reference.solve()
+
+    solver = LinearSolver(array_time, "CentralDifference", dt, [M, B, K], [u0, v0, a0], f, None)
+    solver.solve()
+    assert solver.scheme.n_substeps == 1
+    assert abs(solver.displacement - reference.displacement).max() < 5e-3
+
+    # stiff system: the time step is subdivided below the critical one
+    stiff_k = np.array([[1e4, 0.0], [0.0, 4e4]])
+    omega_max = 200.0
+    zeta = 0.1 / (2.0 * omega_max)
+    for comp_model in [[M, B, stiff_k], [np.diag(M), np.diag(B), np.diag(stiff_k)]]:
+        solver = LinearSolver(array_time, "CentralDifference", 5 * dt, comp_model, [u0, v0, a0], f, None,
+                              {"safety_factor": 0.5})
+        assert abs(solver.scheme.critical_dt - 2.0 / omega_max * (np.sqrt(1.0 + zeta ** 2) - zeta)) < 1e-10
+        assert solver.scheme.n_substeps > 1
+        assert solver.scheme.h <= 0.5 * solver.scheme.critical_dt
+        solver.solve()
+        # stable: bounded by the initial displacement
+        assert abs(solver.displacement).max() <= 1.0 + 1e-3
+
+    # consistent (non-diagonal) mass
+    with pytest.raises(Exception):
+        LinearSolver(array_time, "CentralDifference", dt, [M + 0.1, B, K], [u0, v0, a0], f, None)
+
+
+def test_central_difference_critical_time_step():
+    from source.solving_strategies.schemes.central_difference_scheme import CentralDifference
+
+    # undamped chain of 3 equal masses and springs, fixed at both ends:
+    # omega_max^2 = k / m * (2 + sqrt(2)) and dt_cr = 2 / omega_max
+    m, k = 2.0, 50.0
+    chain_m = m * np.eye(3)
+    chain_b = np.zeros((3, 3))
+    chain_k = k * np.array([[2.0, -1.0, 0.0], [-1.0, 2.0, -1.0], [0.0, -1.0, 2.0]])
+    initial = [np.zeros(3), np.zeros(3), np.zeros(3)]
+    critical_dt = 2.0 / np.sqrt(k / m * (2.0 + np.sqrt(2.0)))
+
+    scheme = CentralDifference(0.5 * critical_dt, [chain_m, chain_b, chain_k], initial)
+    assert abs(scheme.critical_dt - critical_dt) < 1e-10 * critical_dt
+    assert scheme.n_substeps == 1
+
+    # above the critical time step: more substeps for larger steps
+    n_substeps = [CentralDifference(factor * critical_dt, [chain_m, chain_b, chain_k], initial,
+                                    safety_factor=0.9).n_substeps for factor in [1.0, 2.0, 4.0, 8.0]]
+    assert n_substeps == [int(np.ceil(factor / 0.9)) for factor in [1.0, 2.0, 4.0, 8.0]]
+    assert all(h < h_next for h, h_next in zip(n_substeps[:-1], n_substeps[1:]))
+
+    # small changes of the model keep the critical time step, no new eigenvalue solve
+    scheme.update_comp_model([chain_m, chain_b, 1.001 * chain_k])
+    assert scheme.n_eigenvalue_solves == 1
+    assert abs(scheme.critical_dt - critical_dt) < 1e-10 * critical_dt
+    scheme.update_comp_model([chain_m, chain_b, 2.0 * chain_k])
+    assert scheme.n_eigenvalue_solves == 2
+    assert abs(scheme.critical_dt - critical_dt / np.sqrt(2.0)) < 1e-10 * critical_dt
+
+
+def test_vector_form():
+    # decoupled (modal) system as vectors of the diagonals
+    for scheme in ["ForwardEuler1", "BackwardEuler1", "Euler12", "GenAlpha", "BDF2"]:
+        matrix_form = LinearSolver(array_time[:200], scheme, dt, [M, B, K], [u0, v0, a0], f[:, :200], None)
+        matrix_form.solve()
+        vector_form = LinearSolver(array_time[:200], scheme, dt, [np.diag(M), np.diag(B), np.diag(K)],
+                                   [u0, v0, a0], f[:, :200], None)
+        vector_form.solve()
+        assert np.all(np.isfinite(vector_form.displacement)), scheme
+        assert np.allclose(vector_form.displacement, matrix_form.displacement, rtol=1e-8, atol=1e-10), scheme
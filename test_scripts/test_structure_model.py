@@ -1,5 +1,7 @@
 from source.model.structure_model import StraightBeam
+import source.auxiliary.matrix_utilities as matrix_utilities
 import numpy as np
+import copy
 
 
 params = {
@@ -39,3 +41,76 @@ params = {
 
 def test_structure_model():
     beam = StraightBeam(params)
+
+
+def test_frozen_rayleigh_coefficients():
+    linear_params = copy.deepcopy(params)
+    linear_params["system_parameters"]["element_params"] = {"type": "Timoshenko", "is_nonlinear": False}
+    linear_params["system_parameters"]["geometry"]["number_of_elements"] = 3
+
+    frozen_beam = StraightBeam(copy.deepcopy(linear_params))
+    linear_params["update_rayleigh_coefficients"] = True
+    updated_beam = StraightBeam(copy.deepcopy(linear_params))
+    initial_coefficients = np.copy(frozen_beam.rayleigh_coefficients)
+    assert np.allclose(initial_coefficients, updated_beam.rayleigh_coefficients)
+
+    for beam in [frozen_beam, updated_beam]:
+        for e in beam.elements:
+            e.E *= 2.0
+            e.evaluate_relative_importance_of_shear()
+        beam.calculate_global_matrices()
+
+    # frozen: reassembly keeps the initial coefficients
+    assert np.array_equal(frozen_beam.rayleigh_coefficients, initial_coefficients)
+    assert not np.allclose(updated_beam.rayleigh_coefficients, initial_coefficients)
+
+    # update on request
+    frozen_beam.calculate_global_matrices(update_rayleigh_coefficients=True)
+    assert np.allclose(frozen_beam.rayleigh_coefficients, updated_beam.rayleigh_coefficients)
+    assert np.allclose(frozen_beam.comp_b, updated_beam.comp_b)
+
+
+def test_eigen_solution_cache():
+    linear_params = copy.deepcopy(params)
+    linear_params["system_parameters"]["element_params"] = {"type": "Timoshenko", "is_nonlinear": False}
+    linear_params["system_parameters"]["geometry"]["number_of_elements"] = 3
+
+    beam = StraightBeam(linear_params)
+    # damping and mode identification solve the same problem
+    assert beam.eigen_solution_cache.cache_info() == {'hits': 1, 'misses': 1, 'size': 1}
+
+    eig_freqs = np.copy(beam.eig_freqs)
+    beam.eigenvalue_solve()
+    assert beam.eigen_solution_cache.cache_info()['hits'] == 2
+    assert np.array_equal(beam.eig_freqs, eig_freqs)
+
+    # modified matrices lead to a new solve
+    for e in beam.elements:
+        e.E *= 2.0
+        e.evaluate_relative_importance_of_shear()
+    beam.calculate_global_matrices()
+    beam.eigenvalue_solve()
+    assert beam.eigen_solution_cache.cache_info() == {'hits': 2, 'misses': 2, 'size': 2}
+    assert np.allclose(beam.eig_freqs, np.sqrt(2.0) * eig_freqs)
+
+    beam.eigen_solution_cache.clear()
+    beam.eigenvalue_solve()
+    assert beam.eigen_solution_cache.cache_info() == {'hits': 2, 'misses': 3, 'size': 1}
+
+
+def test_lumped_mass(get_beam):
+    consistent = get_beam("dense")
+    for matrix_format in ["dense", "sparse", "banded"]:
+        beam = get_beam(matrix_format, mass_formulation="lumped")
+        assert matrix_utilities.is_diagonal(beam.comp_m)
+
+        # the equivalent nodal masses on the translational diagonal
+        m_diagonal = matrix_utilities.get_diagonal(beam.m)
+        element_mass = sum(e.rho * e.A * e.L for e in beam.elements)
+        point_mass = sum(val for dof, val in beam.point_mass.items() if dof % 6 == 0)
+        assert abs(np.sum(m_diagonal[0::6]) - element_mass - point_mass) < 1e-8 * element_mass
+
+        # close to the consistent mass for the lowest modes
+        lumped_freqs = beam.eig_freqs[beam.eig_freqs_sorted_indices[:6]]
+        consistent_freqs = consistent.eig_freqs[consistent.eig_freqs_sorted_indices[:6]]
+        assert np.allclose(lumped_freqs, consistent_freqs, rtol=0.02)